@@ -1,24 +1,34 @@
-from flask import Flask, request, jsonify, send_from_directory
+from modules import startup  # first, so startup timings cover everything below
+from flask import Flask, Request, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
-import json
+import hashlib
 import random
 from datetime import datetime
 import logging
+import atexit
+import functools
+import itertools
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from config import Config
-from modules.resume_parser import ResumeParser
-from modules.skill_analyzer import SkillAnalyzer
-from modules.question_generator import QuestionGenerator
-from modules.fast_mcq_generator import FastMCQGenerator  # Fast MCQ generation
-from modules.evaluator import Evaluator
+# Session object types; these modules are cheap to import (heavy dependencies load on first use)
 from modules.hr_interviewer import HRInterviewer
-from modules.report_generator import ReportGenerator
 from modules.emotion_analyzer import EmotionAnalyzer
-from modules.enhanced_question_generator import EnhancedQuestionGenerator
-from modules.enhanced_report_generator import EnhancedReportGenerator
-from modules.enhanced_hr_interviewer import EnhancedHRInterviewer, InterviewSession
+from modules.enhanced_hr_interviewer import InterviewSession
+from modules.answer_sheet import MCQAnswerSheet
+from modules.session_store import SessionStore
+from modules.static_assets import StaticAssets
+from modules.job_queue import JobQueue, process_resume
+from modules.resume_batch import unpack_batch
+from modules.resume_cache import ResumeCache, store_by_content
+from modules.result_cache import ResultCache, submission_digest
+from modules import admission, compression, fast_json, metrics, tracing
 
 # Configure logging
 logging.basicConfig(
@@ -27,34 +37,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class AppRequest(Request):
+    """Request with a larger body limit for recruiter batch uploads"""
+    
+    @property
+    def max_content_length(self):
+        if self.path == '/api/upload-resumes/batch':
+            return Config.BATCH_MAX_CONTENT_LENGTH
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = AppRequest
 app.config.from_object(Config)
+# jsonify() and request.json through orjson when available
+fast_json.init_app(app)
 
-# Enhanced CORS configuration
+# Enhanced CORS configuration (the ASGI routes answer the same origins)
+CORS_ORIGINS = ["http://localhost:5000", "http://127.0.0.1:5000"]
 CORS(app, resources={
     r"/api/*": {
-        "origins": ["http://localhost:5000", "http://127.0.0.1:5000"],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "origins": CORS_ORIGINS,
+        "methods": ["GET", "POST", "PATCH", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Authorization", "X-Session-Id"],
         "supports_credentials": True
     }
 })
 
-# Initialize modules
-resume_parser = ResumeParser()
-skill_analyzer = SkillAnalyzer()
-question_generator = QuestionGenerator()
-fast_mcq_generator = FastMCQGenerator()  # Fast MCQ generation without API delays
-evaluator = Evaluator()
-report_generator = ReportGenerator()
+# Initialize modules (constructed on first use, see Config.LAZY_MODULES)
+skill_analyzer = startup.lazy('modules.skill_analyzer:SkillAnalyzer')
+question_generator = startup.lazy('modules.question_generator:QuestionGenerator')
+fast_mcq_generator = startup.lazy('modules.fast_mcq_generator:FastMCQGenerator')  # Fast MCQ generation without API delays
+evaluator = startup.lazy('modules.evaluator:Evaluator')
+report_generator = startup.lazy('modules.report_generator:ReportGenerator')
 
 # Initialize enhanced modules
-enhanced_question_generator = EnhancedQuestionGenerator()
-enhanced_report_generator = EnhancedReportGenerator()
-enhanced_hr_interviewer = EnhancedHRInterviewer()
+enhanced_question_generator = startup.lazy('modules.enhanced_question_generator:EnhancedQuestionGenerator')
+enhanced_report_generator = startup.lazy('modules.enhanced_report_generator:EnhancedReportGenerator')
+enhanced_hr_interviewer = startup.lazy('modules.enhanced_hr_interviewer:EnhancedHRInterviewer')
+
+
+# Request counts/latency per route; registered first so its timing includes compression
+metrics.init_app(app)
+# Cheap 429s for excess telemetry, decided before the body is parsed
+if Config.ADMISSION_CONTROL:
+    admission.init_app(app)
+# One trace per request (TRACING_ENABLED), exported to Config.TRACE_FILE
+tracing.init_app(app)
+
+# Gzip/brotli for API JSON; static files carry their own precompressed variants
+compression.init_app(app)
+frontend_assets = StaticAssets(os.path.join(app.root_path, '..', 'frontend'))
 
-# Store session data (in production, use a proper database)
-sessions = {}
+# Resume parsing runs in worker processes (see start_background_work)
+upload_jobs = JobQueue()
+atexit.register(upload_jobs.shutdown)
+
+# Parse results by resume content hash; repeat uploads skip the worker entirely
+resume_cache = ResumeCache()
+
+# Evaluation results by submission hash; unchanged re-runs skip execution
+code_results = ResultCache()
+
+# Session data: bounded in-memory LRU backed by SQLite at Config.DATABASE_PATH
+with startup.timed('modules.session_store:SessionStore', 'init'):
+    sessions = SessionStore(types=(HRInterviewer, EmotionAnalyzer, InterviewSession, MCQAnswerSheet))
+atexit.register(sessions.flush)
+
+def start_background_work():
+    """
+    Start the resume worker pool, the warm session restore and the Python
+    code workers
+    
+    Runs at import, or in each worker after fork when pre-forking: the pool's
+    management threads and child processes must belong to the serving process.
+    """
+    # Fork the pool's processes before any request threads exist
+    upload_jobs.start()
+    # Warm restart: bring sessions active before the restart back into memory
+    threading.Thread(target=sessions.restore, name='session-restore', daemon=True).start()
+    if not Config.LAZY_MODULES:
+        # Python submissions find their interpreters already started
+        evaluator.python_workers.start()
+
+if not Config.PREFORK:
+    start_background_work()
+
+metrics.ACTIVE_SESSIONS.set_function(lambda: len(sessions))
+metrics.UPLOAD_JOBS_PENDING.set_function(upload_jobs.pending)
 
 # Ensure upload folder exists
 os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
@@ -64,6 +133,20 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
+def session_locked(view):
+    """Serialize concurrent requests that operate on the same session"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id') or request.args.get('session_id')
+
+        if not session_id:
+            return view(*args, **kwargs)
+
+        with sessions.lock(session_id):
+            return view(*args, **kwargs)
+    return wrapper
+
 def normalize_language(lang: str) -> str:
     """Normalize language names for comparison"""
     if not lang:
@@ -117,7 +200,7 @@ def normalize_language(lang: str) -> str:
 @app.route('/')
 def index():
     """Serve the frontend"""
-    return send_from_directory('../frontend', 'index.html')
+    return frontend_assets.serve('index.html')
 
 @app.route('/favicon.ico')
 def favicon():
@@ -140,7 +223,7 @@ def favicon():
 @app.route('/<path:path>')
 def serve_static(path):
     """Serve static files"""
-    return send_from_directory('../frontend', path)
+    return frontend_assets.serve(path)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -151,6 +234,16 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/startup-report', methods=['GET'])
+def startup_report():
+    """Import and initialization time per module for this worker"""
+    return jsonify(startup.report())
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint for this worker"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route('/api/upload-resume', methods=['POST'])
 def upload_resume():
     """Upload and parse resume"""
@@ -167,46 +260,290 @@ def upload_resume():
             return jsonify({'error': 'Invalid file type. Use PDF or DOCX'}), 400
         
         # Save file
+        session_id = sessions.new_session_id()
+        tracing.set_session(session_id)
         filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
+        filename = f"{session_id}_{filename}"
         filepath = os.path.join(Config.UPLOAD_FOLDER, filename)
         file.save(filepath)
+        resume_hash, filepath = store_by_content(filepath)
         
-        # Parse resume
-        resume_data = resume_parser.parse_resume(filepath)
-        
-        # Analyze skills
-        skill_analysis = skill_analyzer.analyze_skills(
-            resume_data['skills'],
-            resume_data['raw_text']
-        )
+        # Same file uploaded before: answer from the cache right away
+        cached = resume_cache.get(resume_hash)
+        if cached is not None:
+            sessions[session_id] = dict(cached, filepath=filepath, resume_hash=resume_hash,
+                                        upload_job={'status': 'done'})
+            return jsonify(parsed_resume_response(session_id, sessions[session_id]))
         
-        # Create session
-        session_id = timestamp
+        # Create session; parsing and skill analysis happen in a worker process
         sessions[session_id] = {
-            'resume_data': resume_data,
-            'skill_analysis': skill_analysis,
-            'filepath': filepath
+            'filepath': filepath,
+            'resume_hash': resume_hash,
+            'upload_job': processing_job()
         }
+        upload_jobs.submit(session_id, process_resume, filepath, on_done=store_parsed_resume)
+        
+        # ?wait=1 keeps the old blocking behaviour for simple clients
+        if request.args.get('wait'):
+            upload_jobs.wait(session_id, Config.JOB_WAIT_MAX)
+            return upload_job_response(session_id)
         
         return jsonify({
             'success': True,
-            'session_id': session_id,
-            'resume_data': {
-                'personal_info': resume_data['personal_info'],
-                'education': resume_data['education'],
-                'skills': resume_data['skills'],
-                'projects': resume_data['projects'][:5],  # Limit to 5 projects
-                'experience': resume_data['experience']
-            },
-            'skill_analysis': skill_analysis
-        })
+            'status': 'processing',
+            'job_id': session_id,
+            'session_id': session_id
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def store_parsed_resume(session_id: str, result: dict, error: Exception):
+    """Job completion handler: move the parsed resume into its session"""
+    with sessions.lock(session_id):
+        session = sessions.get(session_id)
+        if session is None:
+            return
+        
+        if error:
+            session['upload_job'] = {'status': 'failed', 'error': str(error)}
+        else:
+            session.update(result)
+            session['upload_job'] = {'status': 'done'}
+            if session.get('resume_hash'):
+                resume_cache.put(session['resume_hash'], result)
+        sessions.save(session_id)
+
+_worker_ids = {}
+
+def worker_id() -> str:
+    """Identifies this worker process; a restarted process that reuses the pid gets a new one"""
+    pid = os.getpid()
+    return _worker_ids.setdefault(pid, f'{pid}-{secrets.token_hex(4)}')
+
+def processing_job() -> dict:
+    """upload_job state of a resume handed to this process's job queue"""
+    return {'status': 'processing', 'worker': worker_id(), 'started_at': time.time()}
+
+def upload_job_lost(session_id: str, job: dict) -> bool:
+    """Whether a processing upload job has no live worker process left to finish it"""
+    if session_id in upload_jobs:
+        return False
+    if job.get('worker') == worker_id() or time.time() - job.get('started_at', 0) > Config.JOB_LOST_AFTER:
+        return True  # this process forgot it, or it is long overdue
+    if os.name == 'nt':
+        return False  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(int(job['worker'].split('-')[0]), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+def upload_job_state(session_id: str) -> dict:
+    """A session's upload job, marked failed if its worker is gone (e.g. after a restart)"""
+    session = sessions.get(session_id)
+    job = session.get('upload_job') if session is not None else None
+    if job is None or job['status'] != 'processing' or not upload_job_lost(session_id, job):
+        return job
+    
+    with sessions.lock(session_id):
+        session = sessions.get(session_id)
+        if session is None:
+            return None
+        if session['upload_job']['status'] == 'processing':
+            session['upload_job'] = {'status': 'failed', 'error': 'Resume processing was interrupted; please upload it again'}
+            sessions.save(session_id)
+        return session['upload_job']
+
+def wait_for_upload_job(session_id: str, timeout: float):
+    """
+    Block until an upload job is no longer processing, or timeout
+    
+    Jobs of this process are waited on directly; those of other worker
+    processes are followed through the session store.
+    """
+    if upload_jobs.wait(session_id, timeout) is not None:
+        return
+    deadline = time.monotonic() + timeout
+    while True:
+        job = upload_job_state(session_id)
+        remaining = deadline - time.monotonic()
+        if job is None or job['status'] != 'processing' or remaining <= 0:
+            return
+        time.sleep(min(Config.JOB_POLL_INTERVAL, remaining))
+
+def upload_job_response(session_id: str):
+    """Status of a resume upload job, with the parsed resume once it is done"""
+    job = upload_job_state(session_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    if job['status'] == 'processing':
+        return jsonify({
+            'success': True,
+            'status': 'processing',
+            'job_id': session_id,
+            'session_id': session_id
+        }), 202
+    
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'status': 'failed', 'error': job['error']}), 500
+    
+    return jsonify(parsed_resume_response(session_id, sessions[session_id]))
+
+def resume_not_ready(session: dict):
+    """
+    Why the session's parse results (resume_data, skill_analysis) cannot be
+    used yet, or None once the background parse has stored them
+    """
+    if 'skill_analysis' in session:
+        return None
+    if session.get('upload_job', {}).get('status') == 'failed':
+        return 'Resume processing failed; please upload it again'
+    return 'Resume is still being processed'
+
+def parsed_resume_response(session_id: str, session: dict) -> dict:
+    """Response body for a session whose resume has been parsed"""
+    resume_data = session['resume_data']
+    return {
+        'success': True,
+        'status': 'done',
+        'job_id': session_id,
+        'session_id': session_id,
+        'resume_data': {
+            'personal_info': resume_data['personal_info'],
+            'education': resume_data['education'],
+            'skills': resume_data['skills'],
+            'projects': resume_data['projects'][:5],  # Limit to 5 projects
+            'experience': resume_data['experience']
+        },
+        'skill_analysis': session['skill_analysis']
+    }
+
+@app.route('/api/upload-resumes/batch', methods=['POST'])
+def upload_resume_batch():
+    """
+    Upload many resumes at once (multipart files named 'resumes' and/or zip archives)
+    
+    Streams newline-delimited JSON: one line per resume as soon as it is parsed
+    (in completion order), then a summary line. Each parsed resume gets its own
+    session, exactly as if it had been uploaded on its own.
+    """
+    uploads = request.files.getlist('resumes') + request.files.getlist('resume')
+    if not uploads:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    files = unpack_batch(
+        uploads,
+        Config.UPLOAD_FOLDER,
+        sessions.new_session_id,
+        Config.ALLOWED_EXTENSIONS,
+        Config.BATCH_MAX_FILES,
+        Config.MAX_CONTENT_LENGTH
+    )
+    accepted = []
+    cached = []
+    for batch_file in files:
+        if not batch_file.session_id:
+            continue
+        resume_hash, batch_file.filepath = store_by_content(batch_file.filepath)
+        session = {'filepath': batch_file.filepath, 'resume_hash': resume_hash}
+        result = resume_cache.get(resume_hash)
+        if result is not None:
+            session.update(result, upload_job={'status': 'done'})
+            cached.append(batch_file)
+        else:
+            session['upload_job'] = processing_job()
+            # Submitted a few at a time by the stream below; known to this process until then
+            upload_jobs.reserve(batch_file.session_id)
+            accepted.append(batch_file)
+        sessions[batch_file.session_id] = session
+    
+    def batch_line(batch_file):
+        session = sessions.get(batch_file.session_id) or {}
+        job = session.get('upload_job', {'status': 'failed', 'error': 'Session expired'})
+        line = {'filename': batch_file.filename, 'session_id': batch_file.session_id, 'status': job['status']}
+        if job['status'] == 'done':
+            body = parsed_resume_response(batch_file.session_id, session)
+            line.update(resume_data=body['resume_data'], skill_analysis=body['skill_analysis'])
+        else:
+            line['error'] = job.get('error')
+        return line
+    
+    def results():
+        for batch_file in files:
+            if batch_file.error:
+                yield fast_json.dumps({'filename': batch_file.filename, 'status': 'failed', 'error': batch_file.error}) + b'\n'
+        
+        # Resumes seen before need no parsing
+        succeeded = 0
+        for batch_file in cached:
+            line = batch_line(batch_file)
+            succeeded += line['status'] == 'done'
+            yield fast_json.dumps(line) + b'\n'
+        
+        finished = queue.Queue()
+        by_session = {f.session_id: f for f in accepted}
+        
+        def on_done(session_id, result, error):
+            store_parsed_resume(session_id, result, error)
+            finished.put(session_id)
+        
+        def submit(batch_file):
+            upload_jobs.submit(batch_file.session_id, process_resume, batch_file.filepath, on_done=on_done)
+        
+        # Keep at most one job per worker in flight so single uploads are not starved
+        pending = iter(accepted)
+        in_flight = 0
+        for batch_file in itertools.islice(pending, upload_jobs.max_workers):
+            submit(batch_file)
+            in_flight += 1
+        
+        try:
+            while in_flight:
+                session_id = finished.get()
+                in_flight -= 1
+                
+                next_file = next(pending, None)
+                if next_file is not None:
+                    submit(next_file)
+                    in_flight += 1
+                
+                line = batch_line(by_session[session_id])
+                succeeded += line['status'] == 'done'
+                yield fast_json.dumps(line) + b'\n'
+        finally:
+            # Client went away: resumes never submitted will not be parsed
+            for batch_file in pending:
+                store_parsed_resume(batch_file.session_id, None, RuntimeError('Batch upload cancelled'))
+                upload_jobs.cancel(batch_file.session_id)
+        
+        yield fast_json.dumps({
+            'done': True,
+            'total': len(files),
+            'succeeded': succeeded,
+            'failed': len(files) - succeeded
+        }) + b'\n'
+    
+    return Response(stream_with_context(results()), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Poll a background job; ?wait=<seconds> holds the request until it finishes"""
+    try:
+        wait = min(float(request.args.get('wait', 0)), Config.JOB_WAIT_MAX)
+    except ValueError:
+        wait = 0
+    
+    if wait > 0:
+        wait_for_upload_job(job_id, wait)
+    
+    return upload_job_response(job_id)
+
 @app.route('/api/generate-quiz', methods=['POST'])
+@session_locked
 def generate_quiz():
     """Generate quiz based on skills"""
     try:
@@ -217,91 +554,430 @@ def generate_quiz():
             return jsonify({'error': 'Invalid session'}), 400
         
         session = sessions[session_id]
-        skill_analysis = session['skill_analysis']
-        resume_data = session['resume_data']
-        
-        # Get top skills for assessment
-        skills_for_assessment = skill_analyzer.get_skills_for_assessment(
-            skill_analysis['with_proficiency'],
-            max_skills=5
-        )
-        
-        # Create skills dict with proficiency levels
-        skills_with_proficiency = {
-            s['skill']: s['proficiency'] for s in skills_for_assessment
-        }
-        
-        # Generate assessment using enhanced generator (5 MCQ + coding challenges per skill)
-        assessment = enhanced_question_generator.get_skill_based_assessment(
-            skills_with_proficiency
-        )
+        not_ready = resume_not_ready(session)
+        if not_ready:
+            return jsonify({'error': not_ready}), 409
         
-        # Get MCQ questions
-        all_mcqs = []
-        for skill, questions in assessment['mcq_questions'].items():
-            all_mcqs.extend(questions)
-        
-        # Shuffle questions for randomized quiz experience
-        random.shuffle(all_mcqs)
-        
-        # Get coding challenges
-        coding_challenges_by_skill = assessment['coding_challenges']
-        
-        # Flatten coding challenges for display
-        all_coding_challenges = []
-        for skill, difficulties in coding_challenges_by_skill.items():
-            for difficulty, challenges in difficulties.items():
-                for challenge in challenges:
-                    challenge['skill'] = skill
-                    challenge['difficulty_level'] = difficulty
-                    all_coding_challenges.append(challenge)
-        
-        # Build quiz response
-        quiz = {
-            'mcq_questions': all_mcqs,
-            'coding_challenges': all_coding_challenges,
-            'total_mcqs': len(all_mcqs),
-            'total_coding': len(all_coding_challenges),
-            'mcq_structure': {
-                'per_skill': 5,
-                'total_skills': len(skills_with_proficiency)
-            },
-            'coding_structure': {
-                'per_skill': 5,
-                'breakdown': {
-                    'basic': 1,
-                    'intermediate': 2,
-                    'advanced': 2
-                },
-                'total_skills': len(coding_challenges_by_skill)
-            },
-            'time_limit_mcq': Config.QUIZ_TIME_LIMIT,
-            'time_limit_coding': Config.CODING_TIME_LIMIT
-        }
+        skills_with_proficiency = get_assessment_skills(session)
         
-        # Store quiz in session
-        session['quiz'] = quiz
-        session['quiz_start_time'] = datetime.now().isoformat()
-        session['skills_for_assessment'] = skills_with_proficiency
-        
-        logger.info(f"Generated quiz: {len(all_mcqs)} MCQs, {len(all_coding_challenges)} coding challenges")
+        per_skill = [
+            generate_skill_questions(skill, proficiency, data.get('source'))
+            for skill, proficiency in skills_with_proficiency.items()
+        ]
+        quiz = store_quiz(session, per_skill, skills_with_proficiency)
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
-            'quiz': quiz
+            'quiz': public_quiz(quiz)
         })
         
     except Exception as e:
         logger.error(f"Quiz generation error: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/generate-quiz/stream', methods=['GET'])
+def generate_quiz_stream():
+    """
+    Server-Sent Events variant of /api/generate-quiz
+    
+    Emits 'start', then one 'skill' event per skill as soon as its questions
+    are ready (in completion order), then 'done'. The session's quiz grows
+    with every event, so questions already shown can be answered and submitted.
+    """
+    session_id = request.args.get('session_id')
+    source = request.args.get('source')
+    
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Invalid session'}), 400
+    not_ready = resume_not_ready(session)
+    if not_ready:
+        return jsonify({'error': not_ready}), 409
+    
+    skills_with_proficiency = get_assessment_skills(session)
+    
+    def events():
+        quiz = build_quiz([], [], skills_with_proficiency)
+        with sessions.lock(session_id):
+            session = sessions[session_id]
+            generation = new_quiz_generation(session)
+            session['quiz'] = quiz
+            session['mcq_index'] = {}
+            session['mcq_answer_sheet'] = MCQAnswerSheet()
+            session['quiz_start_time'] = datetime.now().isoformat()
+            session['skills_for_assessment'] = skills_with_proficiency
+            sessions.save(session_id)
+        
+        yield sse_event('start', {
+            'skills': list(skills_with_proficiency),
+            'time_limit_mcq': quiz['time_limit_mcq'],
+            'time_limit_coding': quiz['time_limit_coding']
+        })
+        
+        # Generate every skill at once; LLM-backed generation is I/O bound
+        executor = ThreadPoolExecutor(max_workers=max(1, len(skills_with_proficiency)))
+        try:
+            futures = {
+                executor.submit(tracing.wrap(generate_skill_questions), skill, proficiency, source): skill
+                for skill, proficiency in skills_with_proficiency.items()
+            }
+            
+            for future in as_completed(futures):
+                skill = futures[future]
+                try:
+                    mcqs, challenges = future.result()
+                except Exception as e:
+                    logger.error(f"Quiz generation error for {skill}: {str(e)}", exc_info=True)
+                    yield sse_event('skill_error', {'skill': skill, 'error': str(e)})
+                    continue
+                
+                random.shuffle(mcqs)
+                with sessions.lock(session_id):
+                    session = sessions[session_id]
+                    if session.get('quiz_generation') != generation:
+                        # A newer quiz replaced this one; its sheet and indexes are not ours to touch
+                        logger.info(f"Quiz stream for {session_id} superseded by a newer quiz")
+                        return
+                    # Offsets are the indexes answers and submissions refer to
+                    mcq_offset = len(quiz['mcq_questions'])
+                    coding_offset = len(quiz['coding_challenges'])
+                    quiz['mcq_questions'].extend(mcqs)
+                    quiz['coding_challenges'].extend(challenges)
+                    quiz.update(build_quiz(quiz['mcq_questions'], quiz['coding_challenges'], skills_with_proficiency))
+                    # Re-attach in case the session was reloaded from storage meanwhile
+                    session['quiz'] = quiz
+                    session.setdefault('mcq_index', {}).update(index_mcqs(mcqs))
+                    session['mcq_answer_sheet'].add_questions(mcqs)
+                    sessions.save(session_id)
+                
+                yield sse_event('skill', {
+                    'skill': skill,
+                    'mcq_questions': mcqs,
+                    'coding_challenges': [
+                        challenge_summary(challenge, coding_offset + i) for i, challenge in enumerate(challenges)
+                    ],
+                    'mcq_offset': mcq_offset,
+                    'coding_offset': coding_offset
+                })
+        finally:
+            # Skills still generating are abandoned when the stream stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        logger.info(f"Streamed quiz: {quiz['total_mcqs']} MCQs, {quiz['total_coding']} coding challenges")
+        yield sse_event('done', {
+            key: value for key, value in quiz.items()
+            if key not in ('mcq_questions', 'coding_challenges')
+        })
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def store_quiz(session: dict, per_skill: list, skills_with_proficiency: dict) -> dict:
+    """
+    Assemble a quiz from each skill's (mcq_questions, coding_challenges) and start it
+    
+    Returns:
+        The quiz, now the session's; the caller saves the session
+    """
+    all_mcqs = [mcq for mcqs, _ in per_skill for mcq in mcqs]
+    all_coding_challenges = [challenge for _, challenges in per_skill for challenge in challenges]
+    
+    # Shuffle questions for randomized quiz experience
+    random.shuffle(all_mcqs)
+    
+    quiz = build_quiz(all_mcqs, all_coding_challenges, skills_with_proficiency)
+    new_quiz_generation(session)
+    session['quiz'] = quiz
+    session['mcq_index'] = index_mcqs(all_mcqs)
+    session['mcq_answer_sheet'] = MCQAnswerSheet(all_mcqs)
+    session['quiz_start_time'] = datetime.now().isoformat()
+    session['skills_for_assessment'] = skills_with_proficiency
+    
+    logger.info(f"Generated quiz: {len(all_mcqs)} MCQs, {len(all_coding_challenges)} coding challenges")
+    return quiz
+
+def new_quiz_generation(session: dict) -> str:
+    """
+    Mark the session's quiz as replaced and return the new quiz's generation id
+    
+    A quiz stream still filling in an older quiz checks this id and stops
+    instead of writing over the newer quiz.
+    """
+    session['quiz_generation'] = secrets.token_hex(8)
+    return session['quiz_generation']
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {fast_json.dumps(data).decode('utf-8')}\n\n"
+
+def get_assessment_skills(session: dict) -> dict:
+    """Top skills to assess for a session, as {skill: proficiency}"""
+    skills_for_assessment = skill_analyzer.get_skills_for_assessment(
+        session['skill_analysis']['with_proficiency'],
+        max_skills=5
+    )
+    return {s['skill']: s['proficiency'] for s in skills_for_assessment}
+
+def generate_skill_questions(skill: str, proficiency: str, source: str = None):
+    """
+    MCQs and flattened coding challenges for one skill
+    
+    Args:
+        source: 'ai' to generate with the LLM-backed QuestionGenerator,
+            otherwise the built-in question bank (5 MCQ + coding challenges per skill)
+    
+    Returns:
+        (mcq_questions, coding_challenges)
+    """
+    with tracing.span('quiz.skill_questions', skill=skill, source=source or 'bank'):
+        return _generate_skill_questions(skill, proficiency, source)
+
+def _generate_skill_questions(skill: str, proficiency: str, source: str = None):
+    if source == 'ai':
+        mcqs = with_question_ids(question_generator.generate_mcq_questions(skill, proficiency, Config.MCQ_PER_SKILL), skill)
+        challenges = []
+        if skill in question_generator.CODING_LANGUAGES:
+            generated_topics = []
+            for _ in range(getattr(Config, 'CODING_CHALLENGES_PER_SKILL', 3)):
+                challenge = question_generator.generate_coding_challenge(skill, proficiency, generated_topics)
+                if challenge:
+                    challenges.append(dict(challenge, skill=skill, difficulty_level=proficiency))
+                    generated_topics.append(challenge.get('title', 'Unknown'))
+        return mcqs, challenges
+    
+    skills = {skill: proficiency}
+    mcqs = enhanced_question_generator.generate_skill_based_mcq(skills).get(skill.strip(), [])
+    difficulties = enhanced_question_generator.generate_coding_challenges(skills).get(skill.strip(), {})
+    
+    # Flatten coding challenges for display
+    challenges = [
+        dict(challenge, skill=skill, difficulty_level=difficulty)
+        for difficulty, level_challenges in difficulties.items()
+        for challenge in level_challenges
+    ]
+    return with_question_ids(mcqs, skill), challenges
+
+def with_question_ids(mcq_questions: list, skill: str) -> list:
+    """
+    Copies of MCQs tagged with their skill and a stable id
+    
+    The id is derived from the skill and question text, so it survives
+    regenerating or reshuffling the quiz.
+    """
+    return [
+        dict(question, skill=skill, id=mcq_question_id(skill, question.get('question', '')))
+        for question in mcq_questions
+    ]
+
+def mcq_question_id(skill: str, question_text: str) -> str:
+    return 'mcq-' + hashlib.sha1(f"{skill}\n{question_text}".encode('utf-8')).hexdigest()[:12]
+
+def index_mcqs(mcq_questions: list) -> dict:
+    """
+    Question id -> correct answer and skill, stored in the session for grading
+    
+    Questions are also indexed by their text, which older clients send as the id.
+    """
+    index = {}
+    for question in mcq_questions:
+        entry = {'correct_answer': question.get('correct_answer'), 'skill': question.get('skill')}
+        if question.get('question'):
+            index[question['question']] = entry
+        if question.get('id'):
+            index[question['id']] = entry
+    return index
+
+@tracing.traced('quiz.assemble')
+def build_quiz(mcq_questions: list, coding_challenges: list, skills_with_proficiency: dict) -> dict:
+    """Assemble the quiz document stored in the session and returned to the client"""
+    return {
+        'mcq_questions': mcq_questions,
+        'coding_challenges': coding_challenges,
+        'total_mcqs': len(mcq_questions),
+        'total_coding': len(coding_challenges),
+        'mcq_structure': {
+            'per_skill': 5,
+            'total_skills': len(skills_with_proficiency)
+        },
+        'coding_structure': {
+            'per_skill': 5,
+            'breakdown': {
+                'basic': 1,
+                'intermediate': 2,
+                'advanced': 2
+            },
+            'total_skills': len({c['skill'] for c in coding_challenges})
+        },
+        'time_limit_mcq': Config.QUIZ_TIME_LIMIT,
+        'time_limit_coding': Config.CODING_TIME_LIMIT
+    }
+
+# Listed in the quiz; the rest is loaded when a challenge is opened
+CHALLENGE_SUMMARY_FIELDS = ('title', 'skill', 'difficulty', 'difficulty_level')
+CHALLENGE_DETAIL_FIELDS = CHALLENGE_SUMMARY_FIELDS + (
+    'description', 'input_format', 'output_format', 'constraints', 'hints',
+    'starter_code', 'sample_test_cases', 'time_limit'
+)
+
+def public_quiz(quiz: dict) -> dict:
+    """The quiz as sent to the client, with coding challenges reduced to summaries"""
+    return dict(quiz, coding_challenges=[
+        challenge_summary(challenge, index) for index, challenge in enumerate(quiz['coding_challenges'])
+    ])
+
+def challenge_summary(challenge: dict, index: int) -> dict:
+    return project_challenge(challenge, index, CHALLENGE_SUMMARY_FIELDS)
+
+def project_challenge(challenge: dict, index: int, fields) -> dict:
+    """
+    Selected public fields of a coding challenge, tagged with its quiz index
+    
+    Only sample test cases are ever included; hidden ones and reference
+    solutions stay in the session for grading.
+    """
+    projected = {'index': index}
+    for field in fields:
+        value = sample_test_cases(challenge) if field == 'sample_test_cases' else challenge.get(field)
+        if value is not None:
+            projected[field] = value
+    return projected
+
+def sample_test_cases(challenge: dict) -> list:
+    samples = challenge.get('sample_test_cases') or challenge.get('test_cases', [])[:Config.CODING_SAMPLE_TEST_CASES]
+    return [
+        {key: case[key] for key in ('input', 'expected_output', 'explanation') if key in case}
+        for case in samples
+    ]
+
+# All a candidate learns about a hidden test case from running their code
+HIDDEN_TEST_RESULT_FIELDS = ('test_case', 'passed', 'execution_time', 'error')
+
+def public_code_result(result: dict, challenge: dict) -> dict:
+    """
+    An evaluation result as sent to the client
+    
+    Sample tests come first in a challenge's test cases and are reported in
+    full; the hidden ones past them keep only whether they passed and the
+    error, so their inputs and expected outputs never leave the server.
+    """
+    samples = len(sample_test_cases(challenge))
+    return dict(result, test_results=[
+        test if number < samples else dict(
+            {key: test[key] for key in HIDDEN_TEST_RESULT_FIELDS if key in test}, hidden=True
+        )
+        for number, test in enumerate(result.get('test_results', []))
+    ])
+
+@app.route('/api/coding-challenges/<int:index>', methods=['GET'])
+def coding_challenge_detail(index):
+    """
+    One coding challenge of the session's quiz, fetched when it is displayed
+    
+    Query params:
+        session_id: Session the quiz belongs to
+        fields: Optional comma-separated subset of CHALLENGE_DETAIL_FIELDS
+    """
+    session = sessions.get(request.args.get('session_id'))
+    if session is None:
+        return jsonify({'error': 'Invalid session'}), 400
+    
+    challenges = (session.get('quiz') or {}).get('coding_challenges', [])
+    if index >= len(challenges):
+        return jsonify({'error': 'Challenge not found'}), 404
+    
+    fields = CHALLENGE_DETAIL_FIELDS
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in CHALLENGE_DETAIL_FIELDS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    return jsonify({
+        'success': True,
+        'challenge': project_challenge(challenges[index], index, fields)
+    })
+
+def coding_challenge_at(quiz: dict, index):
+    """The quiz's coding challenge at a client-supplied index, or None if there is none"""
+    challenges = quiz.get('coding_challenges') or []
+    if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(challenges):
+        return None
+    return challenges[index]
+
+def mcq_answer_sheet(session: dict) -> MCQAnswerSheet:
+    """The session's answer sheet (built from the quiz for sessions that predate it)"""
+    sheet = session.get('mcq_answer_sheet')
+    if sheet is None:
+        sheet = session['mcq_answer_sheet'] = MCQAnswerSheet(session['quiz']['mcq_questions'])
+    return sheet
+
+def record_mcq_answers(sheet: MCQAnswerSheet, answers: dict):
+    """
+    Grade {question index: answer} into the sheet; None clears an answer
+    
+    Every index is checked before any answer is recorded, so a rejected
+    batch leaves the sheet unchanged.
+    
+    Raises:
+        ValueError: An index is not a question of the quiz
+    """
+    graded = []
+    for index, answer in answers.items():
+        try:
+            position = int(index)
+        except (TypeError, ValueError):
+            position = -1
+        if not 0 <= position < sheet.total_questions:
+            raise ValueError(f"Unknown question index: {index}")
+        graded.append((position, answer))
+    
+    for position, answer in graded:
+        sheet.record(position, answer)
+
+@app.route('/api/quiz-answers', methods=['PATCH'])
+@session_locked
+def save_quiz_answers():
+    """Autosave answers as they are chosen: {session_id, answers: {question index: answer}}"""
+    data = request.json
+    session_id = data.get('session_id')
+    answers = data.get('answers')
+    
+    if session_id not in sessions:
+        return jsonify({'error': 'Invalid session'}), 400
+    
+    session = sessions[session_id]
+    if not session.get('quiz'):
+        return jsonify({'error': 'No quiz found'}), 400
+    if not isinstance(answers, dict):
+        return jsonify({'error': 'answers must be an object'}), 400
+    
+    sheet = mcq_answer_sheet(session)
+    if sheet.submitted:
+        return jsonify({'error': 'Quiz already submitted'}), 409
+    try:
+        record_mcq_answers(sheet, answers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    sessions.save(session_id)
+    
+    return jsonify({
+        'success': True,
+        'answered': sheet.answered,
+        'total_questions': sheet.total_questions
+    })
+
 @app.route('/api/submit-quiz', methods=['POST'])
+@session_locked
 def submit_quiz():
-    """Submit and evaluate quiz answers"""
+    """Submit the quiz; answers already autosaved are graded, `answers` may carry the rest"""
     try:
         data = request.json
         session_id = data.get('session_id')
-        answers = data.get('answers', {})
+        answers = data.get('answers') or {}
         
         if session_id not in sessions:
             return jsonify({'error': 'Invalid session'}), 400
@@ -312,14 +988,21 @@ def submit_quiz():
         if not quiz:
             return jsonify({'error': 'No quiz found'}), 400
         
-        # Evaluate MCQ
-        mcq_results = evaluator.evaluate_mcq_quiz(
-            quiz['mcq_questions'],
-            answers
-        )
+        sheet = mcq_answer_sheet(session)
+        if sheet.submitted:
+            return jsonify({'error': 'Quiz already submitted'}), 409
+        try:
+            record_mcq_answers(sheet, answers)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Evaluate MCQ; every answer was graded as it arrived
+        sheet.submitted = True
+        mcq_results = evaluator.summarize_mcq_answers(sheet)
         
         # Store results
         session['mcq_results'] = mcq_results
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -330,6 +1013,7 @@ def submit_quiz():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/submit-code', methods=['POST'])
+@session_locked
 def submit_code():
     """Submit and evaluate code"""
     try:
@@ -349,29 +1033,38 @@ def submit_code():
         if not quiz or not quiz.get('coding_challenges'):
             return jsonify({'error': 'No coding challenge found'}), 400
         
-        challenge = quiz['coding_challenges'][challenge_index]
+        challenge = coding_challenge_at(quiz, challenge_index)
+        if challenge is None:
+            return jsonify({'error': 'Invalid challenge index'}), 400
         test_cases = challenge.get('test_cases', [])
         
         # Language validation removed - users can now solve challenges in any supported language
         
-        # Evaluate code
-        result = evaluator.evaluate_code(code, language, test_cases)
+        # Evaluate code (identical re-runs, e.g. preview then submit, reuse the stored result)
+        digest = submission_digest(code, language, test_cases)
+        result = code_results.get(session_id, digest)
+        if result is None:
+            result = evaluator.evaluate_code(code, language, test_cases)
+            result['from_cache'] = False
+            code_results.put(session_id, digest, result)
         
         # Store results ONLY if not in preview mode
         if not is_preview:
             if 'coding_results' not in session:
                 session['coding_results'] = []
             session['coding_results'].append(result)
+            sessions.save(session_id)
         
         return jsonify({
             'success': True,
-            'result': result
+            'result': public_code_result(result, challenge)
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/start-interview', methods=['POST'])
+@session_locked
 def start_interview():
     """Start HR interview"""
     try:
@@ -382,6 +1075,9 @@ def start_interview():
             return jsonify({'error': 'Invalid session'}), 400
         
         session = sessions[session_id]
+        not_ready = resume_not_ready(session)
+        if not_ready:
+            return jsonify({'error': not_ready}), 409
         resume_data = session['resume_data']
         
         # Initialize HR interviewer
@@ -401,6 +1097,7 @@ def start_interview():
         session['hr_interviewer'] = hr_interviewer
         session['emotion_analyzer'] = emotion_analyzer
         session['attention_analyzer'] = None
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -412,6 +1109,7 @@ def start_interview():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analyze-emotion', methods=['POST'])
+@session_locked
 def analyze_emotion():
     """Receive and store emotion data from video interview"""
     try:
@@ -435,6 +1133,7 @@ def analyze_emotion():
         
         # Add emotion data
         emotion_analyzer.add_emotion_data(emotion, confidence, timestamp)
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -460,6 +1159,7 @@ def track_attention():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/final-attention', methods=['POST'])
+@session_locked
 def final_attention():
     """Store final attention summary"""
     try:
@@ -472,6 +1172,7 @@ def final_attention():
         
         session = sessions[session_id]
         session['final_attention_summary'] = summary
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -483,6 +1184,7 @@ def final_attention():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/interview-response', methods=['POST'])
+@session_locked
 def interview_response():
     """Send candidate response and get next question"""
     try:
@@ -501,6 +1203,7 @@ def interview_response():
         
         # Get next question
         next_question = hr_interviewer.get_next_question(response)
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -511,6 +1214,7 @@ def interview_response():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/end-interview', methods=['POST'])
+@session_locked
 def end_interview():
     """End HR interview and get evaluation"""
     try:
@@ -522,8 +1226,6 @@ def end_interview():
         
         session = sessions[session_id]
         hr_interviewer = session.get('hr_interviewer')
-        emotion_analyzer = session.get('emotion_analyzer')
-        attention_analyzer = session.get('attention_analyzer')
         
         if not hr_interviewer:
             return jsonify({'error': 'Interview not started'}), 400
@@ -531,34 +1233,12 @@ def end_interview():
         # End interview
         closing = hr_interviewer.end_interview()
         
-        # End emotion tracking
-        if emotion_analyzer:
-            emotion_analyzer.end_session()
-            emotion_summary = emotion_analyzer.get_emotion_summary()
-            session['emotion_summary'] = emotion_summary
-        else:
-            session['emotion_summary'] = {}
-        
-        # Get attention tracking summary
-        if attention_analyzer:
-            attention_analyzer.end_session()
-            attention_summary = attention_analyzer.get_attention_summary()
-            session['attention_summary'] = attention_summary
-        else:
-            # Use final summary if available, otherwise empty
-            attention_summary = session.get('final_attention_summary', {})
-            session['attention_summary'] = attention_summary
+        attention_summary = finish_interview_tracking(session)
         
         # Evaluate performance
         evaluation = hr_interviewer.evaluate_interview_performance()
-        
-        # Add engagement score to evaluation
-        if attention_summary:
-            evaluation['engagement_score'] = attention_summary.get('engagement_score', 0)
-            evaluation['attention_percentage'] = attention_summary.get('attention_percentage', 0)
-        
-        # Store evaluation
-        session['hr_evaluation'] = evaluation
+        store_interview_evaluation(session, evaluation, attention_summary)
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -570,7 +1250,39 @@ def end_interview():
         logger.error(f"End interview error: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+def finish_interview_tracking(session: dict) -> dict:
+    """Close emotion/attention tracking for an interview; returns the attention summary"""
+    emotion_analyzer = session.get('emotion_analyzer')
+    attention_analyzer = session.get('attention_analyzer')
+    
+    # End emotion tracking
+    if emotion_analyzer:
+        emotion_analyzer.end_session()
+        session['emotion_summary'] = emotion_analyzer.get_emotion_summary()
+    else:
+        session['emotion_summary'] = {}
+    
+    # Get attention tracking summary
+    if attention_analyzer:
+        attention_analyzer.end_session()
+        attention_summary = attention_analyzer.get_attention_summary()
+    else:
+        # Use final summary if available, otherwise empty
+        attention_summary = session.get('final_attention_summary', {})
+    session['attention_summary'] = attention_summary
+    
+    return attention_summary
+
+def store_interview_evaluation(session: dict, evaluation: dict, attention_summary: dict):
+    """Add engagement scores to an HR evaluation and store it in the session"""
+    if attention_summary:
+        evaluation['engagement_score'] = attention_summary.get('engagement_score', 0)
+        evaluation['attention_percentage'] = attention_summary.get('attention_percentage', 0)
+    
+    session['hr_evaluation'] = evaluation
+
 @app.route('/api/final-report', methods=['POST'])
+@session_locked
 def final_report():
     """Generate final assessment report"""
     try:
@@ -594,6 +1306,7 @@ def final_report():
         
         # Store report
         session['final_report'] = report
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -604,6 +1317,7 @@ def final_report():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/download-report', methods=['GET'])
+@session_locked
 def download_report():
     """Download report as HTML"""
     try:
@@ -627,6 +1341,7 @@ def download_report():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/enhanced-interview/start', methods=['POST'])
+@session_locked
 def enhanced_interview_start():
     """Start enhanced HR interview with behavioral and technical questions"""
     try:
@@ -637,6 +1352,9 @@ def enhanced_interview_start():
             return jsonify({'error': 'Invalid session'}), 400
         
         session = sessions[session_id]
+        not_ready = resume_not_ready(session)
+        if not_ready:
+            return jsonify({'error': not_ready}), 409
         
         # Get skills from resume
         skill_analysis = session.get('skill_analysis', {})
@@ -646,6 +1364,7 @@ def enhanced_interview_start():
         interview_session = InterviewSession(skills)
         session['interview_session'] = interview_session
         session['interview_answers'] = []
+        sessions.save(session_id)
         
         # Get first question
         first_question = interview_session.get_current_question()
@@ -665,6 +1384,7 @@ def enhanced_interview_start():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/enhanced-interview/submit-answer', methods=['POST'])
+@session_locked
 def enhanced_interview_submit():
     """Submit answer to interview question"""
     try:
@@ -692,12 +1412,14 @@ def enhanced_interview_submit():
         
         # Store answer
         session['interview_answers'].append(result['evaluation'])
+        sessions.save(session_id)
         
         # Check if interview is complete
         if interview_session.is_complete():
             # Get summary
             summary = interview_session.get_summary()
             session['interview_summary'] = summary
+            sessions.save(session_id)
             
             return jsonify({
                 'success': True,
@@ -722,6 +1444,7 @@ def enhanced_interview_submit():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/enhanced-report', methods=['POST'])
+@session_locked
 def enhanced_final_report():
     """Generate enhanced final assessment report"""
     try:
@@ -742,25 +1465,23 @@ def enhanced_final_report():
         skills_with_proficiency = session.get('skills_for_assessment', {})
         
         # Calculate MCQ results by skill
+        questions_per_skill = {}
+        for question in mcq_questions:
+            questions_per_skill[question.get('skill')] = questions_per_skill.get(question.get('skill'), 0) + 1
+        
         mcq_by_skill = {}
         for skill in skills_with_proficiency.keys():
             mcq_by_skill[skill] = {
                 'correct': 0,
-                'total': 5  # 5 MCQ per skill
+                'total': questions_per_skill.get(skill) or 5  # 5 MCQ per skill
             }
         
-        # Parse MCQ answers to count correct ones
+        # One lookup per answer; quizzes stored before question ids existed are indexed here
+        mcq_index = session.get('mcq_index') or index_mcqs(mcq_questions)
         for q_id, answer in mcq_answers.items():
-            # Find matching question and check if correct
-            for question in mcq_questions:
-                if question.get('id') == q_id or question.get('question') == q_id:
-                    if answer == question.get('correct_answer'):
-                        # Find which skill this question belongs to
-                        for skill in mcq_by_skill.keys():
-                            if mcq_by_skill[skill]['total'] > 0:
-                                mcq_by_skill[skill]['correct'] += 1
-                                break
-                    break
+            entry = mcq_index.get(q_id)
+            if entry and answer == entry['correct_answer'] and entry['skill'] in mcq_by_skill:
+                mcq_by_skill[entry['skill']]['correct'] += 1
         
         # Calculate coding results by skill and difficulty
         coding_by_skill = {}
@@ -797,6 +1518,7 @@ def enhanced_final_report():
         
         # Store report
         session['enhanced_report'] = report
+        sessions.save(session_id)
         
         return jsonify({
             'success': True,
@@ -807,5 +1529,14 @@ def enhanced_final_report():
         logger.error(f"Enhanced report generation error: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+if not Config.LAZY_MODULES:
+    startup.preload()
+    frontend_assets.warm()
+    if Config.PREFORK:
+        # Shared copy-on-write by the workers; keep the collector off these pages
+        startup.freeze()
+
+startup.mark_ready()
+
 if __name__ == '__main__':
-    app.run(debug=Config.DEBUG, host='0.0.0.0', port=5000)
+    app.run(debug=Config.DEBUG, host='0.0.0.0', port=5000, threaded=True)
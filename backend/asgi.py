@@ -0,0 +1,395 @@
+"""
+Async (ASGI) serving mode
+
+The quiz-generation, interview and code-submission routes spend almost all
+of their time waiting on the LLM or Judge0. Here they run as coroutines, so
+one process can hold hundreds of them in flight; every other route is served
+by the regular Flask app through a WSGI adapter.
+
+Run with:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from app import (
+    app as flask_app, sessions, evaluator, code_results, coding_challenge_at, resume_not_ready,
+    public_code_result, finish_interview_tracking, store_interview_evaluation, question_generator,
+    get_assessment_skills, generate_skill_questions, with_question_ids, store_quiz, public_quiz,
+    CORS_ORIGINS
+)
+from config import Config
+from modules.hr_interviewer import HRInterviewer
+from modules.emotion_analyzer import EmotionAnalyzer
+from modules.judge0_client import close_async_http
+from modules.result_cache import submission_digest
+from modules import fast_json, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+
+class WsgiAdapter:
+    """
+    Serve a WSGI app from ASGI, one request per thread of a dedicated pool
+
+    asgiref's WsgiToAsgi runs every call thread-sensitively, i.e. one at a
+    time on a single shared thread. The Flask app is thread-safe, so requests
+    run in parallel here, on their own pool: Flask routes waiting for a
+    session lock never occupy the threads that async routes evaluate code on.
+    Responses are streamed as the app yields them (SSE, NDJSON).
+    """
+
+    def __init__(self, wsgi_application, threads: int):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f"WSGI adapter received a {scope['type']!r} scope")
+
+        with SpooledTemporaryFile(max_size=65536) as body:
+            more_body = True
+            while more_body:
+                message = await receive()
+                body.write(message.get('body', b''))
+                more_body = message.get('more_body', False)
+            body.seek(0)
+
+            run = sync_to_async(self._run, thread_sensitive=False, executor=self.executor)
+            await run(scope, body, async_to_sync(send))
+
+    def _run(self, scope, body, send):
+        status_line = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and status_line.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            status_line['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+            }
+
+        def send_start():
+            if not status_line.get('sent'):
+                status_line['sent'] = True
+                send(status_line['start'])
+
+        response = self.wsgi_application(_environ(scope, body), start_response)
+        try:
+            for chunk in response:
+                if chunk:
+                    send_start()
+                    send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+        send_start()
+        send({'type': 'http.response.body'})
+
+
+def _environ(scope, body) -> dict:
+    """WSGI environ for an ASGI HTTP scope (PEP 3333)"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': BytesIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+wsgi_app = WsgiAdapter(flask_app, Config.ASGI_WSGI_THREADS)
+
+
+async def generate_quiz(data: dict):
+    """Generate quiz based on skills, every skill at once"""
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return 400, {'error': 'Invalid session'}
+    not_ready = resume_not_ready(session)
+    if not_ready:
+        return 409, {'error': not_ready}
+
+    skills_with_proficiency = get_assessment_skills(session)
+    per_skill = await asyncio.gather(*[
+        generate_skill_questions_async(skill, proficiency, data.get('source'))
+        for skill, proficiency in skills_with_proficiency.items()
+    ])
+    quiz = store_quiz(session, per_skill, skills_with_proficiency)
+    sessions.save(session_id)
+
+    return 200, {
+        'success': True,
+        'quiz': public_quiz(quiz)
+    }
+
+
+async def generate_skill_questions_async(skill: str, proficiency: str, source: str = None):
+    """
+    Non-blocking variant of app.generate_skill_questions()
+
+    LLM calls are awaited; the built-in question bank is CPU work and runs
+    on a worker thread. Challenges within one skill stay sequential because
+    each one must avoid the topics of the previous ones.
+    """
+    if source != 'ai':
+        return await sync_to_async(generate_skill_questions, thread_sensitive=False)(skill, proficiency, source)
+
+    with tracing.span('quiz.skill_questions', skill=skill, source=source):
+        mcqs = await question_generator.generate_mcq_questions_async(skill, proficiency, Config.MCQ_PER_SKILL)
+        challenges = []
+        if skill in question_generator.CODING_LANGUAGES:
+            generated_topics = []
+            for _ in range(getattr(Config, 'CODING_CHALLENGES_PER_SKILL', 3)):
+                challenge = await question_generator.generate_coding_challenge_async(skill, proficiency, generated_topics)
+                if challenge:
+                    challenges.append(dict(challenge, skill=skill, difficulty_level=proficiency))
+                    generated_topics.append(challenge.get('title', 'Unknown'))
+        return with_question_ids(mcqs, skill), challenges
+
+
+async def start_interview(data: dict):
+    """Start HR interview"""
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return 400, {'error': 'Invalid session'}
+    not_ready = resume_not_ready(session)
+    if not_ready:
+        return 409, {'error': not_ready}
+
+    hr_interviewer = HRInterviewer()
+    first_question = await hr_interviewer.initialize_interview_async(session['resume_data'])
+
+    # Initialize emotion analyzer for video interview
+    emotion_analyzer = EmotionAnalyzer()
+    emotion_analyzer.start_session()
+
+    session['hr_interviewer'] = hr_interviewer
+    session['emotion_analyzer'] = emotion_analyzer
+    session['attention_analyzer'] = None
+    sessions.save(session_id)
+
+    return 200, {
+        'success': True,
+        'message': first_question['message']
+    }
+
+
+async def interview_response(data: dict):
+    """Send candidate response and get next question"""
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return 400, {'error': 'Invalid session'}
+
+    hr_interviewer = session.get('hr_interviewer')
+    if not hr_interviewer:
+        return 400, {'error': 'Interview not started'}
+
+    next_question = await hr_interviewer.get_next_question_async(data.get('response'))
+    sessions.save(session_id)
+
+    return 200, {
+        'success': True,
+        'message': next_question['message']
+    }
+
+
+async def end_interview(data: dict):
+    """End HR interview and get evaluation"""
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return 400, {'error': 'Invalid session'}
+
+    hr_interviewer = session.get('hr_interviewer')
+    if not hr_interviewer:
+        return 400, {'error': 'Interview not started'}
+
+    closing = await hr_interviewer.end_interview_async()
+    attention_summary = finish_interview_tracking(session)
+
+    evaluation = await hr_interviewer.evaluate_interview_performance_async()
+    store_interview_evaluation(session, evaluation, attention_summary)
+    sessions.save(session_id)
+
+    return 200, {
+        'success': True,
+        'closing_message': closing['message'],
+        'evaluation': evaluation
+    }
+
+
+async def submit_code(data: dict):
+    """Submit and evaluate code"""
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if session is None:
+        return 400, {'error': 'Invalid session'}
+
+    quiz = session.get('quiz')
+    if not quiz or not quiz.get('coding_challenges'):
+        return 400, {'error': 'No coding challenge found'}
+
+    challenge = coding_challenge_at(quiz, data.get('challenge_index', 0))
+    if challenge is None:
+        return 400, {'error': 'Invalid challenge index'}
+    code, language, test_cases = data.get('code'), data.get('language'), challenge.get('test_cases', [])
+
+    digest = submission_digest(code, language, test_cases)
+    result = code_results.get(session_id, digest)
+    if result is None:
+        result = await evaluator.evaluate_code_async(code, language, test_cases)
+        result['from_cache'] = False
+        code_results.put(session_id, digest, result)
+
+    # Store results ONLY if not in preview mode
+    if not data.get('is_preview', False):
+        session.setdefault('coding_results', []).append(result)
+        sessions.save(session_id)
+
+    return 200, {
+        'success': True,
+        'result': public_code_result(result, challenge)
+    }
+
+
+# POST routes served natively; anything else falls through to Flask
+ASYNC_ROUTES = {
+    '/api/generate-quiz': generate_quiz,
+    '/api/start-interview': start_interview,
+    '/api/interview-response': interview_response,
+    '/api/end-interview': end_interview,
+    '/api/submit-code': submit_code,
+}
+
+
+async def _read_json(receive) -> Optional[dict]:
+    """The request's JSON object ({} if it is not one), or None once it passes MAX_CONTENT_LENGTH"""
+    chunks, size = [], 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > Config.MAX_CONTENT_LENGTH:
+            return None
+        chunks.append(chunk)
+        more_body = message.get('more_body', False)
+
+    try:
+        data = fast_json.loads(b''.join(chunks) or b'{}')
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def _send_json(send, status: int, payload: dict, headers: list = ()):
+    body = fast_json.dumps(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _cors_headers(scope) -> list:
+    """CORS headers as flask-cors sends them: an allowed Origin is echoed back, with credentials"""
+    origin = next((value for name, value in scope.get('headers', []) if name == b'origin'), None)
+    if origin is None or origin.decode('latin1') not in CORS_ORIGINS:
+        return []
+    return [
+        (b'access-control-allow-origin', origin),
+        (b'access-control-allow-credentials', b'true'),
+        (b'vary', b'Origin'),
+    ]
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_async_http()
+            sessions.flush()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+
+    handler = None
+    if scope['type'] == 'http' and scope['method'] == 'POST':
+        handler = ASYNC_ROUTES.get(scope['path'])
+
+    if handler is None:
+        await wsgi_app(scope, receive, send)
+        return
+
+    start = time.perf_counter()
+    data = await _read_json(receive)
+    if data is None:
+        await _send_json(send, 413, {'error': 'Request body too large'}, _cors_headers(scope))
+        metrics.observe_request('POST', scope['path'], 413, time.perf_counter() - start)
+        return
+    session_id = data.get('session_id')
+
+    try:
+        with tracing.start_trace(f"POST {scope['path']}", session_id=session_id):
+            if session_id:
+                async with sessions.lock_async(session_id):
+                    status, payload = await handler(data)
+            else:
+                status, payload = await handler(data)
+    except Exception as e:
+        logger.error(f"{scope['path']} error: {str(e)}", exc_info=True)
+        status, payload = 500, {'error': str(e)}
+
+    await _send_json(send, status, payload, _cors_headers(scope))
+    # Same labels as the Flask hook, so both serving modes share one series per route
+    metrics.observe_request('POST', scope['path'], status, time.perf_counter() - start)
@@ -0,0 +1,114 @@
+"""
+Benchmark: JSON encoding of real API payloads
+
+Builds a quiz and a final report (detailed coding results, emotion timeline)
+through the app itself, then times Flask's default stdlib provider against
+the orjson-backed FastJSONProvider on them.
+
+    python benchmark_json.py [--repeat 200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask.json.provider import DefaultJSONProvider
+
+from modules import fast_json
+from modules.emotion_analyzer import EmotionAnalyzer
+from modules.skill_analyzer import SkillAnalyzer
+
+SKILLS = ['Python', 'JavaScript', 'Java', 'SQL', 'C++']
+PYTHON_SOLUTION = "import sys\nprint(sum(int(x) for x in sys.stdin.read().split() if x.lstrip('-').isdigit()))"
+EMOTIONS = ['neutral', 'happy', 'focused', 'surprised', 'neutral', 'sad']
+
+
+def build_payloads():
+    """Responses (and a request body) with the shapes the app really sends"""
+    from app import app, sessions
+
+    client = app.test_client()
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'resume_data': {'name': 'Benchmark Candidate', 'skills': SKILLS, 'raw_text': 'experience ' * 400},
+        'skill_analysis': SkillAnalyzer().analyze_skills(SKILLS, ' '.join(SKILLS) + ' developer, 5 years'),
+        'upload_job': {'status': 'done'}
+    }
+
+    quiz_response = client.post('/api/generate-quiz', json={'session_id': session_id}).json
+    session = sessions[session_id]
+    stored_quiz = session['quiz']
+
+    answers = {str(i): q.get('correct_answer') for i, q in enumerate(stored_quiz['mcq_questions'])}
+    submit_quiz_body = {'session_id': session_id, 'answers': answers}
+    client.post('/api/submit-quiz', json=submit_quiz_body)
+
+    for index in range(len(stored_quiz['coding_challenges'])):
+        client.post('/api/submit-code', json={
+            'session_id': session_id, 'code': PYTHON_SOLUTION, 'language': 'python', 'challenge_index': index
+        })
+
+    analyzer = EmotionAnalyzer()
+    analyzer.start_session()
+    for i in range(600):
+        analyzer.add_emotion_data(EMOTIONS[i % len(EMOTIONS)], 0.5 + (i % 50) / 100)
+    sessions[session_id]['emotion_summary'] = analyzer.get_emotion_summary()
+
+    report_response = client.post('/api/final-report', json={'session_id': session_id}).json
+    del sessions[session_id]
+
+    return {
+        'generate-quiz response': quiz_response,
+        'quiz (session copy)': stored_quiz,
+        'final-report response': report_response,
+        'submit-quiz request': submit_quiz_body,
+    }
+
+
+def benchmark(payloads: dict, repeat: int):
+    from app import app
+
+    stdlib = DefaultJSONProvider(app)
+    fast = fast_json.FastJSONProvider(app)
+
+    header = f"{'stdlib':>13} {'orjson':>8} {'gain':>6}"
+    print(f"\n{'':<24} {'':>8}   {'encode':^29}   {'decode':^29}")
+    print(f"{'payload':<24} {'bytes':>8}   {header}   {header}")
+    for name, payload in payloads.items():
+        body = stdlib.dumps(payload)
+        timings = {}
+        for label, provider in (('stdlib', stdlib), ('fast', fast)):
+            # response() is what jsonify() runs; loads() is what request.json runs
+            timings[label, 'encode'] = min(timeit.repeat(lambda: provider.response(payload), number=repeat, repeat=3)) / repeat
+            timings[label, 'decode'] = min(timeit.repeat(lambda: provider.loads(body), number=repeat, repeat=3)) / repeat
+
+        columns = []
+        for operation in ('encode', 'decode'):
+            slow, quick = timings['stdlib', operation], timings['fast', operation]
+            columns.append(f"{slow * 1e6:>11.0f}µs {quick * 1e6:>6.0f}µs {slow / quick:>5.1f}x")
+        print(f"{name:<24} {len(body.encode('utf-8')):>8}   " + '   '.join(columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='calls per timing run')
+    args = parser.parse_args()
+
+    if fast_json.orjson is None:
+        sys.exit('orjson is not installed; the app is using the stdlib provider')
+
+    logging.disable(logging.INFO)
+    # Keep the benchmark's session database and uploads out of the working tree
+    os.chdir(tempfile.mkdtemp(prefix='skillmind-json-bench-'))
+
+    print("📦 Building payloads through the app...")
+    benchmark(build_payloads(), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
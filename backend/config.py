@@ -18,10 +18,70 @@ class Config:
     # OpenAI API settings
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', '')  # any OpenAI-compatible endpoint (e.g. load_test.py stubs)
     
     # Database settings
     DATABASE_PATH = 'database/interviews.db'
     
+    # Session store settings
+    SESSION_HOT_CAPACITY = int(os.getenv('SESSION_HOT_CAPACITY', '256'))  # sessions kept in memory
+    SESSION_IDLE_TTL = 30 * 60  # seconds before an idle session leaves memory
+    SESSION_RETENTION = 7 * 24 * 60 * 60  # seconds before a stored session is deleted
+    SESSION_SHARDS = 16  # independently locked slices of the in-memory tier
+    # Set when several worker processes share DATABASE_PATH
+    SESSION_SHARED_STORE = os.getenv('SESSION_SHARED_STORE', 'False') == 'True'
+    # Seconds between batched snapshots of changed sessions; 0 writes every change at once
+    SESSION_SNAPSHOT_INTERVAL = float(os.getenv('SESSION_SNAPSHOT_INTERVAL', '2'))
+    
+    # Startup settings
+    # Build modules (and import openai, PyPDF2, the question bank...) on first use
+    LAZY_MODULES = os.getenv('LAZY_MODULES', 'True') == 'True'
+    # Set by gunicorn.conf.py: app.py is imported once in the master and forked into
+    # workers, so background threads and processes are started per worker instead
+    PREFORK = os.getenv('PREFORK', 'False') == 'True'
+    # asgi.py: threads serving the Flask (non-native) routes concurrently
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '32'))
+    
+    # Background jobs (resume parsing)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '0'))  # worker processes; 0 = one per CPU core
+    JOB_RESULT_TTL = 10 * 60  # seconds a finished job stays in the in-process job table
+    JOB_WAIT_MAX = 30  # longest a request may block waiting for a job (long polling)
+    JOB_POLL_INTERVAL = 0.5  # seconds between session store checks for another worker's job
+    JOB_LOST_AFTER = 10 * 60  # a job still processing after this long is assumed lost
+    RESUME_CACHE_MAX_BYTES = 64 * 1024 * 1024  # parse results kept for repeat uploads of the same file
+    CODE_RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024  # evaluation results kept for unchanged code re-runs
+    CODE_RESULT_CACHE_PER_SESSION = 20  # results kept per candidate
+    
+    # Recruiter batch uploads (/api/upload-resumes/batch)
+    BATCH_MAX_FILES = 500  # resumes per batch
+    BATCH_MAX_CONTENT_LENGTH = 512 * 1024 * 1024  # 512MB per batch request
+    
+    # orjson for API request/response JSON when installed; the stdlib otherwise
+    FAST_JSON = os.getenv('FAST_JSON', 'True') == 'True'
+    
+    # Response compression (brotli is used when the package is installed)
+    COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESS_LEVEL = 6  # gzip level
+    COMPRESS_BROTLI_QUALITY = 5
+    
+    # Admission control: routes in a class with limits are throttled; all others never are
+    ADMISSION_CONTROL = os.getenv('ADMISSION_CONTROL', 'True') == 'True'
+    ADMISSION_ROUTE_CLASSES = {
+        '/api/analyze-emotion': 'telemetry',
+        '/api/track-attention': 'telemetry',
+    }
+    # Per class: requests/second and burst per session, requests/second per worker
+    # process, and requests of the class running at once (the remaining threads
+    # stay free for code submission and interview turns)
+    ADMISSION_LIMITS = {
+        'telemetry': {'session_rate': 1.0, 'session_burst': 5, 'global_rate': 200.0, 'concurrency': 4},
+    }
+    
+    # Tracing (Chrome trace event format; open in ui.perfetto.dev or chrome://tracing)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'False') == 'True'
+    TRACE_FILE = os.getenv('TRACE_FILE', 'traces/trace.json')
+    TRACE_SLOW_THRESHOLD_MS = int(os.getenv('TRACE_SLOW_THRESHOLD_MS', '0'))  # only write slower requests
+    
     # Assessment settings
     QUIZ_TIME_LIMIT = 30  # minutes
     CODING_TIME_LIMIT = 45  # minutes
@@ -50,6 +110,7 @@ class Config:
     # Number of questions per skill
     MCQ_PER_SKILL = 10  # Increased from 5 to 10 for better assessment
     CODING_CHALLENGES_PER_SKILL = 3  # 3 coding challenges per technical skill
+    CODING_SAMPLE_TEST_CASES = 2  # Shown as examples; the rest stay hidden on the server
     
     # Weighted scoring for final evaluation
     SCORING_WEIGHTS = {
@@ -61,6 +122,22 @@ class Config:
     # Code execution settings
     CODE_EXECUTION_TIMEOUT = 10  # seconds
     MAX_OUTPUT_LENGTH = 10000  # characters
+    # Languages run with the local toolchain instead of Judge0, e.g. 'c,cpp,java,javascript'
+    LOCAL_EXECUTION_LANGUAGES = [l.strip() for l in os.getenv('LOCAL_EXECUTION_LANGUAGES', '').split(',') if l.strip()]
+    # Test cases of one submission run concurrently on this many threads; 0 = one per available core
+    CODE_EXECUTION_WORKERS = int(os.getenv('CODE_EXECUTION_WORKERS', '0'))
+    # Warm interpreter processes for Python submissions; 0 = CODE_EXECUTION_WORKERS
+    PYTHON_WORKERS = int(os.getenv('PYTHON_WORKERS', '0'))
+    # Submissions a Python worker runs before it is replaced with a fresh one
+    PYTHON_WORKER_MAX_RUNS = int(os.getenv('PYTHON_WORKER_MAX_RUNS', '100'))
+    # Per-test limits for Python submissions (POSIX); wall time is CODE_EXECUTION_TIMEOUT
+    PYTHON_CPU_LIMIT = int(os.getenv('PYTHON_CPU_LIMIT', '0'))  # seconds; 0 = CODE_EXECUTION_TIMEOUT
+    PYTHON_MEMORY_LIMIT_MB = int(os.getenv('PYTHON_MEMORY_LIMIT_MB', '256'))  # 0 = unlimited
+    # Builds of C, C++, Rust, Java and C# submissions, reused for unchanged code
+    COMPILE_CACHE_DIR = os.getenv('COMPILE_CACHE_DIR', 'compile_cache')
+    COMPILE_CACHE_MAX_BYTES = int(os.getenv('COMPILE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+    # Builds used this recently are never evicted (they may be running in another worker process)
+    COMPILE_CACHE_EVICT_GRACE = int(os.getenv('COMPILE_CACHE_EVICT_GRACE', '300'))  # seconds
     
     # Judge0 API settings (for online code execution)
     JUDGE0_API_URL = os.getenv('JUDGE0_API_URL', 'https://ce.judge0.com')
@@ -0,0 +1,42 @@
+"""
+gunicorn settings for serving app.py from several pre-forked worker processes
+
+Run with:
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master with every module, question bank and
+template built up front (LAZY_MODULES=False), then frozen out of the garbage
+collector before forking. Workers share those pages copy-on-write instead of
+each building and holding its own copy.
+"""
+
+import gc
+import os
+
+# Before the app is imported: allocations made with the collector off leave
+# no freed holes in the pages that will be shared
+gc.disable()
+
+os.environ.setdefault('LAZY_MODULES', 'False')
+os.environ['PREFORK'] = 'True'
+# Workers serve the same sessions, so they must see each other's writes
+os.environ.setdefault('SESSION_SHARED_STORE', 'True')
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(os.cpu_count() or 1)))
+worker_class = 'gthread'
+threads = int(os.getenv('WORKER_THREADS', '8'))
+# Quiz generation and final reports may wait on the LLM for a while
+timeout = 120
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Anything allocated since the app finished loading
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+    from app import start_background_work
+    start_background_work()
@@ -0,0 +1,442 @@
+"""
+Load test: simulated candidates running the full assessment flow
+
+Every candidate uploads a resume, generates and submits the quiz, submits
+code, holds a short HR interview and requests the final report. OpenAI and
+Judge0 are replaced by a local stand-in with configurable latency, so the
+numbers show what this backend carries, not what the providers allow.
+
+The backend is started in a subprocess (its own working directory, so its
+uploads/ and database/ are throwaway) unless --url points at a running one.
+Concurrency is stepped up level by level; each level reports throughput
+and p50/p95/p99 latency per endpoint, and the saturation point is where
+adding candidates stops adding throughput.
+
+Usage:
+    python load_test.py --levels 1,2,4,8,16 --duration 20
+    python load_test.py --levels 8,16,32 --llm-latency 1.5 --asgi
+    python load_test.py --url http://127.0.0.1:5000 --levels 4 --json results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SKILL_POOL = ['Python', 'JavaScript', 'Java', 'SQL', 'React', 'Docker', 'C++', 'Node.js', 'AWS', 'Git']
+
+INTERVIEW_ANSWERS = [
+    "I led the migration of our reporting service to Flask, which cut response times by 40 percent.",
+    "When two teammates disagreed on the schema, I set up a short design review and we agreed on a plan.",
+    "I want to grow into a backend role where I own services end to end, from design to monitoring.",
+]
+
+STUB_EVALUATION = {
+    'communication_skills': 78, 'confidence': 74, 'relevance': 80, 'depth': 72, 'cultural_fit': 76,
+    'overall_score': 76, 'strengths': ['Clear examples'], 'areas_for_improvement': ['More detail'],
+    'summary': 'Solid, specific answers.'
+}
+
+
+# --- Stand-ins for OpenAI and Judge0 ---
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI chat completions and Judge0 submissions, answered after a simulated delay"""
+
+    protocol_version = 'HTTP/1.1'
+    llm_latency = 0.5
+    judge0_latency = 0.3
+    jitter = 0.2
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        if self.path.endswith('/chat/completions'):
+            self._sleep(self.llm_latency)
+            if (body.get('response_format') or {}).get('type') == 'json_object':
+                content = json.dumps(STUB_EVALUATION)
+            else:
+                content = "Thanks for sharing. Can you tell me about a challenging project you worked on?"
+            self._reply({
+                'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': body.get('model', 'stub'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': content}}],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+            })
+        elif self.path.startswith('/submissions'):
+            self._sleep(self.judge0_latency)
+            self._reply({
+                'stdout': body.get('expected_output') or '', 'stderr': None, 'compile_output': None,
+                'time': '0.01', 'memory': 1024, 'status': {'id': 3, 'description': 'Accepted'}
+            })
+        else:
+            self._reply({'error': 'not found'}, 404)
+
+    def _sleep(self, latency: float):
+        time.sleep(max(0.0, random.uniform(latency * (1 - self.jitter), latency * (1 + self.jitter))))
+
+    def _reply(self, payload: Dict, status: int = 200):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(llm_latency: float, judge0_latency: float) -> ThreadingHTTPServer:
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'llm_latency': llm_latency, 'judge0_latency': judge0_latency
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- Backend under test ---
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_backend(stub_url: str, asgi: bool, workdir: str) -> (subprocess.Popen, str):
+    """Run the backend in a subprocess pointed at the stubs; returns (process, base url)"""
+    port = _free_port()
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY='stub-key',
+        OPENAI_BASE_URL=f'{stub_url}/v1',
+        JUDGE0_API_URL=stub_url,
+        # Simulated candidates share one client address
+        ADMISSION_CONTROL='False',
+        PYTHONPATH=BACKEND_DIR,
+    )
+    command = [sys.executable, os.path.abspath(__file__), '--serve', str(port)] + (['--asgi'] if asgi else [])
+    process = subprocess.Popen(command, cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Backend exited during startup')
+        try:
+            if requests.get(f'{base_url}/api/health', timeout=1).ok:
+                return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('Backend did not start within 60s')
+
+
+def serve(port: int, asgi: bool):
+    """Entry point of the backend subprocess"""
+    sys.path.insert(0, BACKEND_DIR)
+    import logging
+    logging.disable(logging.INFO)
+
+    if asgi:
+        import uvicorn
+        uvicorn.run('asgi:app', host='127.0.0.1', port=port, log_level='warning')
+    else:
+        from werkzeug.serving import make_server
+        from app import app
+        make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+# --- Simulated candidates ---
+
+class Recorder:
+    """Latencies and errors per endpoint, shared by all candidate threads"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.flows = 0
+        self.failed_flows = 0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def finish_flow(self, ok: bool):
+        with self._lock:
+            self.flows += ok
+            self.failed_flows += not ok
+
+
+def make_resume(candidate: int, rng: random.Random) -> bytes:
+    import docx
+
+    skills = rng.sample(SKILL_POOL, 4)
+    document = docx.Document()
+    document.add_paragraph(f'Candidate {candidate}')
+    document.add_paragraph(f'candidate{candidate}@example.com | +1 555 {candidate:07d}')
+    document.add_paragraph('Skills: ' + ', '.join(skills))
+    document.add_paragraph(f'Experience: {rng.randint(1, 8)} years building APIs with {skills[0]} and {skills[1]}')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class FlowError(Exception):
+    pass
+
+
+class Candidate:
+    """One simulated candidate going through the whole assessment"""
+
+    def __init__(self, base_url: str, recorder: Recorder, args, candidate: int):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.args = args
+        self.candidate = candidate
+        self.http = requests.Session()
+
+    def call(self, method: str, endpoint: str, **kwargs) -> Dict:
+        # Report per route, not per query string or challenge index
+        route = re.sub(r'/\d+$', '/<index>', endpoint.split('?')[0])
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, f'{self.base_url}{endpoint}', timeout=self.args.timeout, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException as e:
+            self.recorder.record(route, time.perf_counter() - start, False)
+            raise FlowError(f'{endpoint}: {e}')
+
+        self.recorder.record(route, time.perf_counter() - start, ok)
+        if not ok:
+            raise FlowError(f'{endpoint}: HTTP {response.status_code}')
+        return response.json()
+
+    def run(self):
+        rng = random.Random(self.candidate)
+        resume = self.args.same_resume_bytes or make_resume(self.candidate, rng)
+
+        uploaded = self.call('POST', '/api/upload-resume?wait=1',
+                             files={'resume': (f'candidate{self.candidate}.docx', resume)})
+        session_id = uploaded['session_id']
+        session = {'session_id': session_id}
+
+        quiz = self.call('POST', '/api/generate-quiz', json=session)['quiz']
+
+        # The UI autosaves each answer as it is chosen, then submits
+        for i, question in enumerate(quiz['mcq_questions']):
+            answer = question.get('correct_answer') if rng.random() < 0.7 else 'A'
+            self.call('PATCH', '/api/quiz-answers', json=dict(session, answers={str(i): answer}))
+        self.call('POST', '/api/submit-quiz', json=session)
+
+        for index in range(min(self.args.code_submissions, quiz['total_coding'])):
+            self.call('GET', f'/api/coding-challenges/{index}?session_id={session_id}')
+            self.call('POST', '/api/submit-code', json=dict(
+                session, code=self.args.code, language=self.args.code_language, challenge_index=index
+            ))
+
+        self.call('POST', '/api/start-interview', json=session)
+        for turn in range(self.args.interview_turns):
+            self.call('POST', '/api/interview-response', json=dict(
+                session, response=INTERVIEW_ANSWERS[turn % len(INTERVIEW_ANSWERS)]
+            ))
+        self.call('POST', '/api/end-interview', json=session)
+
+        self.call('POST', '/api/final-report', json=session)
+
+
+def run_level(base_url: str, concurrency: int, args) -> Dict:
+    """Keep `concurrency` candidates busy for args.duration seconds"""
+    recorder = Recorder()
+    deadline = time.time() + args.duration
+    counter = iter(range(10 ** 9))
+    counter_lock = threading.Lock()
+
+    def worker():
+        while time.time() < deadline:
+            with counter_lock:
+                candidate = next(counter) + concurrency * 100000
+            try:
+                Candidate(base_url, recorder, args, candidate).run()
+                recorder.finish_flow(True)
+            except FlowError as e:
+                if args.verbose:
+                    print(f'   candidate {candidate} failed: {e}')
+                recorder.finish_flow(False)
+
+    start = time.time()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    return summarize(concurrency, recorder, elapsed)
+
+
+# --- Reporting ---
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(concurrency: int, recorder: Recorder, elapsed: float) -> Dict:
+    endpoints = {}
+    all_latencies = []
+    for endpoint, latencies in recorder.latencies.items():
+        values = sorted(latencies)
+        all_latencies.extend(values)
+        endpoints[endpoint] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(endpoint, 0),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99),
+        }
+    all_latencies.sort()
+    total_requests = len(all_latencies)
+    total_errors = sum(recorder.errors.values())
+
+    return {
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'flows': recorder.flows,
+        'failed_flows': recorder.failed_flows,
+        'flows_per_second': recorder.flows / elapsed if elapsed else 0,
+        'requests_per_second': total_requests / elapsed if elapsed else 0,
+        'error_rate': total_errors / total_requests if total_requests else 0,
+        'p50': percentile(all_latencies, 50),
+        'p95': percentile(all_latencies, 95),
+        'p99': percentile(all_latencies, 99),
+        'endpoints': endpoints,
+    }
+
+
+def find_saturation(levels: List[Dict], min_gain: float = 0.10, max_error_rate: float = 0.01) -> Dict:
+    """
+    Last level that still paid off
+
+    A level saturates the backend when it adds less than min_gain throughput
+    over the previous one, or fails more than max_error_rate of its requests.
+    """
+    best = levels[0]
+    for previous, level in zip(levels, levels[1:]):
+        if level['error_rate'] > max_error_rate:
+            break
+        if level['flows_per_second'] < previous['flows_per_second'] * (1 + min_gain):
+            break
+        best = level
+    return best
+
+
+def _ms(seconds: float) -> str:
+    return f'{seconds * 1000:.0f}ms'
+
+
+def print_level(level: Dict, per_endpoint: bool):
+    print(f"{level['concurrency']:>11}  {level['flows_per_second']:>7.2f}  {level['requests_per_second']:>7.1f}  "
+          f"{level['error_rate'] * 100:>6.1f}%  {_ms(level['p50']):>8}  {_ms(level['p95']):>8}  {_ms(level['p99']):>8}")
+    if per_endpoint:
+        print_endpoints(level)
+
+
+def print_endpoints(level: Dict):
+    for endpoint, stats in sorted(level['endpoints'].items(), key=lambda item: -item[1]['p95']):
+        print(f"      {endpoint:<32} {stats['requests']:>6} req  {stats['errors']:>4} err  "
+              f"p50 {_ms(stats['p50']):>7}  p95 {_ms(stats['p95']):>7}  p99 {_ms(stats['p99']):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the SkillMind backend with simulated candidates')
+    parser.add_argument('--levels', default='1,2,4,8,16', help='Comma-separated concurrent candidate counts')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per concurrency level')
+    parser.add_argument('--url', help='Test a running backend instead of starting one (stubs are then unused)')
+    parser.add_argument('--asgi', action='store_true', help='Start the backend in async mode (uvicorn asgi:app)')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Seconds per stub chat completion')
+    parser.add_argument('--judge0-latency', type=float, default=0.3, help='Seconds per stub Judge0 submission')
+    parser.add_argument('--interview-turns', type=int, default=3)
+    parser.add_argument('--code-submissions', type=int, default=2)
+    parser.add_argument('--code-language', default='javascript', help='javascript goes through Judge0, python runs locally')
+    parser.add_argument('--same-resume', action='store_true', help='Every candidate uploads the same file')
+    parser.add_argument('--timeout', type=float, default=120, help='Per-request timeout in seconds')
+    parser.add_argument('--json', help='Write the full results to this file')
+    parser.add_argument('--verbose', action='store_true', help='Per-endpoint table for every level, failed flows')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.asgi)
+        return
+
+    args.code = "const lines = require('fs').readFileSync(0, 'utf8'); console.log(lines.trim());"
+    args.same_resume_bytes = make_resume(0, random.Random(0)) if args.same_resume else None
+    levels = [int(level) for level in args.levels.split(',')]
+
+    process = None
+    stub = None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            if args.url:
+                base_url = args.url.rstrip('/')
+            else:
+                stub = start_stub_server(args.llm_latency, args.judge0_latency)
+                stub_url = f'http://127.0.0.1:{stub.server_address[1]}'
+                process, base_url = start_backend(stub_url, args.asgi, workdir)
+                print(f"Backend ({'asgi' if args.asgi else 'wsgi'}) at {base_url}; "
+                      f"stub LLM {args.llm_latency}s, stub Judge0 {args.judge0_latency}s")
+
+            print(f"\n{'Concurrency':>11}  {'Flows/s':>7}  {'Req/s':>7}  {'Errors':>7}  {'p50':>8}  {'p95':>8}  {'p99':>8}")
+            results = []
+            for concurrency in levels:
+                level = run_level(base_url, concurrency, args)
+                results.append(level)
+                print_level(level, args.verbose)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+            if stub is not None:
+                stub.shutdown()
+
+    saturation = find_saturation(results)
+    print(f"\nSaturation point: ~{saturation['concurrency']} concurrent candidates "
+          f"({saturation['flows_per_second']:.2f} flows/s, p95 {_ms(saturation['p95'])})")
+    if saturation is results[-1]:
+        print("Throughput was still growing at the highest level; add higher --levels to find the limit.")
+    else:
+        print("Higher levels added less than 10% throughput or more than 1% errors.")
+    print("Per endpoint at the saturation point:")
+    print_endpoints(saturation)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'levels': results, 'saturation_concurrency': saturation['concurrency']}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
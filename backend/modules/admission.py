@@ -0,0 +1,147 @@
+"""
+Admission control: token buckets that shed excess low-priority traffic early
+
+Routes are grouped into classes (Config.ADMISSION_ROUTE_CLASSES). A class
+with limits is throttled per session, per worker process and by how many of
+its requests may run at once, which keeps threads free for the routes that
+are never throttled (code submission, interview turns...). Rejections are
+decided from the path and headers only, before any body is read or parsed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config import Config
+from modules import metrics
+
+REJECTED = metrics.Counter(
+    'skillmind_admission_rejected_total', 'Requests shed by admission control', ('route_class', 'reason'))
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Take one token; returns 0 on success, else seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdmissionController:
+    """
+    Decide whether a request may run
+
+    Args:
+        route_classes: path -> class name; unlisted paths are always admitted
+        limits: class name -> {'session_rate', 'session_burst', 'global_rate', 'concurrency'}
+        max_sessions: Per-session buckets kept; the least recently used are dropped
+    """
+
+    def __init__(self, route_classes: Dict[str, str] = None, limits: Dict[str, Dict] = None,
+                 max_sessions: int = 10000):
+        self.route_classes = route_classes if route_classes is not None else Config.ADMISSION_ROUTE_CLASSES
+        self.limits = limits if limits is not None else Config.ADMISSION_LIMITS
+        self.max_sessions = max_sessions
+        self._session_buckets: OrderedDict = OrderedDict()
+        self._global_buckets = {
+            name: TokenBucket(limit['global_rate'], max(1, limit['global_rate']))
+            for name, limit in self.limits.items()
+        }
+        self._in_flight = {name: 0 for name in self.limits}
+        self._lock = threading.Lock()
+
+    def route_class(self, path: str) -> Optional[str]:
+        """Class of a path, or None if it is never throttled"""
+        route_class = self.route_classes.get(path)
+        return route_class if route_class in self.limits else None
+
+    def acquire(self, path: str, session_key: str) -> Optional[float]:
+        """
+        Admit a request or tell it when to come back
+
+        Returns:
+            None if admitted (call release(path) once it is done), otherwise
+            the seconds the client should wait before retrying
+        """
+        route_class = self.route_class(path)
+        if route_class is None:
+            return None
+        limit = self.limits[route_class]
+        now = time.monotonic()
+
+        with self._lock:
+            if self._in_flight[route_class] >= limit['concurrency']:
+                REJECTED.inc(route_class=route_class, reason='concurrency')
+                return 1.0
+
+            key = (route_class, session_key)
+            bucket = self._session_buckets.get(key)
+            if bucket is None:
+                bucket = self._session_buckets[key] = TokenBucket(limit['session_rate'], limit['session_burst'])
+                if len(self._session_buckets) > self.max_sessions:
+                    self._session_buckets.popitem(last=False)
+            else:
+                self._session_buckets.move_to_end(key)
+
+            wait = bucket.take(now)
+            if wait:
+                REJECTED.inc(route_class=route_class, reason='session_rate')
+                return wait
+
+            wait = self._global_buckets[route_class].take(now)
+            if wait:
+                bucket.refund()
+                REJECTED.inc(route_class=route_class, reason='global_rate')
+                return wait
+
+            self._in_flight[route_class] += 1
+            return None
+
+    def release(self, path: str):
+        route_class = self.route_class(path)
+        if route_class is not None:
+            with self._lock:
+                self._in_flight[route_class] -= 1
+
+
+def init_app(app, controller: AdmissionController = None):
+    """Answer throttled requests with a bodyless 429 before their view runs"""
+    from flask import g, request
+
+    controller = controller or AdmissionController()
+
+    @app.before_request
+    def admit_request():
+        # The session id comes from a header so the JSON body is never parsed here
+        session_key = request.headers.get('X-Session-Id') or request.remote_addr or ''
+        retry_after = controller.acquire(request.path, session_key)
+        if retry_after is not None:
+            response = app.response_class(status=429)
+            response.headers['Retry-After'] = str(max(1, round(retry_after)))
+            return response
+        g.admitted_path = request.path
+
+    @app.teardown_request
+    def release_request(error):
+        path = g.pop('admitted_path', None)
+        if path is not None:
+            controller.release(path)
+
+    return controller
@@ -0,0 +1,90 @@
+"""
+Running MCQ results, graded one answer at a time
+"""
+
+from typing import Dict, Iterable, Optional
+
+
+class MCQAnswerSheet:
+    """
+    A candidate's MCQ answers as they are chosen
+
+    Each answer updates the per-question result and the per-skill counts, so
+    the quiz result is already computed when the candidate submits.
+    """
+
+    def __init__(self, questions: Iterable[Dict] = ()):
+        self.detailed_results = []
+        self.skill_counts = {}  # skill -> {'correct', 'total'}
+        self.correct_answers = 0
+        self.answered = 0
+        self.submitted = False
+        self.add_questions(questions)
+
+    def add_questions(self, questions: Iterable[Dict]):
+        """Append questions in quiz order (a streamed quiz grows skill by skill)"""
+        for question in questions:
+            skill = question.get('skill', '')
+            self.detailed_results.append({
+                'question_index': len(self.detailed_results),
+                'question': question['question'],
+                'user_answer': None,
+                'correct_answer': question['correct_answer'],
+                'is_correct': False,
+                'explanation': question.get('explanation', ''),
+                'skill': skill
+            })
+            self.skill_counts.setdefault(skill, {'correct': 0, 'total': 0})['total'] += 1
+
+    def record(self, index: int, answer: Optional[str]) -> bool:
+        """
+        Set, change or (with None) clear the answer to one question
+
+        Raises:
+            IndexError: No question at that index
+        """
+        if index < 0:
+            raise IndexError(index)
+        result = self.detailed_results[index]
+        counts = self.skill_counts[result['skill']]
+
+        if result['user_answer'] is not None:
+            self.answered -= 1
+        if result['is_correct']:
+            self.correct_answers -= 1
+            counts['correct'] -= 1
+
+        result['user_answer'] = answer
+        result['is_correct'] = answer is not None and answer == result['correct_answer']
+
+        if answer is not None:
+            self.answered += 1
+        if result['is_correct']:
+            self.correct_answers += 1
+            counts['correct'] += 1
+        return result['is_correct']
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.detailed_results)
+
+    def to_dict(self) -> Dict:
+        """Serialize the sheet so another worker can keep grading it"""
+        return {
+            'detailed_results': self.detailed_results,
+            'skill_counts': self.skill_counts,
+            'correct_answers': self.correct_answers,
+            'answered': self.answered,
+            'submitted': self.submitted
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'MCQAnswerSheet':
+        """Rebuild a sheet from to_dict() output"""
+        sheet = cls()
+        sheet.detailed_results = state.get('detailed_results', [])
+        sheet.skill_counts = state.get('skill_counts', {})
+        sheet.correct_answers = state.get('correct_answers', 0)
+        sheet.answered = state.get('answered', 0)
+        sheet.submitted = state.get('submitted', False)
+        return sheet
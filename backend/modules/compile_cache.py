@@ -0,0 +1,194 @@
+"""
+Content-addressed cache of compiled submissions
+
+A build is identified by the SHA-256 of its language, compiler version,
+compile command and source. Its output directory is kept under
+Config.COMPILE_CACHE_DIR, so running unchanged code again (a preview then
+the final submit, or repeated Run clicks) skips the compiler entirely.
+Least recently used builds are deleted once the directory passes
+Config.COMPILE_CACHE_MAX_BYTES; builds that are running, or were used in
+the last Config.COMPILE_CACHE_EVICT_GRACE seconds, are never deleted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from config import Config
+from modules import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOKUPS = metrics.Counter('skillmind_compile_cache_lookups_total', 'Compile cache lookups', ('result',))
+
+
+class CompileCache:
+    """
+    key -> directory holding a finished build
+
+    Builds are staged in a private directory and renamed into place, so
+    processes sharing the cache directory never see a partial build. A hit
+    refreshes the entry's mtime, which is what eviction orders by.
+
+    Sizes of the entries are kept in an index, so adding a build only
+    measures that build. The directory is scanned again only when the
+    index says it is over the bound, which also picks up builds added by
+    other processes; eviction then goes down to 90% of the bound so the
+    next few puts do not scan again.
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = None, grace: float = None):
+        self.root = root or Config.COMPILE_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Config.COMPILE_CACHE_MAX_BYTES
+        self.grace = grace if grace is not None else Config.COMPILE_CACHE_EVICT_GRACE
+        self._versions = {}  # (compiler path, mtime) -> version output
+        self._pins: Dict[str, int] = {}  # key -> builds of it running in this process
+        self._sizes: Optional[Dict[str, int]] = None  # key -> bytes, loaded on the first put
+        self._size = 0
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, language: str, tool: str, compile_cmd: List[str], source: str) -> str:
+        """Cache key of a build; compile_cmd is the command with placeholder paths"""
+        identity = [language, self.compiler_version(tool), compile_cmd, source]
+        return hashlib.sha256(json.dumps(identity).encode('utf-8')).hexdigest()
+
+    def compiler_version(self, tool: str) -> str:
+        """The compiler's --version output, looked up again only when the binary changes"""
+        path = shutil.which(tool) or tool
+        try:
+            stamp = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp = (path, None)
+
+        with self._lock:
+            version = self._versions.get(stamp)
+        if version is None:
+            try:
+                output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+                version = f"{path}\n{output.stdout or output.stderr}".strip()
+            except (OSError, subprocess.SubprocessError):
+                version = path
+            with self._lock:
+                self._versions[stamp] = version
+        return version
+
+    def get(self, key: str) -> Optional[str]:
+        """Directory of the cached build, or None"""
+        path = os.path.join(self.root, key)
+        try:
+            os.utime(path)
+        except OSError:
+            path = None
+
+        LOOKUPS.inc(result='hit' if path is not None else 'miss')
+        return path
+
+    @contextmanager
+    def pinned(self, key: str):
+        """Keep the build of key from being evicted while the block runs it"""
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if not self._pins[key]:
+                    del self._pins[key]
+
+    def staging_dir(self) -> str:
+        """An empty directory to compile into, on the cache's filesystem"""
+        return tempfile.mkdtemp(prefix='.build-', dir=self.root)
+
+    def put(self, key: str, build_dir: str) -> str:
+        """
+        Move a finished build from staging_dir() into the cache
+
+        Returns:
+            The build's cached directory (another process's identical build
+            if it got there first)
+        """
+        path = os.path.join(self.root, key)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            # Already cached by a concurrent build of the same code
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+        with self._evict_lock:
+            if self._sizes is None:
+                self._scan()
+            if key not in self._sizes:
+                self._sizes[key] = _tree_size(path)
+                self._size += self._sizes[key]
+            if self._size > self.max_bytes:
+                self._scan()
+                self._evict(keep=key)
+        return path
+
+    def _scan(self):
+        """Rebuild the size index from the directory, measuring only entries not already in it"""
+        known = self._sizes or {}
+        self._sizes = {}
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name.startswith('.') or not entry.is_dir(follow_symlinks=False):
+                    continue
+                size = known.get(entry.name)
+                self._sizes[entry.name] = size if size is not None else _tree_size(entry.path)
+        self._size = sum(self._sizes.values())
+
+    def _evict(self, keep: str):
+        entries = []
+        for name, size in self._sizes.items():
+            try:
+                entries.append((os.stat(os.path.join(self.root, name)).st_mtime, size, name))
+            except OSError:
+                entries.append((0, size, name))
+
+        target = self.max_bytes * 0.9
+        recent = time.time() - self.grace
+        for last_used, size, name in sorted(entries):
+            if self._size <= target or last_used > recent:
+                break
+            if name == keep:
+                continue
+            with self._lock:
+                if name in self._pins:
+                    continue
+                # Moved out of sight under the lock, so it cannot be pinned and looked up meanwhile
+                doomed = tempfile.mkdtemp(prefix='.evict-', dir=self.root)
+                try:
+                    os.rename(os.path.join(self.root, name), os.path.join(doomed, name))
+                except OSError:
+                    pass  # already evicted by another process
+            shutil.rmtree(doomed, ignore_errors=True)
+            del self._sizes[name]
+            self._size -= size
+            logger.debug("Evicted compiled build %s (%s bytes)", name, size)
+
+    @property
+    def size(self) -> int:
+        """Bytes held, as of the last put"""
+        return self._size
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,97 @@
+"""
+Content-Encoding negotiation and compression of API responses
+"""
+
+import gzip
+from typing import List, Optional
+
+from config import Config
+
+try:
+    import brotli  # optional: enables 'br' when installed
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/css',
+    'text/html',
+    'text/plain',
+}
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, most preferred first"""
+    return ['br', 'gzip'] if brotli else ['gzip']
+
+
+def negotiate_encoding(accept_encoding: str, offered: List[str] = None) -> Optional[str]:
+    """
+    Pick the best encoding the client accepts
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+        offered: Encodings the server can send (defaults to available_encodings())
+
+    Returns:
+        'br', 'gzip' or None for identity
+    """
+    offered = offered if offered is not None else available_encodings()
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in offered:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESS_BROTLI_QUALITY)
+    # mtime=0 keeps the output (and any ETag derived from it) reproducible
+    return gzip.compress(data, compresslevel=Config.COMPRESS_LEVEL, mtime=0)
+
+
+def init_app(app):
+    """Compress eligible responses according to the request's Accept-Encoding"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        data = response.get_data()
+        if len(data) < Config.COMPRESS_MIN_SIZE:
+            return response
+
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -38,6 +38,25 @@ class EmotionAnalyzer:
         """End emotion tracking session"""
         self.session_end = datetime.now()
     
+    def to_dict(self) -> Dict:
+        """Serialize tracking state so another worker can resume it"""
+        return {
+            'emotion_data': self.emotion_data,
+            'session_start': self.session_start.isoformat() if self.session_start else None,
+            'session_end': self.session_end.isoformat() if self.session_end else None
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'EmotionAnalyzer':
+        """Rebuild an analyzer from to_dict() output"""
+        analyzer = cls()
+        analyzer.emotion_data = state.get('emotion_data', [])
+        if state.get('session_start'):
+            analyzer.session_start = datetime.fromisoformat(state['session_start'])
+        if state.get('session_end'):
+            analyzer.session_end = datetime.fromisoformat(state['session_end'])
+        return analyzer
+    
     def get_emotion_summary(self) -> Dict:
         """
         Generate comprehensive emotion analysis summary
@@ -298,3 +298,23 @@ class InterviewSession:
     def get_summary(self) -> Dict:
         """Get interview summary"""
         return self.interviewer.generate_interview_summary(self.answers)
+    
+    def to_dict(self) -> Dict:
+        """Serialize session progress so another worker can resume it"""
+        return {
+            'questions': self.questions,
+            'current_question_idx': self.current_question_idx,
+            'answers': self.answers,
+            'start_time': self.start_time
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'InterviewSession':
+        """Rebuild a session from to_dict() output without re-drawing questions"""
+        session = cls.__new__(cls)
+        session.interviewer = EnhancedHRInterviewer()
+        session.questions = state.get('questions', [])
+        session.current_question_idx = state.get('current_question_idx', 0)
+        session.answers = state.get('answers', [])
+        session.start_time = state.get('start_time')
+        return session
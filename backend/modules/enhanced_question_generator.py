@@ -6,7 +6,10 @@ import json
 import random
 from typing import List, Dict
 from config import Config
-from modules.fallback_questions import get_mcq_questions, get_coding_challenges
+from modules import startup
+
+# Loaded on first use, or up front (and shared by forked workers) with LAZY_MODULES=False
+startup.preload_module('modules.fallback_questions')
 
 class EnhancedQuestionGenerator:
     """Generate structured questions: 5 MCQ per skill + coding challenges by difficulty"""
@@ -14,6 +17,10 @@ class EnhancedQuestionGenerator:
     def __init__(self):
         pass
     
+    def _question_bank(self):
+        """The built-in question bank, loaded the first time questions are needed"""
+        return startup.import_module('modules.fallback_questions')
+    
     def generate_skill_based_mcq(self, skills_with_proficiency: Dict[str, str]) -> Dict[str, List[Dict]]:
         """
         Generate 5 MCQ questions per skill based on proficiency level
@@ -32,12 +39,12 @@ class EnhancedQuestionGenerator:
             
             # Try to get questions (fallback if API fails)
             try:
-                questions = get_mcq_questions(skill_normalized, proficiency, count=5)
+                questions = self._question_bank().get_mcq_questions(skill_normalized, proficiency, count=5)
                 if questions:
                     all_questions[skill_normalized] = questions
                 else:
                     # If no specific proficiency level, try beginner
-                    questions = get_mcq_questions(skill_normalized, "beginner", count=5)
+                    questions = self._question_bank().get_mcq_questions(skill_normalized, "beginner", count=5)
                     if questions:
                         all_questions[skill_normalized] = questions
             except Exception as e:
@@ -69,7 +76,7 @@ class EnhancedQuestionGenerator:
             
             # Only generate coding challenges for programming languages
             if any(lang.lower() in skill_normalized.lower() for lang in programming_languages):
-                challenges = get_coding_challenges(skill_normalized)
+                challenges = self._question_bank().get_coding_challenges(skill_normalized)
                 
                 if challenges:
                     # Ensure we have the right structure
@@ -5,6 +5,7 @@ Enhanced Report Generator with detailed score breakdown and improvement recommen
 from typing import Dict, List
 import json
 from datetime import datetime
+from modules import tracing
 
 class EnhancedReportGenerator:
     """Generate comprehensive interview performance reports with recommendations"""
@@ -262,6 +263,7 @@ class EnhancedReportGenerator:
             'total_recommendations': len(recommendations)
         }
     
+    @tracing.traced('report.enhanced')
     def generate_full_report(self, 
                             mcq_results: Dict,
                             coding_results: Dict,
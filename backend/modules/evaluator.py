@@ -1,65 +1,81 @@
+import asyncio
+import os
+import platform
+import shutil
 import subprocess
 import sys
 import json
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from config import Config
+from modules import metrics, tracing
+from modules.answer_sheet import MCQAnswerSheet
+from modules.compile_cache import CompileCache
+from modules.python_workers import TIME_LIMIT_EXCEEDED, PythonWorkerPool
 import time
 
+# Name of the executable inside a build directory
+BUILD_EXECUTABLE = 'main.exe' if platform.system() == 'Windows' else 'main.out'
+
 class Evaluator:
     """Evaluate quiz answers and code submissions"""
     
     def __init__(self):
         self.timeout = Config.CODE_EXECUTION_TIMEOUT
         self.max_output = Config.MAX_OUTPUT_LENGTH
+        self.test_workers = Config.CODE_EXECUTION_WORKERS or self._available_cores()
+        self._test_pool = None
+        self._test_pool_lock = threading.Lock()
+        self.compile_cache = CompileCache()
+        self.python_workers = PythonWorkerPool(
+            Config.PYTHON_WORKERS or self.test_workers, Config.PYTHON_WORKER_MAX_RUNS, self.max_output,
+            self.timeout, Config.PYTHON_CPU_LIMIT, Config.PYTHON_MEMORY_LIMIT_MB
+        )
     
-    def evaluate_mcq_quiz(self, questions: List[Dict], user_answers: Dict[int, str]) -> Dict:
+    def evaluate_mcq_quiz(self, questions: List[Dict], user_answers: Dict) -> Dict:
         """
         Evaluate MCQ quiz answers
         
         Args:
             questions: List of MCQ questions
-            user_answers: Dictionary mapping question index to selected answer
+            user_answers: Dictionary mapping question index (int or, from JSON, str) to selected answer
             
         Returns:
             Evaluation results with score and feedback
         """
-        total_questions = len(questions)
-        correct_answers = 0
-        detailed_results = []
-        
-        for idx, question in enumerate(questions):
-            user_answer = user_answers.get(idx, None)
-            correct_answer = question['correct_answer']
-            is_correct = user_answer == correct_answer
-            
-            if is_correct:
-                correct_answers += 1
-            
-            detailed_results.append({
-                'question_index': idx,
-                'question': question['question'],
-                'user_answer': user_answer,
-                'correct_answer': correct_answer,
-                'is_correct': is_correct,
-                'explanation': question.get('explanation', ''),
-                'skill': question.get('skill', '')
-            })
+        sheet = MCQAnswerSheet(questions)
+        for index, answer in user_answers.items():
+            try:
+                sheet.record(int(index), answer)
+            except (ValueError, IndexError):
+                continue
+        
+        return self.summarize_mcq_answers(sheet)
+    
+    def summarize_mcq_answers(self, sheet: MCQAnswerSheet) -> Dict:
+        """
+        Quiz results from an answer sheet graded as answers arrived
+        
+        Only the per-skill counts are aggregated here; per-question results
+        are already in the sheet.
+        """
+        total_questions = sheet.total_questions
         
         if total_questions > 0:
-            score = (correct_answers / total_questions * 100)
+            score = (sheet.correct_answers / total_questions * 100)
         else:
             score = 0  # Handle case with no questions gracefully
         
-        # Calculate skill-wise scores
-        skill_scores = self._calculate_skill_scores(detailed_results)
-        
         return {
             'total_questions': total_questions,
-            'correct_answers': correct_answers,
+            'correct_answers': sheet.correct_answers,
+            'answered': sheet.answered,
             'score': round(score, 2),
             'percentage': round(score, 2),
-            'detailed_results': detailed_results,
-            'skill_scores': skill_scores,
+            'detailed_results': sheet.detailed_results,
+            'skill_scores': self._skill_scores(sheet.skill_counts),
             'performance_level': self._get_performance_level(score)
         }
     
@@ -75,22 +91,82 @@ class Evaluator:
         Returns:
             Evaluation results
         """
+        key = self._language_key(language)
+        
+        with metrics.CODE_EXECUTIONS_IN_FLIGHT.track_inprogress(), \
+                metrics.CODE_EXECUTION_LATENCY.time(language=key), \
+                tracing.span('code.evaluate', language=key, test_cases=len(test_cases)):
+            # Python: Run locally (fast, no API limits, safe with exec)
+            if key == 'python':
+                return self._evaluate_python_code(code, test_cases)
+            
+            local_handler = self._local_handler(key)
+            if local_handler:
+                return local_handler(code, test_cases)
+            
+            # All other languages: Use Judge0 API (no local installation needed)
+            else:
+                return self._evaluate_code_with_judge0(code, key, test_cases)
+    
+    async def evaluate_code_async(self, code: str, language: str, test_cases: List[Dict]) -> Dict:
+        """
+        Non-blocking variant of evaluate_code() for the ASGI serving mode
+        
+        Python still runs locally (in a worker thread); Judge0 test cases are
+        submitted concurrently instead of one after another.
+        """
+        key = self._language_key(language)
+        
+        with metrics.CODE_EXECUTIONS_IN_FLIGHT.track_inprogress(), \
+                metrics.CODE_EXECUTION_LATENCY.time(language=key), \
+                tracing.span('code.evaluate', language=key, test_cases=len(test_cases)):
+            if key == 'python':
+                return await asyncio.to_thread(self._evaluate_python_code, code, test_cases)
+            local_handler = self._local_handler(key)
+            if local_handler:
+                return await asyncio.to_thread(local_handler, code, test_cases)
+            return await self._evaluate_code_with_judge0_async(code, key, test_cases)
+    
+    async def _evaluate_code_with_judge0_async(self, code: str, key: str, test_cases: List[Dict]) -> Dict:
+        from modules.judge0_client import Judge0Client
+        
+        try:
+            client = Judge0Client()
+            cases = [
+                (str(tc.get('input', '')).strip(), str(tc.get('expected_output', '')).strip())
+                for tc in test_cases
+            ]
+            results = await asyncio.gather(*[
+                client.execute_code_async(code=code, language=key, stdin=test_input, expected_output=expected_output)
+                for test_input, expected_output in cases
+            ])
+            
+            test_results = [
+                self._judge0_test_result(idx, test_input, expected_output, result)
+                for idx, ((test_input, expected_output), result) in enumerate(zip(cases, results))
+            ]
+            return self._judge0_summary(test_results, len(test_cases))
+            
+        except Exception as e:
+            return self._judge0_error(e, test_cases)
+    
+    def _local_handler(self, key: str):
+        """The local executor for a language enabled in Config.LOCAL_EXECUTION_LANGUAGES, if any"""
+        if key not in Config.LOCAL_EXECUTION_LANGUAGES:
+            return None
+        return getattr(self, f'_evaluate_{key}_code', None)
+    
+    def _language_key(self, language: str) -> str:
+        """Map varying language codes to internal keys"""
         key = language.lower()
         
-        # Map varying language codes to internal keys
         if key in ['js', 'node', 'javascript']: key = 'javascript'
         elif key in ['py', 'python3', 'python']: key = 'python'
         elif key in ['cpp', 'c++14', 'c++17', 'c++20', 'c++']: key = 'cpp'
         elif key in ['cs', 'csharp', 'dotnet']: key = 'csharp'
         elif key in ['ts', 'typescript']: key = 'typescript'
         
-        # Python: Run locally (fast, no API limits, safe with exec)
-        if key == 'python':
-            return self._evaluate_python_code(code, test_cases)
-        
-        # All other languages: Use Judge0 API (no local installation needed)
-        else:
-            return self._evaluate_code_with_judge0(code, key, test_cases)
+        return key
     
     def _evaluate_code_with_judge0(self, code: str, language: str, test_cases: List[Dict]) -> Dict:
         """
@@ -105,12 +181,9 @@ class Evaluator:
             Evaluation results
         """
         from modules.judge0_client import Judge0Client
-        import logging
-        logger = logging.getLogger(__name__)
         
         try:
             client = Judge0Client()
-            passed_tests = 0
             test_results = []
             
             for idx, test_case in enumerate(test_cases):
@@ -125,53 +198,62 @@ class Evaluator:
                     expected_output=expected_output
                 )
                 
-                # Handle execution errors
-                if not result.get('success', True):
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': '',
-                        'passed': False,
-                        'error': result.get('error', 'Unknown error')
-                    })
-                    continue
-                
-                # Process successful execution
-                is_passed = result.get('passed', False)
-                if is_passed:
-                    passed_tests += 1
-                
-                test_results.append({
-                    'test_case': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': result.get('stdout', ''),
-                    'passed': is_passed,
-                    'execution_time': result.get('time'),
-                    'error': result.get('error') if not is_passed else None
-                })
-            
-            total_tests = len(test_cases)
-            score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
+                test_results.append(self._judge0_test_result(idx, test_input, expected_output, result))
             
-            return {
-                'success': True,
-                'passed_tests': passed_tests,
-                'total_tests': total_tests,
-                'score': round(score, 2),
-                'test_results': test_results,
-                'performance_level': self._get_performance_level(score)
-            }
+            return self._judge0_summary(test_results, len(test_cases))
             
         except Exception as e:
-            logger.error(f'Judge0 evaluation error: {str(e)}', exc_info=True)
+            return self._judge0_error(e, test_cases)
+    
+    def _judge0_test_result(self, idx: int, test_input: str, expected_output: str, result: Dict) -> Dict:
+        """Build the per-test entry for one Judge0 execution"""
+        # Handle execution errors
+        if not result.get('success', True):
             return {
-                'success': False,
-                'error': f'Code execution service error: {str(e)}',
-                'passed_tests': 0,
-                'total_tests': len(test_cases)
+                'test_case': idx + 1,
+                'input': test_input,
+                'expected_output': expected_output,
+                'actual_output': '',
+                'passed': False,
+                'error': result.get('error', 'Unknown error')
             }
+        
+        # Process successful execution
+        is_passed = result.get('passed', False)
+        return {
+            'test_case': idx + 1,
+            'input': test_input,
+            'expected_output': expected_output,
+            'actual_output': result.get('stdout', ''),
+            'passed': is_passed,
+            'execution_time': result.get('time'),
+            'error': result.get('error') if not is_passed else None
+        }
+    
+    def _judge0_summary(self, test_results: List[Dict], total_tests: int) -> Dict:
+        passed_tests = sum(1 for r in test_results if r['passed'])
+        score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
+        
+        return {
+            'success': True,
+            'passed_tests': passed_tests,
+            'total_tests': total_tests,
+            'score': round(score, 2),
+            'test_results': test_results,
+            'performance_level': self._get_performance_level(score)
+        }
+    
+    def _judge0_error(self, e: Exception, test_cases: List[Dict]) -> Dict:
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        logger.error(f'Judge0 evaluation error: {str(e)}', exc_info=True)
+        return {
+            'success': False,
+            'error': f'Code execution service error: {str(e)}',
+            'passed_tests': 0,
+            'total_tests': len(test_cases)
+        }
 
     # --- New Handlers ---
     
@@ -220,22 +302,12 @@ class Evaluator:
         if tool_name and not self._is_command_available(tool_name):
             return self._create_missing_tool_result(tool_name, len(test_cases))
 
-        passed_tests = 0
-        test_results = []
-        
         with tempfile.NamedTemporaryFile(suffix=f'.{ext}', delete=False, mode='w', encoding='utf-8') as f:
             f.write(code)
             src_file = f.name
             
         try:
-            for idx, test_case in enumerate(test_cases):
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                result = self._run_subprocess(cmd_builder(src_file), test_input)
-                self._process_test_result(result, test_case, idx, test_input, expected_output, test_results)
-                if test_results[-1]['passed']: passed_tests += 1
-                
+            passed_tests, test_results = self._run_test_cases(cmd_builder(src_file), test_cases)
         finally:
             if os.path.exists(src_file): os.unlink(src_file)
             
@@ -243,47 +315,93 @@ class Evaluator:
 
     def _evaluate_compiled_language(self, code: str, test_cases: List[Dict], ext: str, tool_name: str, temp_files_exts: List[str], compile_cmd_builder) -> Dict:
         """Generic handler for compiled languages"""
-        import tempfile, os, platform
-        
         if not self._is_command_available(tool_name):
              return self._create_missing_tool_result(tool_name, len(test_cases))
 
-        with tempfile.NamedTemporaryFile(suffix=f'.{ext}', delete=False, mode='w', encoding='utf-8') as f:
-            f.write(code)
-            src_file = f.name
-            
-        exe_ext = '.exe' if platform.system() == 'Windows' else '.out'
-        exe_file = src_file.replace(f'.{ext}', exe_ext)
-        
-        try:
-            # Compile
-            compile_res = self._run_subprocess(compile_cmd_builder(src_file, exe_file), '')
-            if compile_res['return_code'] != 0:
-                return {
-                    'success': False,
-                    'error': f"Compilation Error:\n{compile_res['stderr']}",
-                    'passed_tests': 0,
-                    'total_tests': len(test_cases)
-                }
+        with self._compile(code, f'main.{ext}', tool_name, compile_cmd_builder) as (build_dir, compile_error):
+            if compile_error is not None:
+                return self._compile_error_result(compile_error, len(test_cases))
             
             # Execute
-            passed_tests = 0
-            test_results = []
+            passed_tests, test_results = self._run_test_cases([os.path.join(build_dir, BUILD_EXECUTABLE)], test_cases)
+        return self._compile_final_result(passed_tests, test_results, len(test_cases))
+
+    @contextmanager
+    def _compile(self, code: str, src_name: str, tool_name: str, compile_cmd_builder):
+        """
+        Build code, or reuse the cached build of identical code
+        
+        The build is pinned in the cache until the block exits, so it is not
+        evicted while its tests run.
+        
+        Args:
+            src_name: File name the source is compiled from
+            compile_cmd_builder: (source path, executable path) -> compile command
+        
+        Yields:
+            (directory holding the build, None) or (None, compiler output)
+        """
+        template = compile_cmd_builder(src_name, BUILD_EXECUTABLE)
+        key = self.compile_cache.key(os.path.splitext(src_name)[1], tool_name, template, code)
+        with self.compile_cache.pinned(key):
+            build_dir = self.compile_cache.get(key)
+            if build_dir is not None:
+                yield build_dir, None
+                return
             
-            for idx, test_case in enumerate(test_cases):
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                result = self._run_subprocess([exe_file], test_input)
-                self._process_test_result(result, test_case, idx, test_input, expected_output, test_results)
-                if test_results[-1]['passed']: passed_tests += 1
-                
-        finally:
-            if os.path.exists(src_file): os.unlink(src_file)
-            if os.path.exists(exe_file): os.unlink(exe_file)
+            build_dir = self.compile_cache.staging_dir()
+            src_file = os.path.join(build_dir, src_name)
+            with open(src_file, 'w', encoding='utf-8') as f:
+                f.write(code)
             
-        return self._compile_final_result(passed_tests, test_results, len(test_cases))
+            compile_res = self._run_subprocess(compile_cmd_builder(src_file, os.path.join(build_dir, BUILD_EXECUTABLE)), '')
+            if compile_res['return_code'] != 0:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                yield None, compile_res['stderr']
+                return
+            yield self.compile_cache.put(key, build_dir), None
 
+    def _compile_error_result(self, compile_error: str, total_tests: int) -> Dict:
+        return {
+            'success': False,
+            'error': f"Compilation Error:\n{compile_error}",
+            'passed_tests': 0,
+            'total_tests': total_tests
+        }
+
+    def _run_test_cases(self, cmd: List[str], test_cases: List[Dict]):
+        """
+        Run cmd once per test case, concurrently on the evaluator's thread pool
+        
+        Returns:
+            (passed test count, per-test results in test case order)
+        """
+        cases = [
+            (str(tc.get('input', '')).strip(), str(tc.get('expected_output', '')).strip())
+            for tc in test_cases
+        ]
+        # map() yields in submission order whatever order the runs finish in
+        runs = self._test_executor().map(lambda case: self._run_subprocess(cmd, case[0]), cases)
+        
+        test_results = []
+        for idx, ((test_input, expected_output), result) in enumerate(zip(cases, runs)):
+            self._process_test_result(result, test_cases[idx], idx, test_input, expected_output, test_results)
+        return sum(1 for r in test_results if r['passed']), test_results
+    
+    def _test_executor(self) -> ThreadPoolExecutor:
+        # Shared by all submissions, so the total number of test processes stays bounded
+        if self._test_pool is None:
+            with self._test_pool_lock:
+                if self._test_pool is None:
+                    self._test_pool = ThreadPoolExecutor(max_workers=self.test_workers, thread_name_prefix='test-case')
+        return self._test_pool
+    
+    @staticmethod
+    def _available_cores() -> int:
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    
     def _process_test_result(self, result, test_case, idx, inp, expected, results_list):
         """Helper to process a subprocess result into the results list"""
         if result['timeout']:
@@ -339,107 +457,56 @@ class Evaluator:
         }
     
     def _evaluate_python_code(self, code: str, test_cases: List[Dict]) -> Dict:
-        """Evaluate Python code in a restricted environment"""
-        import io
-        import sys
+        """Evaluate Python code on the warm worker processes"""
+        cases = [
+            (str(tc.get('input', '')).strip(), str(tc.get('expected_output', '')).strip())
+            for tc in test_cases
+        ]
+        runs = self._test_executor().map(lambda case: self.python_workers.run(code, case[0]), cases)
         
         passed_tests = 0
         test_results = []
         
-        for idx, test_case in enumerate(test_cases):
-            try:
-                # Prepare input and expected output
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                # Execute code with timeout
-                start_time = time.time()
-                
-                # Capture stdout
-                old_stdout = sys.stdout
-                sys.stdout = captured_output = io.StringIO()
-                
-                # Prepare input simulation
-                old_stdin = sys.stdin
-                sys.stdin = io.StringIO(test_input)
-                
-                try:
-                    # Create execution environment
-                    exec_globals = {
-                        '__builtins__': __builtins__,
-                        '__name__': '__main__',
-                        'input': lambda prompt='': sys.stdin.readline().rstrip('\n')
-                    }
-                    
-                    # Execute the code
-                    exec(code, exec_globals)
-                    
-                    # Get the captured output
-                    actual_output = captured_output.getvalue().strip()
-                    
-                    # If no output captured, try to get result from globals
-                    if not actual_output:
-                        if 'result' in exec_globals:
-                            actual_output = str(exec_globals['result']).strip()
-                        elif 'output' in exec_globals:
-                            actual_output = str(exec_globals['output']).strip()
-                    
-                finally:
-                    # Restore stdout and stdin
-                    sys.stdout = old_stdout
-                    sys.stdin = old_stdin
-                
-                execution_time = time.time() - start_time
-                
-                # Check timeout
-                if execution_time > self.timeout:
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': '',
-                        'passed': False,
-                        'error': 'Time limit exceeded',
-                        'execution_time': execution_time
-                    })
-                    continue
-                
-                # Compare outputs (handle different types)
-                is_passed = self._compare_outputs(actual_output, expected_output)
-                
-                if is_passed:
-                    passed_tests += 1
-                
+        for idx, ((test_input, expected_output), run) in enumerate(zip(cases, runs)):
+            if run['error'] == TIME_LIMIT_EXCEEDED:
                 test_results.append({
                     'test_case': idx + 1,
                     'input': test_input,
                     'expected_output': expected_output,
-                    'actual_output': actual_output,
-                    'passed': is_passed,
-                    'execution_time': round(execution_time, 3)
+                    'actual_output': '',
+                    'passed': False,
+                    'error': 'Time limit exceeded',
+                    'execution_time': round(run['execution_time'], 3)
                 })
-                
-            except Exception as e:
+                continue
+            
+            if run['error'] is not None:
                 test_results.append({
                     'test_case': idx + 1,
-                    'input': test_input if 'test_input' in locals() else '',
-                    'expected_output': expected_output if 'expected_output' in locals() else '',
+                    'input': test_input,
+                    'expected_output': expected_output,
                     'actual_output': '',
                     'passed': False,
-                    'error': str(e)
+                    'error': run['error']
                 })
+                continue
+            
+            # Compare outputs (handle different types)
+            is_passed = self._compare_outputs(run['stdout'], expected_output)
+            
+            if is_passed:
+                passed_tests += 1
+            
+            test_results.append({
+                'test_case': idx + 1,
+                'input': test_input,
+                'expected_output': expected_output,
+                'actual_output': run['stdout'],
+                'passed': is_passed,
+                'execution_time': round(run['execution_time'], 3)
+            })
         
-        total_tests = len(test_cases)
-        score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        return {
-            'success': True,
-            'passed_tests': passed_tests,
-            'total_tests': total_tests,
-            'score': round(score, 2),
-            'test_results': test_results,
-            'performance_level': self._get_performance_level(score)
-        }
+        return self._compile_final_result(passed_tests, test_results, len(test_cases))
     
     def _compare_outputs(self, actual: str, expected: str) -> bool:
         """Compare actual and expected outputs with flexible matching"""
@@ -477,86 +544,21 @@ class Evaluator:
                 'total_tests': len(test_cases)
             }
 
-        passed_tests = 0
-        test_results = []
+        # One script shared by every test case run
+        with tempfile.NamedTemporaryFile(suffix='.js', delete=False, mode='w', encoding='utf-8') as f:
+            f.write(code)
+            js_file = f.name
         
-        for idx, test_case in enumerate(test_cases):
-            # Create temporary JS file
-            with tempfile.NamedTemporaryFile(suffix='.js', delete=False, mode='w', encoding='utf-8') as f:
-                f.write(code)
-                js_file = f.name
-            
-            try:
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                # Execute
-                result = self._run_subprocess(['node', js_file], test_input)
-                
-                if result['timeout']:
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': '',
-                        'passed': False,
-                        'error': 'Time limit exceeded',
-                        'execution_time': result['execution_time']
-                    })
-                    continue
-                    
-                if result['return_code'] != 0:
-                     test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': result['stderr'],
-                        'passed': False,
-                        'error': 'Runtime Error'
-                    })
-                     continue
-
-                is_passed = self._compare_outputs(result['stdout'], expected_output)
-                if is_passed:
-                    passed_tests += 1
-                    
-                test_results.append({
-                    'test_case': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': result['stdout'],
-                    'passed': is_passed,
-                    'execution_time': result['execution_time']
-                })
-                
-            except Exception as e:
-                 test_results.append({
-                    'test_case': idx + 1,
-                    'passed': False,
-                    'error': str(e)
-                })
-            finally:
-                if os.path.exists(js_file):
-                    os.unlink(js_file)
+        try:
+            passed_tests, test_results = self._run_test_cases(['node', js_file], test_cases)
+        finally:
+            if os.path.exists(js_file):
+                os.unlink(js_file)
 
-        total_tests = len(test_cases)
-        score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        return {
-            'success': True,
-            'passed_tests': passed_tests,
-            'total_tests': total_tests,
-            'score': round(score, 2),
-            'test_results': test_results,
-            'performance_level': self._get_performance_level(score)
-        }
+        return self._compile_final_result(passed_tests, test_results, len(test_cases))
     
     def _evaluate_java_code(self, code: str, test_cases: List[Dict]) -> Dict:
         """Evaluate Java code"""
-        import tempfile
-        import os
-        import shutil
-        
         # Check for Java
         if not self._is_command_available('javac') or not self._is_command_available('java'):
              return {
@@ -566,92 +568,16 @@ class Evaluator:
                 'total_tests': len(test_cases)
             }
 
-        # Create a temp directory for class files
-        temp_dir = tempfile.mkdtemp()
-        java_file = os.path.join(temp_dir, 'Main.java')
-        
-        try:
-            with open(java_file, 'w', encoding='utf-8') as f:
-                f.write(code)
+        with self._compile(code, 'Main.java', 'javac', lambda src, exe: ['javac', src]) as (build_dir, compile_error):
+            if compile_error is not None:
+                return self._compile_error_result(compile_error, len(test_cases))
             
-            # Compile
-            compile_result = self._run_subprocess(['javac', java_file], '')
-            
-            if compile_result['return_code'] != 0:
-                return {
-                    'success': False,
-                    'error': f"Compilation Error:\n{compile_result['stderr']}",
-                    'passed_tests': 0,
-                    'total_tests': len(test_cases)
-                }
-                
-            passed_tests = 0
-            test_results = []
-            
-            for idx, test_case in enumerate(test_cases):
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                # Run (classpath must be temp_dir)
-                result = self._run_subprocess(['java', '-cp', temp_dir, 'Main'], test_input)
-                
-                if result['timeout']:
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': '',
-                        'passed': False,
-                        'error': 'Time limit exceeded',
-                        'execution_time': result['execution_time']
-                    })
-                    continue
-                
-                if result['return_code'] != 0:
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': result['stderr'],
-                        'passed': False,
-                        'error': 'Runtime Error'
-                    })
-                    continue
-                    
-                is_passed = self._compare_outputs(result['stdout'], expected_output)
-                if is_passed:
-                    passed_tests += 1
-                
-                test_results.append({
-                    'test_case': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': result['stdout'],
-                    'passed': is_passed,
-                    'execution_time': result['execution_time']
-                })
-                
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            
-        total_tests = len(test_cases)
-        score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        return {
-            'success': True,
-            'passed_tests': passed_tests,
-            'total_tests': total_tests,
-            'score': round(score, 2),
-            'test_results': test_results,
-            'performance_level': self._get_performance_level(score)
-        }
+            # Run (classpath is the build directory)
+            passed_tests, test_results = self._run_test_cases(['java', '-cp', build_dir, 'Main'], test_cases)
+        return self._compile_final_result(passed_tests, test_results, len(test_cases))
 
     def _evaluate_cpp_code(self, code: str, test_cases: List[Dict]) -> Dict:
         """Evaluate C++ code"""
-        import tempfile
-        import os
-        import platform
-        
         if not self._is_command_available('g++'):
              return {
                 'success': False,
@@ -660,78 +586,12 @@ class Evaluator:
                 'total_tests': len(test_cases)
             }
 
-        with tempfile.NamedTemporaryFile(suffix='.cpp', delete=False, mode='w', encoding='utf-8') as f:
-            f.write(code)
-            cpp_file = f.name
-            
-        exe_extension = '.exe' if platform.system() == 'Windows' else '.out'
-        exe_file = cpp_file.replace('.cpp', exe_extension)
-        
-        try:
-            # Compile
-            compile_cmd = ['g++', cpp_file, '-o', exe_file]
-            compile_result = self._run_subprocess(compile_cmd, '')
-            
-            if compile_result['return_code'] != 0:
-                os.unlink(cpp_file) 
-                return {
-                    'success': False,
-                    'error': f"Compilation Error:\n{compile_result['stderr']}",
-                    'passed_tests': 0,
-                    'total_tests': len(test_cases)
-                }
-            
-            passed_tests = 0
-            test_results = []
+        with self._compile(code, 'main.cpp', 'g++', lambda src, exe: ['g++', src, '-o', exe]) as (build_dir, compile_error):
+            if compile_error is not None:
+                return self._compile_error_result(compile_error, len(test_cases))
             
-            for idx, test_case in enumerate(test_cases):
-                test_input = str(test_case.get('input', '')).strip()
-                expected_output = str(test_case.get('expected_output', '')).strip()
-                
-                result = self._run_subprocess([exe_file], test_input)
-                
-                if result['timeout']:
-                    test_results.append({
-                        'test_case': idx + 1,
-                        'input': test_input,
-                        'expected_output': expected_output,
-                        'actual_output': '',
-                        'passed': False,
-                        'error': 'Time limit exceeded',
-                        'execution_time': result['execution_time']
-                    })
-                    continue
-                
-                is_passed = self._compare_outputs(result['stdout'], expected_output)
-                if is_passed:
-                    passed_tests += 1
-                
-                test_results.append({
-                    'test_case': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': result['stdout'],
-                    'passed': is_passed,
-                    'execution_time': result['execution_time']
-                })
-                
-        finally:
-            if os.path.exists(cpp_file):
-                os.unlink(cpp_file)
-            if os.path.exists(exe_file):
-                os.unlink(exe_file)
-                
-        total_tests = len(test_cases)
-        score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        return {
-            'success': True,
-            'passed_tests': passed_tests,
-            'total_tests': total_tests,
-            'score': round(score, 2),
-            'test_results': test_results,
-            'performance_level': self._get_performance_level(score)
-        }
+            passed_tests, test_results = self._run_test_cases([os.path.join(build_dir, BUILD_EXECUTABLE)], test_cases)
+        return self._compile_final_result(passed_tests, test_results, len(test_cases))
 
     def _is_command_available(self, cmd: str) -> bool:
         """Check if a command is available in PATH"""
@@ -773,20 +633,8 @@ class Evaluator:
                 'execution_time': time.time() - start_time
             }
     
-    def _calculate_skill_scores(self, detailed_results: List[Dict]) -> Dict[str, Dict]:
-        """Calculate scores for each skill"""
-        skill_data = {}
-        
-        for result in detailed_results:
-            skill = result.get('skill', 'Unknown')
-            if skill not in skill_data:
-                skill_data[skill] = {'correct': 0, 'total': 0}
-            
-            skill_data[skill]['total'] += 1
-            if result['is_correct']:
-                skill_data[skill]['correct'] += 1
-        
-        # Calculate percentages
+    def _skill_scores(self, skill_data: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Scores for each skill from its correct/total counts"""
         skill_scores = {}
         for skill, data in skill_data.items():
             score = (data['correct'] / data['total'] * 100) if data['total'] > 0 else 0
@@ -1019,10 +1019,9 @@ def get_mcq_questions(skill: str, proficiency: str = "beginner", count: int = 5)
     if skill in FALLBACK_MCQ_QUESTIONS:
         if proficiency in FALLBACK_MCQ_QUESTIONS[skill]:
             questions = FALLBACK_MCQ_QUESTIONS[skill][proficiency]
-            # Shuffle and return requested count
+            # Random selection; the bank itself is shared and never reordered
             import random
-            random.shuffle(questions)
-            return questions[:count]
+            return random.sample(questions, min(count, len(questions)))
     return []
 
 def get_coding_challenges(skill: str):
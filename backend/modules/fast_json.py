@@ -0,0 +1,82 @@
+"""
+Fast JSON encoding and decoding for API requests and responses
+
+Uses orjson when it is installed and the standard library otherwise. Both
+produce the same JSON as Flask's default provider: sorted keys where Flask
+sorts them, dates as HTTP dates, Decimals as strings.
+"""
+
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+
+try:
+    import orjson  # optional: several times faster than json on large payloads
+except ImportError:
+    orjson = None
+
+
+def _encode(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib handles those
+            pass
+
+    return json.dumps(
+        obj, default=DefaultJSONProvider.default, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, keys in insertion order"""
+    return _encode(obj)
+
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Serves jsonify() responses and request.json / request.get_json(). Calls
+    passing stdlib-specific options go to the default implementation.
+    """
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return _encode(obj, self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        # Bytes straight into the response, skipping the str round trip
+        body = _encode(obj, self.sort_keys, indent)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Use the fast provider when enabled and orjson is installed"""
+    if Config.FAST_JSON and orjson is not None:
+        app.json = FastJSONProvider(app)
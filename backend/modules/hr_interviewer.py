@@ -1,27 +1,24 @@
-from openai import OpenAI
 from typing import List, Dict
+import asyncio
 import json
+import time
 from config import Config
+from modules.llm_clients import get_client, get_async_client
 
 class HRInterviewer:
     """AI-powered HR interview simulation"""
     
     def __init__(self, api_key: str = None):
-        api_key = api_key or Config.OPENAI_API_KEY
-        
-        # Check if using OpenRouter (API key starts with 'sk-or-')
-        if api_key and api_key.startswith('sk-or-'):
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://openrouter.ai/api/v1"
-            )
-        else:
-            self.client = OpenAI(api_key=api_key)
-        
+        self.api_key = api_key or Config.OPENAI_API_KEY
         self.model = Config.OPENAI_MODEL
         self.conversation_history = []
         self.candidate_info = {}
     
+    @property
+    def client(self):
+        """OpenAI client, created on first use and shared across instances"""
+        return get_client(self.api_key)
+    
     def initialize_interview(self, resume_data: Dict) -> Dict:
         """
         Initialize the HR interview with candidate information
@@ -34,8 +31,16 @@ class HRInterviewer:
         """
         self.candidate_info = resume_data
         
-        # Create system prompt
-        system_prompt = f"""You are an experienced HR interviewer conducting a professional job interview. 
+        self.conversation_history = [
+            {"role": "system", "content": self._build_system_prompt(resume_data)}
+        ]
+        
+        # Get first question
+        return self.get_next_question()
+    
+    def _build_system_prompt(self, resume_data: Dict) -> str:
+        """Create the interviewer system prompt for a candidate"""
+        return f"""You are an experienced HR interviewer conducting a professional job interview. 
 
 Candidate Information:
 - Name: {resume_data.get('personal_info', {}).get('name', 'Candidate')}
@@ -54,13 +59,6 @@ Your role:
 
 Interview duration: approximately {Config.HR_INTERVIEW_DURATION} minutes
 Start with a warm greeting and an opening question."""
-        
-        self.conversation_history = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        # Get first question
-        return self.get_next_question()
     
     def get_next_question(self, candidate_response: str = None) -> Dict:
         """
@@ -72,11 +70,7 @@ Start with a warm greeting and an opening question."""
         Returns:
             Next question from the interviewer
         """
-        if candidate_response:
-            self.conversation_history.append({
-                "role": "user",
-                "content": candidate_response
-            })
+        self._record_candidate_response(candidate_response)
         
         # Retry logic for transient API failures
         max_retries = 3
@@ -91,33 +85,43 @@ Start with a warm greeting and an opening question."""
                     max_tokens=300
                 )
                 
-                interviewer_message = response.choices[0].message.content
-                
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": interviewer_message
-                })
-                
-                return {
-                    'success': True,
-                    'message': interviewer_message,
-                    'question_number': len([m for m in self.conversation_history if m['role'] == 'assistant'])
-                }
+                return self._record_interviewer_message(response.choices[0].message.content)
                 
             except Exception as e:
                 print(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
                 
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                 else:
                     # Final attempt failed, return user-friendly error
-                    return {
-                        'success': False,
-                        'error': str(e),
-                        'message': 'I apologize for the technical difficulty. Let me try to continue our conversation. Could you please tell me more about your experience with the skills mentioned in your resume?'
-                    }
+                    return self._question_error_result(e)
+    
+    def _record_candidate_response(self, candidate_response: str = None):
+        if candidate_response:
+            self.conversation_history.append({
+                "role": "user",
+                "content": candidate_response
+            })
+    
+    def _record_interviewer_message(self, interviewer_message: str) -> Dict:
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": interviewer_message
+        })
+        
+        return {
+            'success': True,
+            'message': interviewer_message,
+            'question_number': len([m for m in self.conversation_history if m['role'] == 'assistant'])
+        }
+    
+    def _question_error_result(self, e: Exception) -> Dict:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': 'I apologize for the technical difficulty. Let me try to continue our conversation. Could you please tell me more about your experience with the skills mentioned in your resume?'
+        }
     
     def end_interview(self) -> Dict:
         """
@@ -126,12 +130,7 @@ Start with a warm greeting and an opening question."""
         Returns:
             Closing message from interviewer
         """
-        closing_prompt = "Please provide a warm closing statement for the interview, thanking the candidate and explaining next steps."
-        
-        self.conversation_history.append({
-            "role": "user",
-            "content": closing_prompt
-        })
+        self._record_closing_prompt()
         
         try:
             response = self.client.chat.completions.create(
@@ -149,10 +148,21 @@ Start with a warm greeting and an opening question."""
             }
             
         except Exception as e:
-            return {
-                'success': False,
-                'message': 'Thank you for your time today. We will be in touch soon regarding next steps.'
-            }
+            return self._closing_fallback()
+    
+    def _record_closing_prompt(self):
+        closing_prompt = "Please provide a warm closing statement for the interview, thanking the candidate and explaining next steps."
+        
+        self.conversation_history.append({
+            "role": "user",
+            "content": closing_prompt
+        })
+    
+    def _closing_fallback(self) -> Dict:
+        return {
+            'success': False,
+            'message': 'Thank you for your time today. We will be in touch soon regarding next steps.'
+        }
     
     def evaluate_interview_performance(self) -> Dict:
         """
@@ -161,6 +171,34 @@ Start with a warm greeting and an opening question."""
         Returns:
             Performance evaluation and feedback
         """
+        evaluation_prompt = self._build_evaluation_prompt()
+        
+        if evaluation_prompt is None:
+            return {
+                'score': 0,
+                'feedback': 'Insufficient responses to evaluate'
+            }
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert HR evaluator."},
+                    {"role": "user", "content": evaluation_prompt}
+                ],
+                temperature=0.5,
+                response_format={"type": "json_object"}
+            )
+            
+            evaluation = json.loads(response.choices[0].message.content)
+            return evaluation
+            
+        except Exception as e:
+            print(f"Error evaluating interview: {e}")
+            return self._get_fallback_evaluation()
+    
+    def _build_evaluation_prompt(self) -> str:
+        """Build the evaluation prompt, or None if the candidate said too little"""
         # Extract candidate responses
         candidate_responses = [
             msg['content'] for msg in self.conversation_history 
@@ -168,12 +206,9 @@ Start with a warm greeting and an opening question."""
         ]
         
         if not candidate_responses:
-            return {
-                'score': 0,
-                'feedback': 'Insufficient responses to evaluate'
-            }
+            return None
         
-        evaluation_prompt = f"""Based on this interview conversation, evaluate the candidate's performance on the following criteria (score each 0-100):
+        return f"""Based on this interview conversation, evaluate the candidate's performance on the following criteria (score each 0-100):
 
 1. Communication Skills: Clarity, articulation, professionalism
 2. Confidence: Self-assurance in responses
@@ -196,24 +231,6 @@ Provide evaluation as JSON:
   "areas_for_improvement": ["area 1", "area 2"],
   "summary": "brief summary of performance"
 }}"""
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR evaluator."},
-                    {"role": "user", "content": evaluation_prompt}
-                ],
-                temperature=0.5,
-                response_format={"type": "json_object"}
-            )
-            
-            evaluation = json.loads(response.choices[0].message.content)
-            return evaluation
-            
-        except Exception as e:
-            print(f"Error evaluating interview: {e}")
-            return self._get_fallback_evaluation()
     
     def _get_fallback_evaluation(self) -> Dict:
         """Fallback evaluation if API fails"""
@@ -229,6 +246,23 @@ Provide evaluation as JSON:
             'summary': 'Good effort in the interview process.'
         }
     
+    def to_dict(self) -> Dict:
+        """Serialize interview state so another worker can resume it"""
+        return {
+            'model': self.model,
+            'conversation_history': self.conversation_history,
+            'candidate_info': self.candidate_info
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'HRInterviewer':
+        """Rebuild an interviewer from to_dict() output"""
+        interviewer = cls()
+        interviewer.model = state.get('model', interviewer.model)
+        interviewer.conversation_history = state.get('conversation_history', [])
+        interviewer.candidate_info = state.get('candidate_info', {})
+        return interviewer
+    
     def get_conversation_summary(self) -> List[Dict]:
         """Get the full conversation history"""
         return [
@@ -239,3 +273,94 @@ Provide evaluation as JSON:
             for msg in self.conversation_history
             if msg['role'] in ['user', 'assistant']
         ]
+    
+    # --- Async variants (ASGI serving mode) ---
+    
+    def _async_client(self):
+        # The shared client is looked up per call so restored sessions need no extra state
+        return get_async_client(self.api_key)
+    
+    async def initialize_interview_async(self, resume_data: Dict) -> Dict:
+        """Non-blocking variant of initialize_interview() for the ASGI serving mode"""
+        self.candidate_info = resume_data
+        
+        self.conversation_history = [
+            {"role": "system", "content": self._build_system_prompt(resume_data)}
+        ]
+        
+        return await self.get_next_question_async()
+    
+    async def get_next_question_async(self, candidate_response: str = None) -> Dict:
+        """Non-blocking variant of get_next_question() for the ASGI serving mode"""
+        self._record_candidate_response(candidate_response)
+        
+        # Retry logic for transient API failures
+        max_retries = 3
+        retry_delay = 1
+        
+        for attempt in range(max_retries):
+            try:
+                response = await self._async_client().chat.completions.create(
+                    model=self.model,
+                    messages=self.conversation_history,
+                    temperature=0.7,
+                    max_tokens=300
+                )
+                
+                return self._record_interviewer_message(response.choices[0].message.content)
+                
+            except Exception as e:
+                print(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
+                
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2  # Exponential backoff
+                else:
+                    return self._question_error_result(e)
+    
+    async def end_interview_async(self) -> Dict:
+        """Non-blocking variant of end_interview() for the ASGI serving mode"""
+        self._record_closing_prompt()
+        
+        try:
+            response = await self._async_client().chat.completions.create(
+                model=self.model,
+                messages=self.conversation_history,
+                temperature=0.7,
+                max_tokens=200
+            )
+            
+            return {
+                'success': True,
+                'message': response.choices[0].message.content
+            }
+            
+        except Exception as e:
+            return self._closing_fallback()
+    
+    async def evaluate_interview_performance_async(self) -> Dict:
+        """Non-blocking variant of evaluate_interview_performance() for the ASGI serving mode"""
+        evaluation_prompt = self._build_evaluation_prompt()
+        
+        if evaluation_prompt is None:
+            return {
+                'score': 0,
+                'feedback': 'Insufficient responses to evaluate'
+            }
+        
+        try:
+            response = await self._async_client().chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are an expert HR evaluator."},
+                    {"role": "user", "content": evaluation_prompt}
+                ],
+                temperature=0.5,
+                response_format={"type": "json_object"}
+            )
+            
+            return json.loads(response.choices[0].message.content)
+            
+        except Exception as e:
+            print(f"Error evaluating interview: {e}")
+            return self._get_fallback_evaluation()
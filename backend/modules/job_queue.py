@@ -0,0 +1,175 @@
+"""
+Background jobs on a process pool, so CPU-heavy work leaves the request threads
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from config import Config
+from modules import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Run functions in worker processes and track them by job id
+
+    Workers are forked when the queue starts, before the server spawns
+    request threads; forking a multithreaded process can leave locks held
+    in the child. Platforms without fork use their default start method.
+    """
+
+    def __init__(self, max_workers: int = None, result_ttl: float = None):
+        """
+        Args:
+            max_workers: Worker processes (default: one per CPU core)
+            result_ttl: Seconds a finished job stays queryable
+        """
+        self.max_workers = max_workers or Config.JOB_WORKERS or os.cpu_count() or 1
+        self.result_ttl = result_ttl if result_ttl is not None else Config.JOB_RESULT_TTL
+        self._executor = None
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Create the pool and its workers now rather than on the first submit"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+        # Fork start method launches every worker on the first submit
+        self._executor.submit(os.getpid).result()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def submit(self, job_id: str, fn: Callable, *args, on_done: Callable = None) -> Future:
+        """
+        Queue fn(*args) under job_id
+
+        Args:
+            on_done: Called in the parent process as on_done(job_id, result, error)
+                once the job finishes; exactly one of result/error is set
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            # The job's spans continue the submitting request's trace
+            call = (_run_job, tracing.current_context(), fn) + args
+            try:
+                future = self._executor.submit(*call)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OOM killer); start a fresh pool
+                logger.error("Job worker pool was broken, restarting it")
+                self._executor = self._create_executor()
+                future = self._executor.submit(*call)
+
+            job = self._jobs.get(job_id)
+            if job is None or job['future'] is not None:
+                job = self._jobs[job_id] = self._new_job()
+            job.update(future=future, submitted_at=time.time())
+        self._purge_finished()
+
+        def finished(done: Future):
+            error = done.exception()
+            result = None if error else done.result()
+            if error:
+                logger.error(f"Job {job_id} failed: {error}")
+            if on_done:
+                try:
+                    on_done(job_id, result, error)
+                except Exception as e:
+                    logger.error(f"Job {job_id} completion handler failed: {e}", exc_info=True)
+            job['finished_at'] = time.time()
+            job['handled'].set()
+
+        future.add_done_callback(finished)
+        return future
+
+    def reserve(self, job_id: str):
+        """Track a job that will be submitted later, so wait() and `in` already know it"""
+        with self._lock:
+            self._jobs.setdefault(job_id, self._new_job())
+
+    def cancel(self, job_id: str):
+        """Give up on a reserved job that will never be submitted"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['future'] is not None:
+                return
+            job['finished_at'] = time.time()
+        job['handled'].set()
+
+    @staticmethod
+    def _new_job() -> Dict:
+        return {'future': None, 'submitted_at': None, 'finished_at': None, 'handled': threading.Event()}
+
+    def __contains__(self, job_id: str) -> bool:
+        """Whether this process runs (or will run) the job and still tracks it"""
+        with self._lock:
+            return job_id in self._jobs
+
+    def wait(self, job_id: str, timeout: float) -> Optional[bool]:
+        """
+        Block until a job and its completion handler are done
+
+        Returns:
+            True if finished, False on timeout, None if the job is not known here
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return job['handled'].wait(timeout)
+
+    def pending(self) -> int:
+        """Jobs queued or running"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job['finished_at'] is None)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] is not None and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+# --- Tasks (run inside worker processes) ---
+
+def _run_job(trace_context: Optional[Dict], fn: Callable, *args):
+    with tracing.resume(trace_context, f'job.{fn.__name__}'):
+        return fn(*args)
+
+
+def process_resume(filepath: str) -> Dict:
+    """Parse a resume file and analyze its skills"""
+    from modules.resume_parser import ResumeParser
+    from modules.skill_analyzer import SkillAnalyzer
+
+    resume_data = ResumeParser().parse_resume(filepath)
+    skill_analysis = SkillAnalyzer().analyze_skills(
+        resume_data['skills'],
+        resume_data['raw_text']
+    )
+    return {
+        'resume_data': resume_data,
+        'skill_analysis': skill_analysis
+    }
@@ -1,11 +1,31 @@
 import requests
+import httpx
 import time
 from typing import Dict, Optional
 from config import Config
+from modules import tracing
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared by every Judge0Client in the process so connections are reused across requests
+_async_http = None
+
+
+def _get_async_http() -> httpx.AsyncClient:
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient()
+    return _async_http
+
+
+async def close_async_http():
+    """Close the shared async HTTP client (ASGI shutdown)"""
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+
 
 class Judge0Client:
     """Client for Judge0 CE API - Online code execution service"""
@@ -63,6 +83,7 @@ class Judge0Client:
         lang_lower = language.lower().strip()
         return self.LANGUAGE_IDS.get(lang_lower)
     
+    @tracing.traced('judge0.execute')
     def execute_code(self, code: str, language: str, stdin: str = '', expected_output: str = '') -> Dict:
         """
         Execute code using Judge0 API
@@ -79,62 +100,115 @@ class Judge0Client:
         language_id = self.get_language_id(language)
         
         if not language_id:
-            return {
-                'success': False,
-                'error': f'Language "{language}" is not supported by Judge0',
-                'passed': False
-            }
+            return self._unsupported_language(language)
         
         try:
-            # Create submission
-            submission_data = {
-                'source_code': code,
-                'language_id': language_id,
-                'stdin': stdin if stdin else '',
-                'expected_output': expected_output if expected_output else None
-            }
-            
             # Submit code for execution
             response = requests.post(
-                f'{self.api_url}/submissions?base64_encoded=false&wait=true',
-                json=submission_data,
+                self._submission_url(),
+                json=self._build_submission(code, language_id, stdin, expected_output),
                 headers=self.get_headers(),
                 timeout=self.timeout
             )
             
-            if response.status_code not in [200, 201]:
-                logger.error(f'Judge0 submission failed: {response.status_code} - {response.text}')
-                return {
-                    'success': False,
-                    'error': f'Code execution service returned error: {response.status_code}',
-                    'passed': False
-                }
-            
-            result = response.json()
-            
-            # Parse result
-            return self._parse_result(result, expected_output)
+            return self._handle_response(response, expected_output)
             
         except requests.exceptions.Timeout:
-            return {
-                'success': False,
-                'error': 'Code execution timed out',
-                'passed': False
-            }
+            return self._timeout_result()
         except requests.exceptions.RequestException as e:
-            logger.error(f'Judge0 API error: {str(e)}')
-            return {
-                'success': False,
-                'error': f'Code execution service error: {str(e)}',
-                'passed': False
-            }
+            return self._service_error_result(e)
+        except Exception as e:
+            return self._unexpected_error_result(e)
+    
+    @tracing.traced('judge0.execute')
+    async def execute_code_async(self, code: str, language: str, stdin: str = '', expected_output: str = '') -> Dict:
+        """
+        Non-blocking variant of execute_code() for the ASGI serving mode
+        
+        Args:
+            code: Source code to execute
+            language: Programming language
+            stdin: Standard input for the program
+            expected_output: Expected output for comparison
+            
+        Returns:
+            Dictionary with execution results
+        """
+        language_id = self.get_language_id(language)
+        
+        if not language_id:
+            return self._unsupported_language(language)
+        
+        try:
+            response = await _get_async_http().post(
+                self._submission_url(),
+                json=self._build_submission(code, language_id, stdin, expected_output),
+                headers=self.get_headers(),
+                timeout=self.timeout
+            )
+            
+            return self._handle_response(response, expected_output)
+            
+        except httpx.TimeoutException:
+            return self._timeout_result()
+        except httpx.HTTPError as e:
+            return self._service_error_result(e)
         except Exception as e:
-            logger.error(f'Unexpected error in Judge0 execution: {str(e)}')
+            return self._unexpected_error_result(e)
+    
+    def _submission_url(self) -> str:
+        return f'{self.api_url}/submissions?base64_encoded=false&wait=true'
+    
+    def _build_submission(self, code: str, language_id: int, stdin: str, expected_output: str) -> Dict:
+        return {
+            'source_code': code,
+            'language_id': language_id,
+            'stdin': stdin if stdin else '',
+            'expected_output': expected_output if expected_output else None
+        }
+    
+    def _handle_response(self, response, expected_output: str) -> Dict:
+        """Turn a requests/httpx submission response into an execution result"""
+        if response.status_code not in [200, 201]:
+            logger.error(f'Judge0 submission failed: {response.status_code} - {response.text}')
             return {
                 'success': False,
-                'error': f'Unexpected error: {str(e)}',
+                'error': f'Code execution service returned error: {response.status_code}',
                 'passed': False
             }
+        
+        # Parse result
+        return self._parse_result(response.json(), expected_output)
+    
+    def _unsupported_language(self, language: str) -> Dict:
+        return {
+            'success': False,
+            'error': f'Language "{language}" is not supported by Judge0',
+            'passed': False
+        }
+    
+    def _timeout_result(self) -> Dict:
+        return {
+            'success': False,
+            'error': 'Code execution timed out',
+            'passed': False
+        }
+    
+    def _service_error_result(self, e: Exception) -> Dict:
+        logger.error(f'Judge0 API error: {str(e)}')
+        return {
+            'success': False,
+            'error': f'Code execution service error: {str(e)}',
+            'passed': False
+        }
+    
+    def _unexpected_error_result(self, e: Exception) -> Dict:
+        logger.error(f'Unexpected error in Judge0 execution: {str(e)}')
+        return {
+            'success': False,
+            'error': f'Unexpected error: {str(e)}',
+            'passed': False
+        }
     
     def _parse_result(self, result: Dict, expected_output: str) -> Dict:
         """Parse Judge0 execution result"""
@@ -0,0 +1,98 @@
+"""
+Shared OpenAI-compatible clients
+
+The openai package is imported on first use; it is the slowest import in the
+backend and many workers (emotion/attention tracking) never call the LLM.
+"""
+
+from config import Config
+from modules import metrics, startup, tracing
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# api_key -> client; one connection pool per key for the whole process
+_clients = {}
+_async_clients = {}
+
+
+class _TrackedCompletions:
+    """chat.completions whose create() is counted in the LLM metrics and traced"""
+
+    def __init__(self, completions, is_async: bool):
+        self._completions = completions
+        self._is_async = is_async
+
+    def create(self, **kwargs):
+        if self._is_async:
+            return self._create_async(**kwargs)
+        with metrics.LLM_CALLS_IN_FLIGHT.track_inprogress(), metrics.LLM_CALL_LATENCY.time(), \
+                tracing.span('llm.chat_completion', model=kwargs.get('model')):
+            return self._completions.create(**kwargs)
+
+    async def _create_async(self, **kwargs):
+        with metrics.LLM_CALLS_IN_FLIGHT.track_inprogress(), metrics.LLM_CALL_LATENCY.time(), \
+                tracing.span('llm.chat_completion', model=kwargs.get('model')):
+            return await self._completions.create(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class _TrackedChat:
+    def __init__(self, chat, is_async: bool):
+        self._chat = chat
+        self.completions = _TrackedCompletions(chat.completions, is_async)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class _TrackedClient:
+    """OpenAI client proxy; everything but chat.completions.create passes through"""
+
+    def __init__(self, client, is_async: bool = False):
+        self._client = client
+        self.chat = _TrackedChat(client.chat, is_async)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def _client_kwargs(api_key: str) -> dict:
+    # Check if using OpenRouter (API key starts with 'sk-or-')
+    if api_key and api_key.startswith('sk-or-'):
+        return {'api_key': api_key, 'base_url': OPENROUTER_BASE_URL}
+    if Config.OPENAI_BASE_URL:
+        return {'api_key': api_key, 'base_url': Config.OPENAI_BASE_URL}
+    return {'api_key': api_key}
+
+
+def get_client(api_key: str = None):
+    """Return the process-wide OpenAI client for an API key"""
+    api_key = api_key or Config.OPENAI_API_KEY
+
+    client = _clients.get(api_key)
+    if client is None:
+        openai = startup.import_module('openai')
+        client = _clients.setdefault(api_key, _TrackedClient(openai.OpenAI(**_client_kwargs(api_key))))
+
+    return client
+
+
+def get_async_client(api_key: str = None):
+    """
+    Return the process-wide AsyncOpenAI client for an API key
+
+    Reusing one client keeps HTTP connections to the provider alive across
+    requests instead of re-handshaking for every interview turn.
+    """
+    api_key = api_key or Config.OPENAI_API_KEY
+
+    client = _async_clients.get(api_key)
+    if client is None:
+        openai = startup.import_module('openai')
+        client = _async_clients.setdefault(
+            api_key, _TrackedClient(openai.AsyncOpenAI(**_client_kwargs(api_key)), is_async=True)
+        )
+
+    return client
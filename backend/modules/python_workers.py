@@ -0,0 +1,373 @@
+"""
+Warm Python worker processes for running candidate code
+
+Each worker is a separate interpreter with the commonly used stdlib modules
+already imported, so candidate code never touches the server's
+sys.stdout/sys.stdin. Where fork() exists the worker is a fork server: every
+run executes in a fresh child of it, so whatever a submission patches
+(builtins, json, math, ...) dies with the child and cannot affect later runs.
+The child never sees the worker's request/response pipes; the worker itself
+builds each result from the child's output pipes and exit status.
+
+Every run is bounded: the worker kills a child that exceeds the wall-clock
+timeout (the pool kills a worker that stops answering), and on POSIX rlimits
+cap each child's CPU time (SIGXCPU) and address space (MemoryError).
+Without fork() the worker runs submissions itself and is replaced after each.
+
+Also runnable as a script: ``python python_workers.py`` is the worker itself.
+"""
+
+import json
+import logging
+import math
+import os
+import selectors
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+try:
+    import resource  # POSIX only; elsewhere just the wall-clock limit applies
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+TIME_LIMIT_EXCEEDED = 'Time limit exceeded'
+MEMORY_LIMIT_EXCEEDED = 'Memory limit exceeded'
+
+# Time a worker gets beyond the run's own timeout to report back before the pool kills it
+WORKER_GRACE_SECONDS = 5
+
+FORK_SERVER = hasattr(os, 'fork')
+
+# Imported once per worker instead of once per test case
+PRELOADED_MODULES = [
+    'bisect', 'collections', 'copy', 'datetime', 'decimal', 'fractions', 'functools',
+    'heapq', 'itertools', 'math', 'operator', 'random', 're', 'statistics', 'string', 'typing'
+]
+
+
+class _Worker:
+    """One worker process and its request/response pipes"""
+
+    def __init__(self, limits: Dict):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), json.dumps(limits)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            encoding='utf-8', start_new_session=FORK_SERVER
+        )
+        self.runs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, code: str, stdin: str, timeout: float) -> Dict:
+        self.runs += 1
+        timed_out = threading.Event()
+
+        def kill():
+            # Ends the blocked readline() below
+            timed_out.set()
+            self.process.kill()
+
+        watchdog = threading.Timer(timeout + WORKER_GRACE_SECONDS, kill)
+        start_time = time.perf_counter()
+        watchdog.start()
+        try:
+            self.process.stdin.write(json.dumps({'code': code, 'input': stdin}) + '\n')
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except OSError:
+            line = ''
+        finally:
+            watchdog.cancel()
+        if line:
+            return json.loads(line)
+
+        execution_time = time.perf_counter() - start_time
+        self.close()
+        if timed_out.is_set() or self.process.returncode == -getattr(signal, 'SIGXCPU', 0):
+            error = TIME_LIMIT_EXCEEDED
+        else:
+            error = f'Worker process exited (code {self.process.returncode})'
+        return {'stdout': '', 'error': error, 'execution_time': execution_time}
+
+    def close(self):
+        if FORK_SERVER and self.process.returncode is None:
+            # The worker's session, including a child still running a submission
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
+class PythonWorkerPool:
+    """
+    A bounded set of warm Python workers
+
+    A run takes an idle worker (starting one if none is idle), and returns
+    it afterwards. Workers are replaced after ``max_runs`` submissions (after
+    every one where runs cannot be forked), and straight away when one dies.
+    """
+
+    def __init__(self, size: int, max_runs: int, max_output: int, timeout: float,
+                 cpu_limit: int = None, memory_limit_mb: int = None):
+        """
+        Args:
+            size: Most workers running code at once
+            max_runs: Submissions a worker runs before it is replaced
+            max_output: Characters of stdout kept per run
+            timeout: Wall-clock seconds per run before the worker is killed
+            cpu_limit: CPU seconds per run (default: the timeout)
+            memory_limit_mb: Address space of a run (default: unlimited)
+        """
+        self.size = size
+        # Without fork() runs share the worker's interpreter, so it must not outlive one
+        self.max_runs = max_runs if FORK_SERVER else 1
+        self.timeout = timeout
+        self.limits = {
+            'timeout': timeout,
+            'max_output': max_output,
+            'cpu_seconds': cpu_limit or math.ceil(timeout),
+            'memory_bytes': memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        }
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def start(self):
+        """Start idle workers up to the pool size"""
+        with self._lock:
+            self._forget_inherited()
+            while len(self._idle) < self.size:
+                self._idle.append(_Worker(self.limits))
+
+    def run(self, code: str, stdin: str) -> Dict:
+        """
+        Run code with stdin on a worker
+
+        Returns:
+            {'stdout', 'error' (None if it ran to completion), 'execution_time'};
+            error is TIME_LIMIT_EXCEEDED or MEMORY_LIMIT_EXCEEDED when a limit hit
+        """
+        with self._slots:
+            worker = self._acquire()
+            try:
+                return worker.run(code, stdin, self.timeout)
+            finally:
+                self._release(worker)
+
+    def close(self):
+        """Stop the idle workers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            self._forget_inherited()
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+                worker.close()
+        return _Worker(self.limits)
+
+    def _release(self, worker: _Worker):
+        if worker.alive and worker.runs < self.max_runs:
+            with self._lock:
+                self._idle.append(worker)
+            return
+        if worker.alive:
+            logger.debug("Recycling Python worker %s after %s runs", worker.process.pid, worker.runs)
+        worker.close()
+        # Start the replacement now so the next run finds it already warm
+        replacement = _Worker(self.limits)
+        with self._lock:
+            self._idle.append(replacement)
+
+    def _forget_inherited(self):
+        # After a fork the idle workers' pipes belong to the parent process
+        if self._pid != os.getpid():
+            self._idle = []
+            self._pid = os.getpid()
+
+
+def _execute(code: str, stdin: str, max_output: int) -> Dict:
+    """Run one submission the way the in-process evaluator did"""
+    import io
+
+    captured = io.StringIO()
+    sys.stdout = captured
+    sys.stdin = io.StringIO(stdin)
+    exec_globals = {
+        '__builtins__': __builtins__,
+        '__name__': '__main__',
+        'input': lambda prompt='': sys.stdin.readline().rstrip('\n')
+    }
+    error = None
+    start_time = time.perf_counter()
+    try:
+        exec(code, exec_globals)
+    except SystemExit:
+        pass
+    except MemoryError:
+        error = MEMORY_LIMIT_EXCEEDED
+    except Exception as e:
+        error = str(e)
+    finally:
+        execution_time = time.perf_counter() - start_time
+        sys.stdout = sys.__stdout__
+        sys.stdin = sys.__stdin__
+
+    output = captured.getvalue().strip()
+    # If no output captured, try to get result from globals
+    if not output and error is None:
+        for name in ('result', 'output'):
+            if name in exec_globals:
+                output = str(exec_globals[name]).strip()
+                break
+
+    return {'stdout': output[:max_output], 'error': error, 'execution_time': execution_time}
+
+
+def _run_forked(code: str, stdin: str, limits: Dict) -> Dict:
+    """
+    Run one submission in a fresh child process of this worker
+
+    The child reports only through two pipes of its own (output, error
+    message); the result is assembled here, from code the submission could
+    not have patched.
+    """
+    output_r, output_w = os.pipe()
+    error_r, error_w = os.pipe()
+    start_time = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        _child(code, stdin, limits, output_r, output_w, error_r, error_w)
+
+    os.close(output_w)
+    os.close(error_w)
+    received = _read_until_eof((output_r, error_r), start_time + limits['timeout'], limits['max_output'] * 4)
+    if received is None:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+    execution_time = time.perf_counter() - start_time
+    os.close(output_r)
+    os.close(error_r)
+
+    signum = os.WTERMSIG(status) if os.WIFSIGNALED(status) else None
+    if received is None or signum == getattr(signal, 'SIGXCPU', None):
+        return {'stdout': '', 'error': TIME_LIMIT_EXCEEDED, 'execution_time': execution_time}
+
+    output = received[output_r].decode('utf-8', errors='replace')
+    error = received[error_r].decode('utf-8', errors='replace') or None
+    exit_code = -signum if signum is not None else os.WEXITSTATUS(status)
+    if error is None and exit_code != 0:
+        error = f'Worker process exited (code {exit_code})'
+    return {'stdout': output[:limits['max_output']], 'error': error, 'execution_time': execution_time}
+
+
+def _child(code: str, stdin: str, limits: Dict, output_r: int, output_w: int, error_r: int, error_w: int):
+    """Body of a forked run; never returns"""
+    # Bound before the submission runs, so patching os cannot change how the result is sent
+    write, exit_now = os.write, os._exit
+    try:
+        os.close(output_r)
+        os.close(error_r)
+        # The worker's request/response pipes stay out of the submission's reach
+        os.close(_PROTOCOL_FDS[0])
+        os.close(_PROTOCOL_FDS[1])
+        if resource is not None:
+            # A fresh process: its CPU time starts at zero
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            soft = limits['cpu_seconds'] if hard == resource.RLIM_INFINITY else min(limits['cpu_seconds'], hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        result = _execute(code, stdin, limits['max_output'])
+        _write_all(write, output_w, result['stdout'].encode('utf-8', errors='replace'))
+        if result['error'] is not None:
+            _write_all(write, error_w, str(result['error']).encode('utf-8', errors='replace'))
+    finally:
+        exit_now(0)
+
+
+def _write_all(write, fd: int, data: bytes):
+    while data:
+        data = data[write(fd, data):]
+
+
+def _read_until_eof(fds, deadline: float, max_bytes: int):
+    """
+    Read pipes until all are closed, keeping at most max_bytes of each
+
+    Returns:
+        {fd: bytes}, or None if the deadline passed first
+    """
+    received = {fd: b'' for fd in fds}
+    with selectors.DefaultSelector() as selector:
+        for fd in fds:
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fd)
+                elif len(received[key.fd]) < max_bytes:
+                    received[key.fd] += chunk[:max_bytes - len(received[key.fd])]
+    return received
+
+
+_PROTOCOL_FDS = (None, None)
+
+
+def _worker_main(limits: Dict):
+    import importlib
+    global _PROTOCOL_FDS
+
+    # Keep the protocol on private descriptors, so candidate code writing to
+    # fd 1 or reading fd 0 directly cannot corrupt it
+    requests = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    responses = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    _PROTOCOL_FDS = (requests.fileno(), responses.fileno())
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    for name in PRELOADED_MODULES:
+        importlib.import_module(name)
+
+    if resource is not None and limits['memory_bytes']:
+        # Allocations beyond this fail with MemoryError instead of growing the host's memory use
+        resource.setrlimit(resource.RLIMIT_AS, (limits['memory_bytes'], limits['memory_bytes']))
+
+    for line in requests:
+        request = json.loads(line)
+        if FORK_SERVER:
+            result = _run_forked(request['code'], request['input'], limits)
+        else:
+            result = _execute(request['code'], request['input'], limits['max_output'])
+        responses.write(json.dumps(result) + '\n')
+        responses.flush()
+
+
+if __name__ == '__main__':
+    _worker_main(json.loads(sys.argv[1]))
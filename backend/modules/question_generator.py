@@ -1,9 +1,9 @@
 import traceback
-from openai import OpenAI
 from typing import List, Dict
 import json
 import random
 from config import Config
+from modules.llm_clients import get_client, get_async_client
 
 class QuestionGenerator:
     """Generate dynamic MCQ and coding questions using AI"""
@@ -27,20 +27,18 @@ class QuestionGenerator:
         "Climbing Stairs", "Maximum Subarray", "House Robber", "Coin Change"
     ]
     
+    # Skills that also get coding challenges (12 essential languages)
+    CODING_LANGUAGES = ['Python', 'Java', 'JavaScript', 'C++', 'C', 'SQL', 'Kotlin', 'Go', 'Rust', 'Swift', 'R']
+    
     def __init__(self, api_key: str = None):
-        api_key = api_key or Config.OPENAI_API_KEY
-        
-        # Check if using OpenRouter (API key starts with 'sk-or-')
-        if api_key and api_key.startswith('sk-or-'):
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url="https://openrouter.ai/api/v1"
-            )
-        else:
-            self.client = OpenAI(api_key=api_key)
-        
+        self.api_key = api_key or Config.OPENAI_API_KEY
         self.model = Config.OPENAI_MODEL
     
+    @property
+    def client(self):
+        """OpenAI client, created on first use and shared across instances"""
+        return get_client(self.api_key)
+    
     def _clean_json_string(self, content: str) -> str:
         """Clean JSON string by removing markdown code blocks"""
         content = content.strip()
@@ -66,6 +64,21 @@ class QuestionGenerator:
         Returns:
             List of MCQ questions with answers
         """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_mcq_messages(skill, proficiency, num_questions),
+                temperature=0.8,
+                response_format={"type": "json_object"}
+            )
+            
+            return self._parse_mcq_response(response.choices[0].message.content, skill, num_questions)
+            
+        except Exception as e:
+            return self._handle_mcq_error(e, skill, proficiency, num_questions)
+    
+    def _build_mcq_messages(self, skill: str, proficiency: str, num_questions: int) -> List[Dict]:
+        """Build the chat messages used to request MCQ questions"""
         prompt = f"""Generate {num_questions} multiple-choice questions to test {proficiency} level knowledge of {skill}.
 
 For each question, provide:
@@ -93,78 +106,73 @@ Return the response as a JSON array with this structure:
   }}
 ]"""
         
+        return [
+            {"role": "system", "content": "You are an expert technical interviewer creating assessment questions."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_mcq_response(self, content: str, skill: str, num_questions: int) -> List[Dict]:
+        """Parse and validate the MCQ questions returned by the model"""
+        # Clean content to handle markdown code blocks
+        content = self._clean_json_string(content)
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert technical interviewer creating assessment questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.8,
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Clean content to handle markdown code blocks
-            content = self._clean_json_string(content)
-            
-            try:
-                questions_data = json.loads(content)
-            except json.JSONDecodeError as je:
-                print(f"JSON Parsing Error: {je}")
-                print(f"Raw content: {content}")
-                raise je
-            
-            # Handle both direct array and object with questions key
-            if isinstance(questions_data, dict) and 'questions' in questions_data:
-                questions = questions_data['questions']
-            elif isinstance(questions_data, list):
-                questions = questions_data
-            else:
-                questions = [questions_data]
-            
-            # Add metadata
-            for q in questions:
-                q['skill'] = skill
-                q['type'] = 'mcq'
-            
-            # Validate options
-            valid_questions = []
-            for q in questions:
-                # Normalize keys to uppercase
-                if 'options' in q and isinstance(q['options'], dict):
-                    # Ensure A, B, C, D exist
-                    normalized_options = {}
-                    for k, v in q['options'].items():
-                        # specific handle for 'a', 'b' etc
-                        key = k.upper().strip()
-                        if key in ['A', 'B', 'C', 'D']:
-                            normalized_options[key] = str(v).strip()
-                    
-                    # Fill missing keys if needed or skip
-                    if len(normalized_options) >= 2: # At least 2 options needed
-                        q['options'] = normalized_options
-                        
-                        # Ensure correct answer is uppercase
-                        if 'correct_answer' in q:
-                            q['correct_answer'] = q['correct_answer'].upper().strip()
-                        
-                        valid_questions.append(q)
-            
-            return valid_questions[:num_questions]
-            
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Check for specific API errors to handle gracefully without full traceback
-            if any(code in error_msg for code in ["402", "401", "429", "500", "503"]):
-                print(f"OpenAI API Error ({error_msg}). Using fallback questions.")
-                return self._get_fallback_mcq(skill, proficiency, num_questions)
+            questions_data = json.loads(content)
+        except json.JSONDecodeError as je:
+            print(f"JSON Parsing Error: {je}")
+            print(f"Raw content: {content}")
+            raise je
+        
+        # Handle both direct array and object with questions key
+        if isinstance(questions_data, dict) and 'questions' in questions_data:
+            questions = questions_data['questions']
+        elif isinstance(questions_data, list):
+            questions = questions_data
+        else:
+            questions = [questions_data]
+        
+        # Add metadata
+        for q in questions:
+            q['skill'] = skill
+            q['type'] = 'mcq'
+        
+        # Validate options
+        valid_questions = []
+        for q in questions:
+            # Normalize keys to uppercase
+            if 'options' in q and isinstance(q['options'], dict):
+                # Ensure A, B, C, D exist
+                normalized_options = {}
+                for k, v in q['options'].items():
+                    # specific handle for 'a', 'b' etc
+                    key = k.upper().strip()
+                    if key in ['A', 'B', 'C', 'D']:
+                        normalized_options[key] = str(v).strip()
                 
-            print(f"Error generating MCQ questions: {error_msg}")
-            traceback.print_exc()
+                # Fill missing keys if needed or skip
+                if len(normalized_options) >= 2: # At least 2 options needed
+                    q['options'] = normalized_options
+                    
+                    # Ensure correct answer is uppercase
+                    if 'correct_answer' in q:
+                        q['correct_answer'] = q['correct_answer'].upper().strip()
+                    
+                    valid_questions.append(q)
+        
+        return valid_questions[:num_questions]
+    
+    def _handle_mcq_error(self, e: Exception, skill: str, proficiency: str, num_questions: int) -> List[Dict]:
+        """Log an MCQ generation failure and fall back to the static bank"""
+        error_msg = str(e)
+        
+        # Check for specific API errors to handle gracefully without full traceback
+        if any(code in error_msg for code in ["402", "401", "429", "500", "503"]):
+            print(f"OpenAI API Error ({error_msg}). Using fallback questions.")
             return self._get_fallback_mcq(skill, proficiency, num_questions)
+            
+        print(f"Error generating MCQ questions: {error_msg}")
+        traceback.print_exc()
+        return self._get_fallback_mcq(skill, proficiency, num_questions)
     
 
     
@@ -372,7 +380,24 @@ Each challenge object MUST have these exact keys:
             Coding challenge with comprehensive test cases and details
         """
         avoid_topics = avoid_topics or []
+        messages, selected_scenario = self._build_coding_messages(skill, proficiency, avoid_topics, years_of_experience)
         
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.85,  # Increased for more creativity
+                top_p=0.92,  # Nucleus sampling for diversity
+                response_format={"type": "json_object"}
+            )
+            
+            return self._parse_coding_response(response.choices[0].message.content, skill, selected_scenario)
+            
+        except Exception as e:
+            return self._handle_coding_error(e, skill, proficiency, avoid_topics)
+    
+    def _build_coding_messages(self, skill: str, proficiency: str, avoid_topics: List[str], years_of_experience: int):
+        """Build the chat messages for a coding challenge; returns (messages, scenario)"""
         # Select random scenario template for uniqueness
         selected_scenario = random.choice(self.SCENARIO_TEMPLATES)
         
@@ -504,49 +529,45 @@ CRITICAL RULES:
 Generate a problem that will make the candidate think: "This is a real system I might build!"
 """
         
+        messages = [
+            {"role": "system", "content": "You are an expert competitive programming instructor and software architect. You create high-quality, unique coding challenges that mirror real-world engineering problems. Your challenges are known for being creative, practical, and different from typical platforms."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, selected_scenario
+    
+    def _parse_coding_response(self, content: str, skill: str, selected_scenario: str) -> Dict:
+        """Parse the coding challenge returned by the model and attach metadata"""
+        content = self._clean_json_string(content)
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert competitive programming instructor and software architect. You create high-quality, unique coding challenges that mirror real-world engineering problems. Your challenges are known for being creative, practical, and different from typical platforms."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.85,  # Increased for more creativity
-                top_p=0.92,  # Nucleus sampling for diversity
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            content = self._clean_json_string(content)
-            
-            try:
-                challenge = json.loads(content)
-            except json.JSONDecodeError as je:
-                print(f"JSON Parsing Error in Coding Challenge: {je}")
-                print(f"Raw content: {content}")
-                raise je
-            
-            # Combine all test cases for evaluation
-            all_test_cases = challenge.get('sample_test_cases', []) + challenge.get('hidden_test_cases', [])
-            challenge['test_cases'] = all_test_cases
-            
-            # Add metadata
-            challenge['skill'] = skill
-            challenge['type'] = 'coding'
-            challenge['scenario'] = selected_scenario
-            
-            return challenge
-            
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Check for specific API errors
-            if any(code in error_msg for code in ["402", "401", "429", "500", "503"]):
-                 print(f"OpenAI API Error ({error_msg}). Using fallback coding challenge.")
-                 return self._get_fallback_coding(skill, proficiency, avoid_topics)
-            
-            print(f"Error generating coding challenge: {error_msg}")
-            return self._get_fallback_coding(skill, proficiency, avoid_topics)
+            challenge = json.loads(content)
+        except json.JSONDecodeError as je:
+            print(f"JSON Parsing Error in Coding Challenge: {je}")
+            print(f"Raw content: {content}")
+            raise je
+        
+        # Combine all test cases for evaluation
+        all_test_cases = challenge.get('sample_test_cases', []) + challenge.get('hidden_test_cases', [])
+        challenge['test_cases'] = all_test_cases
+        
+        # Add metadata
+        challenge['skill'] = skill
+        challenge['type'] = 'coding'
+        challenge['scenario'] = selected_scenario
+        
+        return challenge
+    
+    def _handle_coding_error(self, e: Exception, skill: str, proficiency: str, avoid_topics: List[str]) -> Dict:
+        """Log a coding challenge generation failure and fall back to a template"""
+        error_msg = str(e)
+        
+        # Check for specific API errors
+        if any(code in error_msg for code in ["402", "401", "429", "500", "503"]):
+             print(f"OpenAI API Error ({error_msg}). Using fallback coding challenge.")
+             return self._get_fallback_coding(skill, proficiency, avoid_topics)
+        
+        print(f"Error generating coding challenge: {error_msg}")
+        return self._get_fallback_coding(skill, proficiency, avoid_topics)
     
     def generate_quiz_for_skills(self, skills_with_proficiency: List[Dict]) -> Dict:
         """
@@ -569,9 +590,8 @@ Generate a problem that will make the candidate think: "This is a real system I
             mcqs = self.generate_mcq_questions(skill, proficiency, Config.MCQ_PER_SKILL)
             all_mcqs.extend(mcqs)
             
-            # Generate coding challenges for programming languages only (12 essential languages)
-            programming_langs = ['Python', 'Java', 'JavaScript', 'C++', 'C', 'SQL', 'Kotlin', 'Go', 'Rust', 'Swift', 'R']
-            if skill in programming_langs:
+            # Generate coding challenges for programming languages only
+            if skill in self.CODING_LANGUAGES:
                 # Generate 3 distinct challenges
                 num_challenges = getattr(Config, 'CODING_CHALLENGES_PER_SKILL', 3)
                 generated_topics = []
@@ -584,6 +604,9 @@ Generate a problem that will make the candidate think: "This is a real system I
                         generated_topics.append(coding.get('title', 'Unknown'))
                         print(f"Generated coding challenge: {coding.get('title')}")
         
+        return self._assemble_quiz(all_mcqs, all_coding)
+    
+    def _assemble_quiz(self, all_mcqs: List[Dict], all_coding: List[Dict]) -> Dict:
         # Shuffle questions
         random.shuffle(all_mcqs)
         
@@ -596,6 +619,42 @@ Generate a problem that will make the candidate think: "This is a real system I
             'time_limit_coding': Config.CODING_TIME_LIMIT
         }
     
+    # --- Async variants (ASGI serving mode) ---
+    
+    async def generate_mcq_questions_async(self, skill: str, proficiency: str, num_questions: int = 5) -> List[Dict]:
+        """Non-blocking variant of generate_mcq_questions()"""
+        try:
+            response = await get_async_client(self.api_key).chat.completions.create(
+                model=self.model,
+                messages=self._build_mcq_messages(skill, proficiency, num_questions),
+                temperature=0.8,
+                response_format={"type": "json_object"}
+            )
+            
+            return self._parse_mcq_response(response.choices[0].message.content, skill, num_questions)
+            
+        except Exception as e:
+            return self._handle_mcq_error(e, skill, proficiency, num_questions)
+    
+    async def generate_coding_challenge_async(self, skill: str, proficiency: str, avoid_topics: List[str] = None, years_of_experience: int = 1) -> Dict:
+        """Non-blocking variant of generate_coding_challenge()"""
+        avoid_topics = avoid_topics or []
+        messages, selected_scenario = self._build_coding_messages(skill, proficiency, avoid_topics, years_of_experience)
+        
+        try:
+            response = await get_async_client(self.api_key).chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.85,
+                top_p=0.92,
+                response_format={"type": "json_object"}
+            )
+            
+            return self._parse_coding_response(response.choices[0].message.content, skill, selected_scenario)
+            
+        except Exception as e:
+            return self._handle_coding_error(e, skill, proficiency, avoid_topics)
+    
     def _get_fallback_mcq(self, skill: str, proficiency: str, num: int) -> List[Dict]:
         """Fallback MCQ questions if API fails"""
         print(f"Using fallback MCQs for {skill}")
@@ -1,6 +1,7 @@
 from typing import Dict, List
 from datetime import datetime
 import json
+from modules import tracing
 
 class ReportGenerator:
     """Generate comprehensive assessment reports"""
@@ -8,6 +9,7 @@ class ReportGenerator:
     def __init__(self):
         self.report_data = {}
     
+    @tracing.traced('report.final')
     def generate_final_report(
         self,
         resume_data: Dict,
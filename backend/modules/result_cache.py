@@ -0,0 +1,118 @@
+"""
+Evaluation results of code submissions, reused for identical re-runs
+
+A submission is identified by the SHA-256 of its code, language and test
+cases. Previewing code and then submitting it unchanged, or clicking Run
+again, returns the stored result instead of executing the code again.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import Config
+from modules import metrics
+
+LOOKUPS = metrics.Counter('skillmind_code_result_cache_lookups_total', 'Code result cache lookups', ('result',))
+
+
+# Per-test errors that say nothing about the code itself: the run may well go
+# differently next time (matched as lowercase prefixes)
+TRANSIENT_TEST_ERRORS = (
+    'time limit exceeded',
+    'code execution',  # Judge0 unreachable, erroring (e.g. 503) or timed out
+    'worker process exited',
+    'unexpected error',
+    'unknown error',
+)
+
+
+def submission_digest(code: str, language: str, test_cases: List[Dict]) -> str:
+    """SHA-256 hex digest identifying a submission and the tests it runs against"""
+    identity = json.dumps([code, language, test_cases], sort_keys=True)
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    (session id, digest) -> evaluation result, evicting least recently used entries
+
+    Each session keeps at most ``per_session`` results, so one candidate
+    running many variants cannot push out everyone else's; all sessions
+    together are bounded by ``max_bytes``. Entries are stored as JSON bytes
+    and every hit returns a fresh copy.
+    """
+
+    def __init__(self, max_bytes: int = None, per_session: int = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CODE_RESULT_CACHE_MAX_BYTES
+        self.per_session = per_session if per_session is not None else Config.CODE_RESULT_CACHE_PER_SESSION
+        self._entries: OrderedDict = OrderedDict()
+        self._by_session: Dict[str, OrderedDict] = {}  # session id -> its keys, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, digest: str) -> Optional[Dict]:
+        """The stored result, marked from_cache, or None"""
+        key = (session_id, digest)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._by_session[session_id].move_to_end(digest)
+
+        LOOKUPS.inc(result='hit' if data is not None else 'miss')
+        if data is None:
+            return None
+        result = json.loads(data)
+        result['from_cache'] = True
+        return result
+
+    def put(self, session_id: str, digest: str, result: Dict):
+        """Store a result; failed runs, timeouts and service errors are not kept, so they run again"""
+        if not result.get('success') or any(_transient(test) for test in result.get('test_results', [])):
+            return
+        data = json.dumps(result).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        key = (session_id, digest)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = data
+            self._size += len(data)
+            session_keys = self._by_session.setdefault(session_id, OrderedDict())
+            session_keys[digest] = None
+
+            while len(session_keys) > self.per_session:
+                self._remove((session_id, next(iter(session_keys))))
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        data = self._entries.pop(key, None)
+        if data is None:
+            return
+        self._size -= len(data)
+        session_id, digest = key
+        session_keys = self._by_session[session_id]
+        del session_keys[digest]
+        if not session_keys:
+            del self._by_session[session_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Bytes held"""
+        return self._size
+
+
+def _transient(test: Dict) -> bool:
+    """Whether a test's outcome came from the execution environment rather than the code"""
+    if test.get('success') is False:
+        return True
+    error = test.get('error')
+    return isinstance(error, str) and error.strip().lower().startswith(TRANSIENT_TEST_ERRORS)
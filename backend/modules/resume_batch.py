@@ -0,0 +1,104 @@
+"""
+Unpacking of recruiter resume batches (multipart files and/or zip archives)
+"""
+
+import os
+import zipfile
+from typing import Callable, Iterable, List
+
+from werkzeug.utils import secure_filename
+
+
+class BatchFile:
+    """One resume of a batch: its session and saved path, or why it was rejected"""
+
+    def __init__(self, filename: str, session_id: str = None, filepath: str = None, error: str = None):
+        self.filename = filename
+        self.session_id = session_id
+        self.filepath = filepath
+        self.error = error
+
+
+def unpack_batch(uploads: Iterable, upload_folder: str, new_session_id: Callable[[], str],
+                 allowed_extensions: set, max_files: int, max_file_size: int) -> List[BatchFile]:
+    """
+    Save every resume of a batch to the upload folder
+
+    Args:
+        uploads: Werkzeug FileStorage objects; .zip files are expanded
+        upload_folder: Destination directory
+        new_session_id: Generates the session id each saved resume belongs to
+        allowed_extensions: Resume extensions accepted (e.g. {'pdf', 'docx'})
+        max_files: Resumes accepted per batch; the rest are rejected
+        max_file_size: Largest accepted resume (uncompressed, for zip members)
+
+    Returns:
+        One BatchFile per resume found, accepted or not
+    """
+    files = []
+    accepted = 0
+
+    def accept(filename: str, write: Callable[[str], None], size: int = None):
+        nonlocal accepted
+        name = secure_filename(os.path.basename(filename))
+        extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+
+        if extension not in allowed_extensions:
+            files.append(BatchFile(filename, error='Invalid file type. Use PDF or DOCX'))
+        elif accepted >= max_files:
+            files.append(BatchFile(filename, error=f'Batch limit of {max_files} resumes reached'))
+        elif size is not None and size > max_file_size:
+            files.append(BatchFile(filename, error='File too large'))
+        else:
+            session_id = new_session_id()
+            filepath = os.path.join(upload_folder, f"{session_id}_{name}")
+            try:
+                write(filepath)
+            except ValueError as e:
+                files.append(BatchFile(filename, error=str(e)))
+                return
+            files.append(BatchFile(filename, session_id=session_id, filepath=filepath))
+            accepted += 1
+
+    for upload in uploads:
+        if not upload.filename:
+            continue
+
+        if not upload.filename.lower().endswith('.zip'):
+            accept(upload.filename, upload.save)
+            continue
+
+        try:
+            archive = zipfile.ZipFile(upload.stream)
+        except zipfile.BadZipFile:
+            files.append(BatchFile(upload.filename, error='Not a valid zip archive'))
+            continue
+
+        with archive:
+            for member in archive.infolist():
+                if member.is_dir() or member.filename.startswith('__MACOSX/'):
+                    continue
+                accept(
+                    member.filename,
+                    lambda path, member=member: _extract(archive, member, path, max_file_size),
+                    member.file_size
+                )
+
+    return files
+
+
+def _extract(archive: zipfile.ZipFile, member: zipfile.ZipInfo, path: str, max_size: int):
+    """Copy one archive member to our own path (member names are never used as paths)"""
+    written = 0
+    with archive.open(member) as source, open(path, 'wb') as target:
+        while True:
+            chunk = source.read(64 * 1024)
+            if not chunk:
+                break
+            written += len(chunk)
+            # The size in the zip header can lie; stop decompressing past the limit
+            if written > max_size:
+                target.close()
+                os.remove(path)
+                raise ValueError('File too large')
+            target.write(chunk)
@@ -0,0 +1,90 @@
+"""
+Content-addressed resume storage and a cache of parse results
+
+A resume is identified by the SHA-256 of its bytes. Uploads of the same file
+share one copy in the upload folder, and its parsed resume and skill
+analysis are kept in a byte-bounded LRU, so a repeat upload skips text
+extraction and skill analysis entirely.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from modules import metrics
+
+LOOKUPS = metrics.Counter('skillmind_resume_cache_lookups_total', 'Resume cache lookups', ('result',))
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_by_content(path: str) -> Tuple[str, str]:
+    """
+    Move a saved upload to its content-addressed name next to it
+
+    Returns:
+        (sha256 digest, new path); an identical earlier upload is simply replaced
+    """
+    digest = file_digest(path)
+    extension = os.path.splitext(path)[1].lower()
+    content_path = os.path.join(os.path.dirname(path), f"{digest}{extension}")
+    os.replace(path, content_path)
+    return digest, content_path
+
+
+class ResumeCache:
+    """
+    digest -> {'resume_data', 'skill_analysis'}, evicting least recently used entries
+
+    Entries are stored as JSON bytes: the size bound is exact and every
+    hit returns a fresh copy that sessions can modify freely.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.RESUME_CACHE_MAX_BYTES
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[Dict]:
+        with self._lock:
+            data = self._entries.get(digest)
+            if data is not None:
+                self._entries.move_to_end(digest)
+
+        LOOKUPS.inc(result='hit' if data is not None else 'miss')
+        return json.loads(data) if data is not None else None
+
+    def put(self, digest: str, result: Dict):
+        data = json.dumps(result).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[digest] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Bytes held"""
+        return self._size
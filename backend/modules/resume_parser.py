@@ -1,7 +1,6 @@
-import PyPDF2
-import docx
 import re
 from typing import Dict, List, Optional
+from modules import startup, tracing
 
 class ResumeParser:
     """Parse resumes and extract relevant information"""
@@ -10,6 +9,7 @@ class ResumeParser:
         # Using regex-based extraction (spaCy optional)
         self.nlp = None
     
+    @tracing.traced('resume.parse')
     def parse_resume(self, file_path: str) -> Dict:
         """
         Parse resume and extract all information
@@ -39,6 +39,7 @@ class ResumeParser:
             'raw_text': text
         }
     
+    @tracing.traced('resume.extract_text')
     def _extract_text(self, file_path: str) -> str:
         """Extract text from PDF or DOCX file"""
         if file_path.endswith('.pdf'):
@@ -52,6 +53,7 @@ class ResumeParser:
         """Extract text from PDF"""
         text = ""
         try:
+            PyPDF2 = startup.import_module('PyPDF2')
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
@@ -64,6 +66,7 @@ class ResumeParser:
         """Extract text from DOCX"""
         text = ""
         try:
+            docx = startup.import_module('docx')
             doc = docx.Document(file_path)
             for paragraph in doc.paragraphs:
                 text += paragraph.text + "\n"
@@ -148,6 +151,7 @@ class ResumeParser:
         
         return education
     
+    @tracing.traced('resume.extract_skills')
     def _extract_skills(self, text: str) -> List[str]:
         """Extract technical skills"""
         # Comprehensive skill database
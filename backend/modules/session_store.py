@@ -0,0 +1,531 @@
+"""
+Session storage with a bounded in-memory hot tier and a SQLite cold tier
+
+Changes are snapshotted to SQLite in periodic batches (only sessions saved
+since the last snapshot, zlib-compressed), and the most recently active
+sessions are loaded back into memory when a worker restarts.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Iterable, Optional
+
+from config import Config
+from modules import metrics
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_LATENCY = metrics.Histogram(
+    'skillmind_session_snapshot_seconds', 'Time to write one batch of changed sessions')
+
+
+class _Shard:
+    """One slice of the hot tier with its own lock"""
+
+    def __init__(self):
+        # session_id -> [data, last_access, version]; ordered from least to most recently used
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Per-session locks live only while a request holds them
+        self.session_locks = weakref.WeakValueDictionary()
+        # Coroutines queue here, so only one per session waits for the thread lock
+        self.async_locks = weakref.WeakValueDictionary()
+
+
+class SessionStore:
+    """
+    Sharded, dict-like session store: recently used sessions in memory, the rest in SQLite
+
+    Objects registered through ``types`` are persisted with their ``to_dict()``
+    and restored with ``from_dict()``; other non-JSON values are dropped.
+    """
+
+    PURGE_INTERVAL = 60 * 60  # seconds between sweeps of expired cold sessions
+    SWEEP_INTERVAL = 60  # most seconds between sweeps of idle hot sessions
+    TYPE_TAG = '__session_type__'
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, db_path: str = None, capacity: int = None,
+                 idle_ttl: float = None, retention: float = None, shards: int = None,
+                 types: Iterable[type] = (), shared: bool = None, snapshot_interval: float = None):
+        """
+        Args:
+            db_path: SQLite database file for the cold tier
+            capacity: Maximum number of sessions kept in memory
+            idle_ttl: Seconds a session may sit unused before leaving memory
+            retention: Seconds a session is kept in SQLite after its last update
+            shards: Number of independently locked hot-tier shards
+            types: Classes implementing to_dict()/from_dict() that may be stored
+            shared: Revalidate in-memory copies against SQLite on every access,
+                so several worker processes can serve the same session
+            snapshot_interval: Seconds between batched writes of changed sessions;
+                0 writes every change immediately (always the case when shared)
+        """
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.capacity = capacity or Config.SESSION_HOT_CAPACITY
+        self.idle_ttl = idle_ttl if idle_ttl is not None else Config.SESSION_IDLE_TTL
+        self.retention = retention if retention is not None else Config.SESSION_RETENTION
+        self.shared = shared if shared is not None else Config.SESSION_SHARED_STORE
+        self._types = {cls.__name__: cls for cls in types}
+        interval = snapshot_interval if snapshot_interval is not None else Config.SESSION_SNAPSHOT_INTERVAL
+        # Other workers must see every write at once, so shared stores never defer them
+        self.snapshot_interval = 0 if self.shared else interval
+
+        self._shards = [_Shard() for _ in range(shards or Config.SESSION_SHARDS)]
+        self._shard_capacity = max(1, -(-self.capacity // len(self._shards)))
+
+        # SQLite connections cannot be shared across threads; WAL lets them read concurrently
+        self._local = threading.local()
+        self._init_schema()
+        self._purge_lock = threading.Lock()
+        self._last_purge = 0
+        self.purge_expired()
+
+        # Sessions changed since the last snapshot
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._maintenance_pid = None
+        # Threads that only ever wait for session locks; never shared with work
+        # that a lock holder may itself be queued behind
+        self._lock_waiters = None
+        self._lock_waiters_lock = threading.Lock()
+
+    @staticmethod
+    def new_session_id() -> str:
+        """Generate a collision-resistant session id (128 bits of entropy)"""
+        return secrets.token_hex(16)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the cold-tier database"""
+        conn = getattr(self._local, 'conn', None)
+        # A connection must not be used across fork (the main thread of a pre-forked worker)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'session_id TEXT PRIMARY KEY, '
+            'data TEXT NOT NULL, '
+            'updated_at REAL NOT NULL)'
+        )
+
+    def _shard(self, session_id) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _session_lock(self, session_id) -> threading.Lock:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session_lock = shard.session_locks.get(session_id)
+            if session_lock is None:
+                # A plain Lock (not RLock) so async holders may release it from another thread
+                session_lock = threading.Lock()
+                shard.session_locks[session_id] = session_lock
+        return session_lock
+
+    @contextmanager
+    def lock(self, session_id):
+        """
+        Serialize requests that touch the same session
+
+        Requests for different sessions never contend on this lock.
+        """
+        with self._session_lock(session_id):
+            yield
+
+    @asynccontextmanager
+    async def lock_async(self, session_id):
+        """
+        lock() for coroutines, without blocking the event loop
+
+        Coroutines for the same session queue on an asyncio.Lock; the one at
+        the head waits for the thread lock (held by a Flask route or the
+        snapshot) on a dedicated waiter thread. Waiting on asyncio's default
+        pool could deadlock: the holder's own work may be queued there.
+        """
+        async with self._async_lock(session_id):
+            session_lock = self._session_lock(session_id)
+            if not session_lock.acquire(blocking=False):
+                loop = asyncio.get_running_loop()
+                acquiring = loop.run_in_executor(self._lock_wait_executor(), session_lock.acquire)
+                try:
+                    await asyncio.shield(acquiring)
+                except asyncio.CancelledError:
+                    # The thread still gets the lock eventually; hand it straight back
+                    acquiring.add_done_callback(lambda _: session_lock.release())
+                    raise
+            try:
+                yield
+            finally:
+                session_lock.release()
+
+    def _async_lock(self, session_id) -> asyncio.Lock:
+        shard = self._shard(session_id)
+        with shard.lock:
+            async_lock = shard.async_locks.get(session_id)
+            if async_lock is None:
+                async_lock = asyncio.Lock()
+                shard.async_locks[session_id] = async_lock
+        return async_lock
+
+    def _lock_wait_executor(self) -> ThreadPoolExecutor:
+        # At most one waiter per contended session (see lock_async)
+        if self._lock_waiters is None:
+            with self._lock_waiters_lock:
+                if self._lock_waiters is None:
+                    self._lock_waiters = ThreadPoolExecutor(max_workers=32, thread_name_prefix='session-lock-wait')
+        return self._lock_waiters
+
+    # --- Mapping interface ---
+
+    def __contains__(self, session_id) -> bool:
+        return self.get(session_id) is not None
+
+    def __getitem__(self, session_id) -> Dict:
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __setitem__(self, session_id, data: Dict):
+        shard = self._shard(session_id)
+        with shard.lock:
+            entry = [data, time.time(), None]
+            shard.entries[session_id] = entry
+            shard.entries.move_to_end(session_id)
+        self._persist(session_id, entry)
+        self._evict(shard)
+
+    def __delitem__(self, session_id):
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.entries.pop(session_id, None)
+        with self._dirty_lock:
+            self._dirty.discard(session_id)
+        self._connection().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def __len__(self) -> int:
+        """Number of sessions currently held in memory"""
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def get(self, session_id, default=None) -> Optional[Dict]:
+        """Return a session, promoting it from SQLite into memory if needed"""
+        if not session_id:
+            return default
+
+        shard = self._shard(session_id)
+        with shard.lock:
+            entry = shard.entries.get(session_id)
+            if entry is not None and not self.shared:
+                entry[1] = time.time()
+                shard.entries.move_to_end(session_id)
+                return entry[0]
+
+        if entry is not None:
+            # Another worker process may have written a newer copy
+            version = self._read_version(session_id)
+            if version is None:
+                # Deleted or purged by another worker
+                with shard.lock:
+                    shard.entries.pop(session_id, None)
+                return default
+            if version == entry[2]:
+                with shard.lock:
+                    entry[1] = time.time()
+                    if session_id in shard.entries:
+                        shard.entries.move_to_end(session_id)
+                return entry[0]
+
+        loaded = self._read(session_id)
+        if loaded is None:
+            return default
+        data, version = loaded
+
+        with shard.lock:
+            current = shard.entries.get(session_id)
+            if current is not None and current[2] == version:
+                # Another thread promoted the same copy meanwhile
+                data = current[0]
+                current[1] = time.time()
+            else:
+                shard.entries[session_id] = [data, time.time(), version]
+            shard.entries.move_to_end(session_id)
+        self._evict(shard)
+        return data
+
+    def save(self, session_id):
+        """Persist the in-memory copy of a session after it was mutated"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            entry = shard.entries.get(session_id)
+        if entry is not None:
+            self._persist(session_id, entry)
+
+    def flush(self):
+        """Persist every in-memory session (used on shutdown)"""
+        with self._dirty_lock:
+            self._dirty.clear()
+        for shard in self._shards:
+            with shard.lock:
+                entries = list(shard.entries.items())
+            self._write_many(entries)
+
+    def snapshot(self) -> int:
+        """
+        Write every session changed since the last snapshot in one transaction
+
+        A session whose request is still running is left for the next
+        snapshot; that request will save it again anyway.
+
+        Returns:
+            Number of sessions written
+        """
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+
+        entries, busy = [], []
+        for session_id in dirty:
+            shard = self._shard(session_id)
+            with shard.lock:
+                entry = shard.entries.get(session_id)
+            if entry is None:
+                continue  # evicted (and written) or deleted meanwhile
+            session_lock = self._session_lock(session_id)
+            if not session_lock.acquire(blocking=False):
+                busy.append(session_id)
+                continue
+            try:
+                # Encode under the session lock so no request mutates it mid-way
+                payload = self._encode(session_id, entry[0])
+            finally:
+                session_lock.release()
+            if payload is not None:
+                entries.append((session_id, entry, payload))
+
+        if busy:
+            with self._dirty_lock:
+                self._dirty.update(busy)
+
+        with SNAPSHOT_LATENCY.time():
+            self._store(entries)
+        return len(entries)
+
+    def restore(self, limit: int = None) -> int:
+        """
+        Load the most recently active sessions into memory (warm restart)
+
+        Candidates who were mid-quiz or mid-interview when the worker
+        restarted are served from memory straight away instead of each
+        first request paying for a SQLite read.
+
+        Returns:
+            Number of sessions loaded
+        """
+        rows = self._connection().execute(
+            'SELECT session_id, data, updated_at FROM sessions WHERE updated_at >= ? '
+            'ORDER BY updated_at DESC LIMIT ?',
+            (time.time() - self.idle_ttl, limit or self.capacity)
+        ).fetchall()
+
+        loaded = 0
+        # Oldest first, so the most recent end up most recently used
+        for session_id, payload, updated_at in reversed(rows):
+            try:
+                data = self._decode(payload)
+            except (ValueError, zlib.error) as e:
+                logger.error(f"Could not restore session {session_id}: {e}")
+                continue
+            shard = self._shard(session_id)
+            with shard.lock:
+                if session_id in shard.entries or len(shard.entries) >= self._shard_capacity:
+                    continue
+                shard.entries[session_id] = [data, time.time(), updated_at]
+            loaded += 1
+
+        self._start_maintenance()
+        logger.info(f"Restored {loaded} active sessions into memory")
+        return loaded
+
+    def purge_expired(self):
+        """Delete sessions that have not been updated within the retention window"""
+        with self._purge_lock:
+            cutoff = time.time() - self.retention
+            self._connection().execute('DELETE FROM sessions WHERE updated_at < ?', (cutoff,))
+            self._last_purge = time.time()
+
+    def sweep_idle(self):
+        """Move sessions idle past the TTL out of memory, in every shard"""
+        for shard in self._shards:
+            self._evict(shard)
+
+    # --- Tier management ---
+
+    def _evict(self, shard: _Shard):
+        """Move idle and least recently used sessions of a shard out of memory"""
+        now = time.time()
+        spilled = []
+
+        with shard.lock:
+            overflow = len(shard.entries) - self._shard_capacity
+            # Entries are ordered by last access, so idle ones sit at the front
+            for session_id, (data, last_access, _) in list(shard.entries.items()):
+                if overflow <= 0 and now - last_access <= self.idle_ttl:
+                    break
+                if session_id in shard.session_locks:
+                    continue  # pinned by an in-flight request
+                spilled.append((session_id, shard.entries.pop(session_id)))
+                overflow -= 1
+
+        if spilled:
+            self._write_many(spilled)
+            logger.debug(f"{len(spilled)} sessions moved to cold storage")
+
+        if now - self._last_purge > self.PURGE_INTERVAL:
+            self.purge_expired()
+        self._start_maintenance()
+
+    def _persist(self, session_id, entry: list):
+        """Write a changed session now, or mark it for the next snapshot"""
+        self._start_maintenance()
+        if self.snapshot_interval <= 0:
+            self._write_many([(session_id, entry)])
+            return
+
+        with self._dirty_lock:
+            self._dirty.add(session_id)
+
+    def _start_maintenance(self):
+        # Started lazily so a worker forked from a preloaded app gets its own thread
+        if self._maintenance_pid == os.getpid():
+            return
+        with self._dirty_lock:
+            if self._maintenance_pid != os.getpid():
+                self._maintenance_pid = os.getpid()
+                threading.Thread(target=self._maintenance_loop, name='session-maintenance', daemon=True).start()
+
+    def _maintenance_loop(self):
+        """Snapshot changed sessions and sweep idle ones out of every shard, on a timer"""
+        interval = self.snapshot_interval or max(min(self.SWEEP_INTERVAL, self.idle_ttl), 0.05)
+        while True:
+            time.sleep(interval)
+            try:
+                if self.snapshot_interval > 0:
+                    self.snapshot()
+                self.sweep_idle()
+            except Exception as e:
+                logger.error(f"Session maintenance failed: {e}", exc_info=True)
+
+    def _write_many(self, entries: list):
+        """Encode and store (session_id, entry) pairs"""
+        encoded = []
+        for session_id, entry in entries:
+            payload = self._encode(session_id, entry[0])
+            if payload is not None:
+                encoded.append((session_id, entry, payload))
+        self._store(encoded)
+
+    def _store(self, encoded: list):
+        """
+        Upsert (session_id, entry, payload) rows in one transaction
+
+        Each row carries the time it was encoded; an older snapshot never
+        replaces a newer row (e.g. one written when the session was evicted).
+        """
+        if not encoded:
+            return
+
+        rows = [(session_id, payload, version) for session_id, _, (payload, version) in encoded]
+        connection = self._connection()
+        connection.execute('BEGIN')
+        try:
+            connection.executemany(
+                'INSERT INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at '
+                'WHERE excluded.updated_at >= sessions.updated_at',
+                rows
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+        for _, entry, (_, version) in encoded:
+            entry[2] = version
+
+    def _encode(self, session_id, data: Dict) -> Optional[tuple]:
+        """(compressed JSON, version) for a session, or None if it cannot be serialized"""
+        try:
+            version = time.time()
+            payload = json.dumps(data, default=self._encode_object, separators=(',', ':'))
+        except (TypeError, ValueError, RuntimeError) as e:
+            logger.error(f"Could not serialize session {session_id}: {e}")
+            return None
+        return zlib.compress(payload.encode('utf-8'), self.COMPRESS_LEVEL), version
+
+    def _decode(self, payload) -> Dict:
+        # Rows written before snapshots were compressed hold plain JSON text
+        if isinstance(payload, bytes):
+            payload = zlib.decompress(payload)
+        return json.loads(payload, object_hook=self._decode_object)
+
+    def _read(self, session_id) -> Optional[tuple]:
+        """Load a session from SQLite as (data, version)"""
+        row = self._connection().execute(
+            'SELECT data, updated_at FROM sessions WHERE session_id = ?',
+            (session_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        payload, updated_at = row
+        if time.time() - updated_at > self.retention:
+            self._connection().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+            return None
+
+        return self._decode(payload), updated_at
+
+    def _read_version(self, session_id) -> Optional[float]:
+        row = self._connection().execute(
+            'SELECT updated_at FROM sessions WHERE session_id = ?',
+            (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _encode_object(self, value):
+        """Serialize registered helper objects; live clients and the like are dropped"""
+        cls = type(value)
+        if self._types.get(cls.__name__) is cls:
+            return {self.TYPE_TAG: cls.__name__, 'state': value.to_dict()}
+        return None
+
+    def _decode_object(self, obj: Dict):
+        type_name = obj.get(self.TYPE_TAG)
+        if type_name is None:
+            return obj
+
+        cls = self._types.get(type_name)
+        if cls is None:
+            logger.warning(f"Unknown session object type '{type_name}' dropped")
+            return None
+        return cls.from_dict(obj['state'])
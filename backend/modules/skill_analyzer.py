@@ -1,5 +1,6 @@
 from typing import Dict, List
 import re
+from modules import tracing
 
 class SkillAnalyzer:
     """Analyze and classify skills from resume"""
@@ -45,6 +46,7 @@ class SkillAnalyzer:
             'advanced': ['advanced', 'expert', 'mastery', 'extensive', 'senior', 'lead']
         }
     
+    @tracing.traced('skills.analyze')
     def analyze_skills(self, skills: List[str], resume_text: str = "") -> Dict:
         """
         Analyze skills and classify them by category and proficiency
@@ -84,6 +86,7 @@ class SkillAnalyzer:
         # Remove empty categories
         return {k: v for k, v in categorized.items() if v}
     
+    @tracing.traced('skills.assess_proficiency')
     def _assess_proficiency(self, skills: List[str], resume_text: str) -> List[Dict]:
         """
         Assess proficiency level for each skill
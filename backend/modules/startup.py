@@ -0,0 +1,147 @@
+"""
+Startup-time accounting and on-first-use construction of heavy modules
+"""
+
+import gc
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Measured from the first import of this module, which app.py does before anything else
+_process_start = time.perf_counter()
+_ready_at = None
+_timings = []  # [{'name', 'phase', 'seconds', 'at'}] in the order they happened
+_timings_lock = threading.Lock()
+_lazy_instances = []
+_preload_modules = []
+
+
+@contextmanager
+def timed(name: str, phase: str):
+    """Record how long a block took (phase is 'import' or 'init')"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _timings_lock:
+            _timings.append({
+                'name': name,
+                'phase': phase,
+                'seconds': round(end - start, 4),
+                'at': round(start - _process_start, 4)
+            })
+
+
+def import_module(name: str):
+    """Import a module, recording the cost of the first import"""
+    module = sys.modules.get(name)
+    # A module another thread is still importing is in sys.modules half-built;
+    # importlib waits for that import to finish
+    if module is not None and not getattr(getattr(module, '__spec__', None), '_initializing', False):
+        return module
+    with timed(name, 'import'):
+        return importlib.import_module(name)
+
+
+class LazyInstance:
+    """
+    Stand-in for a module-level singleton that is built on first attribute access
+
+    ``target`` is 'package.module:ClassName'; neither the module nor the
+    instance is loaded until a request actually needs it.
+    """
+
+    def __init__(self, target: str, *args, **kwargs):
+        self._target = target
+        self._args = args
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+        _lazy_instances.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self):
+        """Return the real object, building it if needed"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module_name, class_name = self._target.split(':')
+                    cls = getattr(import_module(module_name), class_name)
+                    with timed(self._target, 'init'):
+                        self._instance = cls(*self._args, **self._kwargs)
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<LazyInstance {self._target} ({state})>'
+
+
+def lazy(target: str, *args, **kwargs) -> LazyInstance:
+    """Declare a lazily constructed module-level instance"""
+    return LazyInstance(target, *args, **kwargs)
+
+
+def preload_module(name: str):
+    """Declare a module that is imported on first use but belongs in preload()"""
+    if name not in _preload_modules:
+        _preload_modules.append(name)
+
+
+def preload():
+    """Build every lazy instance now (for workers that should pay the cost up front)"""
+    for instance in list(_lazy_instances):
+        instance.get()
+    # Instances may have declared data modules (question banks) while being built
+    for name in list(_preload_modules):
+        import_module(name)
+
+
+def freeze():
+    """
+    Exempt every object allocated so far from garbage collection
+
+    Called in a pre-fork master after preload(). Collections in the workers
+    would otherwise write to the GC headers of the inherited question banks,
+    templates and generators, turning pages shared copy-on-write into a
+    private copy per worker.
+    """
+    gc.freeze()
+
+
+def mark_ready():
+    """Record that the application finished starting up"""
+    global _ready_at
+    if _ready_at is None:
+        _ready_at = time.perf_counter()
+
+
+def report() -> Dict:
+    """
+    Summarize startup cost
+
+    Returns:
+        Seconds until ready, per-module import/init timings (slowest first)
+        and the lazy modules that have not been needed yet
+    """
+    with _timings_lock:
+        timings: List[Dict] = sorted(_timings, key=lambda t: t['seconds'], reverse=True)
+
+    return {
+        'ready_after_seconds': round(_ready_at - _process_start, 4) if _ready_at else None,
+        'uptime_seconds': round(time.perf_counter() - _process_start, 4),
+        'timings': timings,
+        'not_loaded': [i._target for i in _lazy_instances if not i.loaded],
+        'gc_frozen_objects': gc.get_freeze_count()
+    }
@@ -0,0 +1,137 @@
+"""
+Frontend asset serving with content hashes, precompression and cache validators
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from modules import compression
+
+# Local css/js references in index.html that get a ?v=<content hash> suffix
+_ASSET_REF = re.compile(r'((?:href|src)=")((?:css|js)/[^"?#]+)(")')
+
+LONG_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+class _Asset:
+    """One file with its content hash and precompressed variants"""
+
+    def __init__(self, data: bytes, mtime: float, dependencies: Dict[str, str] = None):
+        self.data = data
+        self.mtime = mtime
+        self.hash = hashlib.sha256(data).hexdigest()[:16]
+        self.mimetype = None
+        # path -> hash of each asset referenced by this one (index.html only)
+        self.dependencies = dependencies or {}
+        self.encoded = {}
+
+    def precompress(self):
+        if self.mimetype in compression.COMPRESSIBLE_MIMETYPES:
+            for encoding in compression.available_encodings():
+                self.encoded[encoding] = compression.compress(self.data, encoding)
+
+
+class StaticAssets:
+    """
+    Serve a directory of frontend files
+
+    index.html is rewritten so every local css/js reference carries a
+    content-hash query string. Versioned URLs are cached for a year; anything
+    else must be revalidated, which costs only a 304 while it is unchanged.
+    Files are compressed once when loaded, not per request.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._assets: Dict[str, _Asset] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, path: str) -> Optional[_Asset]:
+        full_path = os.path.abspath(os.path.join(self.root, path))
+        if not full_path.startswith(self.root + os.sep) or not os.path.isfile(full_path):
+            return None
+
+        mtime = os.path.getmtime(full_path)
+        asset = self._assets.get(path)
+        if asset is not None and asset.mtime == mtime and not self._is_stale(asset):
+            return asset
+
+        with open(full_path, 'rb') as f:
+            data = f.read()
+
+        dependencies = {}
+        if path == 'index.html':
+            data = self._version_references(data.decode('utf-8'), dependencies).encode('utf-8')
+
+        asset = _Asset(data, mtime, dependencies)
+        asset.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        asset.precompress()
+        with self._lock:
+            self._assets[path] = asset
+        return asset
+
+    def _version_references(self, html: str, dependencies: Dict[str, str]) -> str:
+        def add_version(match):
+            asset = self._load(match.group(2))
+            if asset is None:
+                return match.group(0)
+            dependencies[match.group(2)] = asset.hash
+            return f'{match.group(1)}{match.group(2)}?v={asset.hash}{match.group(3)}'
+
+        return _ASSET_REF.sub(add_version, html)
+
+    def _is_stale(self, asset: _Asset) -> bool:
+        """True if a file referenced by this asset changed since it was rendered"""
+        for path, version in asset.dependencies.items():
+            dependency = self._load(path)
+            if dependency is None or dependency.hash != version:
+                return True
+        return False
+
+    def url_for(self, path: str) -> str:
+        """Versioned URL for an asset (unchanged if the file does not exist)"""
+        asset = self._load(path)
+        return f'{path}?v={asset.hash}' if asset else path
+
+    def warm(self):
+        """Hash and compress every file up front"""
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                self._load(os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, '/'))
+
+    def serve(self, path: str):
+        """Build the response for a frontend file, or 404"""
+        from flask import abort, request, current_app
+
+        asset = self._load(path)
+        if asset is None:
+            abort(404)
+
+        encoding = None
+        if asset.encoded:
+            encoding = compression.negotiate_encoding(
+                request.headers.get('Accept-Encoding', ''), list(asset.encoded)
+            )
+
+        response = current_app.response_class(
+            asset.encoded[encoding] if encoding else asset.data,
+            mimetype=asset.mimetype
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if asset.encoded:
+            response.vary.add('Accept-Encoding')
+        # Each encoding is a different representation, so it gets its own ETag
+        response.set_etag(f'{asset.hash}-{encoding}' if encoding else asset.hash)
+        response.last_modified = datetime.fromtimestamp(int(asset.mtime), tz=timezone.utc)
+
+        versioned = request.args.get('v') == asset.hash
+        response.headers['Cache-Control'] = LONG_CACHE if versioned else REVALIDATE
+
+        return response.make_conditional(request)
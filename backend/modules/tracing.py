@@ -0,0 +1,247 @@
+"""
+Lightweight tracing of the candidate pipeline in the Chrome trace event format
+
+Spans nest through contextvars, so they follow a request across function
+calls and awaits; thread pools (wrap()) and background jobs
+(current_context()/resume()) carry the trace along explicitly. When the
+outermost span of a trace ends, the whole trace is appended to
+Config.TRACE_FILE. Open that file in https://ui.perfetto.dev or
+chrome://tracing for a flame chart per request.
+
+Tracing is off unless TRACING_ENABLED=True; disabled spans cost one check.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+# Spans recorded per trace at most; a runaway loop must not exhaust memory
+MAX_SPANS_PER_TRACE = 10000
+
+enabled = Config.TRACING_ENABLED
+trace_file = Config.TRACE_FILE
+slow_threshold_ms = Config.TRACE_SLOW_THRESHOLD_MS
+
+_current: contextvars.ContextVar = contextvars.ContextVar('trace_span', default=None)
+_lanes = itertools.count(1)
+_write_lock = threading.Lock()
+_fd = None
+_fd_pid = None
+
+
+class Span:
+    """One timed stage; the root span of a trace also collects its finished descendants"""
+
+    __slots__ = ('name', 'attrs', 'parent', 'root', 'trace_id', 'session_id', 'lane', 'executor',
+                 'start_us', '_start', 'finished')
+
+    def __init__(self, name: str, attrs: Dict, parent: Optional['Span'] = None,
+                 trace_id: str = None, session_id: str = None):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.root = parent.root if parent else self
+        self.trace_id = parent.trace_id if parent else (trace_id or uuid.uuid4().hex)
+        self.session_id = parent.session_id if parent else session_id
+        # Concurrent work (another thread or asyncio task) gets its own row in the viewer
+        self.executor = _executor_id()
+        if parent is not None and parent.executor == self.executor:
+            self.lane = parent.lane
+        else:
+            self.lane = next(_lanes)
+        self.finished: List[tuple] = [] if parent is None else None
+        self.start_us = time.time_ns() // 1000
+        self._start = time.perf_counter()
+
+    def set_session(self, session_id: str):
+        self.root.session_id = session_id
+
+    def _finish(self):
+        duration_us = int((time.perf_counter() - self._start) * 1_000_000)
+        if len(self.root.finished) < MAX_SPANS_PER_TRACE:
+            self.root.finished.append((self.name, self.start_us, duration_us, self.lane, self.attrs))
+        if self.parent is None and duration_us >= slow_threshold_ms * 1000:
+            _write_trace(self)
+
+
+def _executor_id() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+@contextmanager
+def _span(name: str, attrs: Dict, trace_id: str = None, session_id: str = None, new_trace: bool = False):
+    parent = None if new_trace else _current.get()
+    span = Span(name, attrs, parent, trace_id, session_id)
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+        span._finish()
+
+
+def span(name: str, **attrs):
+    """
+    Time the enclosed block as a span named `name`
+
+    A span opened outside any other span starts a new trace. Keyword
+    arguments become the span's args in the viewer; session_id is taken
+    from the enclosing trace.
+    """
+    if not enabled:
+        return nullcontext()
+    return _span(name, attrs)
+
+
+def traced(name: str = None):
+    """Decorator form of span() for sync and async functions"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def start_trace(name: str, session_id: str = None, **attrs):
+    """Span that always starts a new trace (one per request)"""
+    if not enabled:
+        return nullcontext()
+    return _span(name, attrs, session_id=session_id, new_trace=True)
+
+
+def set_session(session_id: str):
+    """Tag the current trace with a session created partway through it"""
+    current = _current.get()
+    if current is not None:
+        current.set_session(session_id)
+
+
+def current_context() -> Optional[Dict]:
+    """Trace ids to hand to another process; pass them to resume() there"""
+    current = _current.get()
+    if current is None:
+        return None
+    return {'trace_id': current.trace_id, 'session_id': current.session_id}
+
+
+def resume(context: Optional[Dict], name: str, **attrs):
+    """Continue a trace started in another process (spans are written from here)"""
+    if not enabled:
+        return nullcontext()
+    context = context or {}
+    return _span(name, attrs, trace_id=context.get('trace_id'), session_id=context.get('session_id'),
+                 new_trace=True)
+
+
+def wrap(fn: Callable) -> Callable:
+    """Bind fn to the current trace so spans it opens in a pool thread nest under it"""
+    if not enabled:
+        return fn
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def _write_trace(root: Span):
+    pid = os.getpid()
+    common = {'trace_id': root.trace_id}
+    if root.session_id:
+        common['session_id'] = root.session_id
+
+    lines = []
+    for name, start_us, duration_us, lane, attrs in root.finished:
+        event = {
+            'name': name, 'cat': 'skillmind', 'ph': 'X', 'ts': start_us, 'dur': duration_us,
+            'pid': pid, 'tid': lane, 'args': dict(common, **attrs) if attrs else common
+        }
+        lines.append(json.dumps(event, default=str) + ',\n')
+    _append(''.join(lines).encode('utf-8'))
+
+
+def _append(data: bytes):
+    """
+    Append events to the trace file
+
+    The file is a JSON array that is never closed, which trace viewers
+    accept; every batch is a single O_APPEND write so worker processes can
+    share one file.
+    """
+    global _fd, _fd_pid
+    with _write_lock:
+        if _fd is None or _fd_pid != os.getpid():
+            directory = os.path.dirname(trace_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            _fd = os.open(trace_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            _fd_pid = os.getpid()
+        if os.fstat(_fd).st_size == 0:
+            data = b'[\n' + data
+        os.write(_fd, data)
+
+
+def configure(enable: bool = None, path: str = None, slow_ms: int = None):
+    """Change tracing settings at runtime (tests, debugging sessions)"""
+    global enabled, trace_file, slow_threshold_ms, _fd
+    with _write_lock:
+        if path is not None and path != trace_file:
+            if _fd is not None:
+                os.close(_fd)
+                _fd = None
+            trace_file = path
+    if enable is not None:
+        enabled = enable
+    if slow_ms is not None:
+        slow_threshold_ms = slow_ms
+
+
+def init_app(app):
+    """One trace per Flask request, tagged with the request's session id"""
+    from flask import g, request
+
+    @app.before_request
+    def begin_request_trace():
+        if not enabled:
+            return
+        session_id = request.args.get('session_id') or request.headers.get('X-Session-Id')
+        if session_id is None and request.is_json:
+            session_id = (request.get_json(silent=True) or {}).get('session_id')
+        route = request.url_rule.rule if request.url_rule else request.path
+        g.trace = start_trace(f'{request.method} {route}', session_id=session_id)
+        g.trace.__enter__()
+
+    @app.teardown_request
+    def end_request_trace(error):
+        # Teardown runs after a streamed body is fully sent, so SSE work is included
+        trace = g.pop('trace', None)
+        if trace is not None:
+            trace.__exit__(None, None, None)
@@ -0,0 +1,100 @@
+"""
+Test admission control for high-frequency telemetry routes
+"""
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify, request
+
+from modules import admission
+
+LIMITS = {'telemetry': {'session_rate': 0.001, 'session_burst': 3, 'global_rate': 1000.0, 'concurrency': 2}}
+ROUTES = {'/emotion': 'telemetry'}
+
+
+def test_session_bucket_sheds_before_parsing():
+    """A session's burst is admitted, the rest get a bodyless 429; other routes are untouched"""
+    app = Flask(__name__)
+    admission.init_app(app, admission.AdmissionController(ROUTES, LIMITS))
+    parsed = []
+
+    @app.route('/emotion', methods=['POST'])
+    def emotion():
+        parsed.append(request.json)
+        return jsonify({'success': True})
+
+    @app.route('/submit-code', methods=['POST'])
+    def submit_code():
+        return jsonify({'success': True})
+
+    client = app.test_client()
+    headers = {'X-Session-Id': 'candidate-1'}
+    statuses = [client.post('/emotion', json={'n': i}, headers=headers).status_code for i in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+    assert len(parsed) == 3
+
+    rejected = client.post('/emotion', json={}, headers=headers)
+    assert int(rejected.headers['Retry-After']) >= 1
+    assert rejected.data == b''
+
+    # Another candidate has its own bucket; critical routes are never throttled
+    assert client.post('/emotion', json={}, headers={'X-Session-Id': 'candidate-2'}).status_code == 200
+    assert all(client.post('/submit-code', json={}, headers=headers).status_code == 200 for _ in range(10))
+
+
+def test_concurrency_reserves_threads():
+    """Telemetry beyond the class concurrency is rejected while earlier requests still run"""
+    controller = admission.AdmissionController(ROUTES, LIMITS)
+    app = Flask(__name__)
+    admission.init_app(app, controller)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    @app.route('/emotion', methods=['POST'])
+    def emotion():
+        started.release()
+        release.wait(5)
+        return jsonify({'success': True})
+
+    results = []
+
+    def post(session):
+        response = app.test_client().post('/emotion', json={}, headers={'X-Session-Id': session})
+        results.append(response.status_code)
+
+    workers = [threading.Thread(target=post, args=(f's{i}',)) for i in range(2)]
+    for worker in workers:
+        worker.start()
+    started.acquire(timeout=5)
+    started.acquire(timeout=5)
+
+    assert app.test_client().post('/emotion', json={}, headers={'X-Session-Id': 's9'}).status_code == 429
+
+    release.set()
+    for worker in workers:
+        worker.join()
+    assert results == [200, 200]
+    assert controller.acquire('/emotion', 's9') is None
+
+
+def test_cross_origin_telemetry_may_send_the_session_header():
+    """The CORS preflight for a telemetry post allows X-Session-Id"""
+    from app import app
+
+    response = app.test_client().options('/api/analyze-emotion', headers={
+        'Origin': 'http://localhost:5000',
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'content-type, x-session-id'
+    })
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:5000'
+    assert 'x-session-id' in response.headers['Access-Control-Allow-Headers'].lower()
+
+
+if __name__ == "__main__":
+    test_session_bucket_sheds_before_parsing()
+    test_concurrency_reserves_threads()
+    test_cross_origin_telemetry_may_send_the_session_header()
+    print("\n✅ Admission control tests passed")
@@ -0,0 +1,92 @@
+"""
+Test incremental MCQ answer autosave and the running tally
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.answer_sheet import MCQAnswerSheet
+from modules.skill_analyzer import SkillAnalyzer
+
+QUESTIONS = [
+    {'question': 'Q1', 'correct_answer': 'A', 'skill': 'Python'},
+    {'question': 'Q2', 'correct_answer': 'B', 'skill': 'Python'},
+    {'question': 'Q3', 'correct_answer': 'C', 'skill': 'SQL'},
+]
+
+
+def test_sheet_tracks_changed_answers():
+    """Changing or clearing an answer keeps the overall and per-skill counts exact"""
+    sheet = MCQAnswerSheet(QUESTIONS)
+    assert sheet.record(0, 'A') is True
+    sheet.record(2, 'C')
+    sheet.record(0, 'D')  # changed to a wrong answer
+    sheet.record(1, 'B')
+    sheet.record(1, None)  # cleared
+
+    assert (sheet.correct_answers, sheet.answered) == (1, 2)
+    assert sheet.skill_counts == {'Python': {'correct': 0, 'total': 2}, 'SQL': {'correct': 1, 'total': 1}}
+
+    restored = MCQAnswerSheet.from_dict(sheet.to_dict())
+    assert restored.to_dict() == sheet.to_dict()
+
+
+def test_autosaved_answers_are_graded_on_submit():
+    """Answers saved one by one are what submit-quiz grades; string indexes from JSON count"""
+    from app import app, sessions, evaluator
+
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'skill_analysis': SkillAnalyzer().analyze_skills(['Python', 'SQL'], 'Python SQL developer'),
+        'upload_job': {'status': 'done'}
+    }
+    client = app.test_client()
+
+    try:
+        questions = client.post('/api/generate-quiz', json={'session_id': session_id}).json['quiz']['mcq_questions']
+        for i, question in enumerate(questions[:-1]):
+            response = client.patch('/api/quiz-answers', json={
+                'session_id': session_id, 'answers': {str(i): question['correct_answer']}
+            })
+            assert response.status_code == 200
+        assert response.json['answered'] == len(questions) - 1
+
+        bad = client.patch('/api/quiz-answers', json={'session_id': session_id, 'answers': {'999': 'A'}})
+        assert bad.status_code == 400
+
+        # A batch with one bad index records none of its answers
+        partly_bad = client.post('/api/submit-quiz', json={
+            'session_id': session_id, 'answers': {'0': 'wrong', 'x': 'A'}
+        })
+        assert partly_bad.status_code == 400
+        assert sessions[session_id]['mcq_answer_sheet'].detailed_results[0]['is_correct']
+
+        # The last answer arrives with the submission
+        last = str(len(questions) - 1)
+        submitted = client.post('/api/submit-quiz', json={
+            'session_id': session_id, 'answers': {last: questions[-1]['correct_answer']}
+        })
+        results = submitted.json['results']
+        print(f"Score: {results['score']} ({results['correct_answers']}/{results['total_questions']})")
+        assert results['correct_answers'] == results['total_questions'] == len(questions)
+        assert sum(s['total'] for s in results['skill_scores'].values()) == len(questions)
+
+        # Same result as grading all answers at once
+        all_answers = {str(i): q['correct_answer'] for i, q in enumerate(questions)}
+        assert evaluator.evaluate_mcq_quiz(questions, all_answers)['score'] == results['score'] == 100.0
+
+        late = client.patch('/api/quiz-answers', json={'session_id': session_id, 'answers': {'0': 'A'}})
+        assert late.status_code == 409
+
+        resubmitted = client.post('/api/submit-quiz', json={'session_id': session_id, 'answers': {'0': 'wrong'}})
+        assert resubmitted.status_code == 409
+        assert sessions[session_id]['mcq_results']['score'] == 100.0
+    finally:
+        del sessions[session_id]
+
+
+if __name__ == "__main__":
+    test_sheet_tracks_changed_answers()
+    test_autosaved_answers_are_graded_on_submit()
+    print("\n✅ Answer autosave tests passed")
@@ -0,0 +1,280 @@
+"""
+Test the async serving mode: concurrent Judge0 runs and the ASGI routing
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from config import Config
+from modules.evaluator import Evaluator
+from modules import judge0_client
+
+
+class _SlowJudge0Handler(BaseHTTPRequestHandler):
+    """Echoes stdin back as stdout after a fixed delay, like a busy Judge0"""
+    delay = 0.3
+
+    def do_POST(self):
+        submission = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.delay)
+        body = json.dumps({
+            'stdout': submission['stdin'],
+            'status': {'id': 3, 'description': 'Accepted'},
+            'time': '0.01'
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_judge0_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _SlowJudge0Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _evaluate_async(code, language, test_cases):
+    try:
+        return await Evaluator().evaluate_code_async(code, language, test_cases)
+    finally:
+        # The shared client belongs to this event loop
+        await judge0_client.close_async_http()
+
+
+def test_judge0_test_cases_run_concurrently():
+    """Five slow Judge0 submissions finish in about the time of one"""
+    server = _start_judge0_stub()
+    original_url = Config.JUDGE0_API_URL
+    Config.JUDGE0_API_URL = f'http://127.0.0.1:{server.server_port}'
+    try:
+        test_cases = [{'input': str(i), 'expected_output': str(i)} for i in range(5)]
+
+        start = time.time()
+        result = asyncio.run(_evaluate_async('echo', 'javascript', test_cases))
+        elapsed = time.time() - start
+
+        print(f"5 Judge0 test cases took {elapsed:.2f}s")
+        assert result['success']
+        assert result['passed_tests'] == 5
+        assert [r['test_case'] for r in result['test_results']] == [1, 2, 3, 4, 5]
+        assert elapsed < 5 * _SlowJudge0Handler.delay
+    finally:
+        Config.JUDGE0_API_URL = original_url
+        server.shutdown()
+
+
+@contextmanager
+def _temp_sessions():
+    """Serve both modes from a session store in a temporary directory"""
+    import app as flask_module
+    import asgi
+    from modules.session_store import SessionStore
+
+    original = flask_module.sessions
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(db_path=os.path.join(tmp, 'sessions.db'), types=original._types.values())
+        flask_module.sessions = asgi.sessions = store
+        try:
+            yield store
+        finally:
+            flask_module.sessions = asgi.sessions = original
+
+
+def _quiz_session(sessions):
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'quiz': {
+            'coding_challenges': [{
+                'test_cases': [{'input': '2 3', 'expected_output': '5'}]
+            }]
+        }
+    }
+    return session_id
+
+
+def test_asgi_routes_native_and_wsgi():
+    """Async routes are served natively, everything else by the Flask app"""
+    from asgi import app
+
+    async def run(session_id):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            health = await client.get('/api/health')
+            submitted = await client.post('/api/submit-code', json={
+                'session_id': session_id,
+                'language': 'python',
+                'code': 'a, b = map(int, input().split())\nprint(a + b)'
+            })
+            invalid = await client.post('/api/interview-response', json={'session_id': 'missing'})
+            # The session has no parsed resume yet
+            not_ready = await client.post('/api/start-interview', json={'session_id': session_id})
+            bad_indexes = [
+                await client.post('/api/submit-code', json={
+                    'session_id': session_id, 'language': 'python', 'code': 'print(5)', 'challenge_index': index
+                })
+                for index in (1, -1, 'x')
+            ]
+            too_large = await client.post('/api/submit-code', json={
+                'session_id': session_id, 'language': 'python', 'code': 'x' * Config.MAX_CONTENT_LENGTH
+            })
+        return health, submitted, invalid, not_ready, bad_indexes, too_large
+
+    with _temp_sessions() as sessions:
+        session_id = _quiz_session(sessions)
+        health, submitted, invalid, not_ready, bad_indexes, too_large = asyncio.run(run(session_id))
+
+        assert health.status_code == 200
+        assert submitted.status_code == 200
+        assert submitted.json()['result']['passed_tests'] == 1
+        assert invalid.status_code == 400
+        assert not_ready.status_code == 409
+        assert [r.status_code for r in bad_indexes] == [400, 400, 400]
+        assert too_large.status_code == 413
+        assert len(sessions[session_id]['coding_results']) == 1
+
+
+def test_native_routes_answer_cors_like_flask():
+    """Only allowed origins are echoed back, by native and Flask routes alike"""
+    from asgi import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return [
+                [
+                    (await client.post(path, json={'session_id': 'missing'}, headers={'Origin': origin})).headers
+                    for path in ('/api/interview-response', '/api/submit-quiz')
+                ]
+                for origin in ('http://localhost:5000', 'https://evil.example')
+            ]
+
+    (native, flask), (native_other, flask_other) = asyncio.run(run())
+    for headers in (native, flask):
+        assert headers['access-control-allow-origin'] == 'http://localhost:5000'
+        assert headers['access-control-allow-credentials'] == 'true'
+    for headers in (native_other, flask_other):
+        assert 'access-control-allow-origin' not in headers
+
+
+def test_ai_quiz_generation_is_native_and_concurrent():
+    """generate-quiz with source=ai awaits the LLM for every skill at once"""
+    from asgi import app, question_generator
+    from modules.skill_analyzer import SkillAnalyzer
+
+    generator = question_generator.get()
+
+    async def mcqs(skill, proficiency, num_questions=5):
+        await asyncio.sleep(0.3)
+        return [{'question': f'{skill} question', 'options': ['A', 'B'], 'correct_answer': 'A'}]
+
+    async def challenge(skill, proficiency, avoid_topics=None, years_of_experience=1):
+        await asyncio.sleep(0.1)
+        return {'title': f'{skill} challenge {len(avoid_topics)}', 'test_cases': []}
+
+    async def run(session_id):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=30) as client:
+            start = time.time()
+            generated = await client.post('/api/generate-quiz', json={'session_id': session_id, 'source': 'ai'})
+            elapsed = time.time() - start
+            bank = await client.post('/api/generate-quiz', json={'session_id': session_id})
+        return generated, elapsed, bank
+
+    generator.generate_mcq_questions_async = mcqs
+    generator.generate_coding_challenge_async = challenge
+    try:
+        with _temp_sessions() as sessions:
+            session_id = sessions.new_session_id()
+            sessions[session_id] = {
+                'skill_analysis': SkillAnalyzer().analyze_skills(['Python', 'Java', 'Go'], 'Python Java Go developer'),
+                'upload_job': {'status': 'done'}
+            }
+            generated, elapsed, bank = asyncio.run(run(session_id))
+            stored = sessions[session_id]['quiz']
+
+            print(f"AI quiz for 3 skills took {elapsed:.2f}s")
+            assert generated.status_code == 200
+            quiz = generated.json()['quiz']
+            assert quiz['total_mcqs'] == 3 and quiz['total_coding'] == 3 * Config.CODING_CHALLENGES_PER_SKILL
+            assert all('id' in question for question in quiz['mcq_questions'])
+            # Skills overlap: one skill's LLM calls alone take 0.3s + 0.1s per challenge
+            assert elapsed < 3 * (0.3 + 0.1 * Config.CODING_CHALLENGES_PER_SKILL)
+
+            assert bank.status_code == 200
+            assert bank.json()['quiz']['total_mcqs'] == stored['total_mcqs'] > 0
+            assert sessions[session_id]['mcq_answer_sheet'].total_questions == stored['total_mcqs']
+    finally:
+        del generator.generate_mcq_questions_async
+        del generator.generate_coding_challenge_async
+
+
+def test_same_session_requests_do_not_starve_the_thread_pool():
+    """More same-session submissions than pool threads all finish"""
+    from asgi import app
+
+    async def run(session_id):
+        # Waiting for the session lock must not take the threads the holder evaluates on
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=30) as client:
+            requests = [
+                client.post('/api/submit-code', json={
+                    'session_id': session_id, 'language': 'python', 'is_preview': True,
+                    'code': f'a, b = map(int, input().split())\nprint(a + b)  # {i}'
+                })
+                for i in range(9)
+            ]
+            return await asyncio.wait_for(asyncio.gather(*requests), timeout=30)
+
+    with _temp_sessions() as sessions:
+        responses = asyncio.run(run(_quiz_session(sessions)))
+        assert [r.status_code for r in responses] == [200] * 9
+
+
+def test_wsgi_routes_run_concurrently():
+    """Flask routes under ASGI are not serialized on one thread"""
+    from asgi import WsgiAdapter
+
+    def slow_app(environ, start_response):
+        time.sleep(0.5)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [environ['PATH_INFO'].encode()]
+
+    async def run():
+        transport = httpx.ASGITransport(app=WsgiAdapter(slow_app, threads=4))
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await asyncio.gather(*(client.get(f'/{i}') for i in range(4)))
+
+    start = time.time()
+    responses = asyncio.run(run())
+    elapsed = time.time() - start
+
+    print(f"4 concurrent 0.5s WSGI requests took {elapsed:.2f}s")
+    assert [r.text for r in responses] == ['/0', '/1', '/2', '/3']
+    assert elapsed < 1.5
+
+
+if __name__ == "__main__":
+    test_judge0_test_cases_run_concurrently()
+    test_asgi_routes_native_and_wsgi()
+    test_native_routes_answer_cors_like_flask()
+    test_ai_quiz_generation_is_native_and_concurrent()
+    test_same_session_requests_do_not_starve_the_thread_pool()
+    test_wsgi_routes_run_concurrently()
+    print("\n✅ Async serving tests passed")
@@ -0,0 +1,110 @@
+"""
+Test that compiled submissions reuse cached builds of unchanged code
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.compile_cache import CompileCache
+from modules.evaluator import Evaluator
+
+C_SUM = '#include <stdio.h>\nint main(){int a,b;scanf("%d %d",&a,&b);printf("%d",a+b);return 0;}\n'
+TEST_CASES = [{'input': '2 3', 'expected_output': '5'}, {'input': '10 -4', 'expected_output': '6'}]
+
+
+def counting_compiles(evaluator):
+    """Record the compile commands the evaluator runs"""
+    compiles = []
+    run_subprocess = evaluator._run_subprocess
+
+    def run(cmd, input_str):
+        if cmd[0] == 'gcc':
+            compiles.append(cmd)
+        return run_subprocess(cmd, input_str)
+
+    evaluator._run_subprocess = run
+    return compiles
+
+
+def test_unchanged_code_skips_the_compiler():
+    """The second run of identical code uses the cached build; edited code compiles again"""
+    evaluator = Evaluator()
+    evaluator.compile_cache = CompileCache(tempfile.mkdtemp(prefix='compile-cache-test-'))
+    compiles = counting_compiles(evaluator)
+
+    first = evaluator._evaluate_c_code(C_SUM, TEST_CASES)
+    second = evaluator._evaluate_c_code(C_SUM, TEST_CASES)
+    assert first['passed_tests'] == second['passed_tests'] == 2
+    assert len(compiles) == 1
+
+    evaluator._evaluate_c_code(C_SUM + '\n', TEST_CASES)
+    assert len(compiles) == 2
+
+    broken = evaluator._evaluate_c_code('int main( {', TEST_CASES)
+    assert not broken['success'] and 'Compilation Error' in broken['error']
+
+
+def add_build(cache, key, last_used=None):
+    """Cache a 1000-byte build, optionally last used at the given time"""
+    build_dir = cache.staging_dir()
+    with open(os.path.join(build_dir, 'main.out'), 'wb') as f:
+        f.write(b'\0' * 1000)
+    path = cache.put(key, build_dir)
+    if last_used is not None:
+        os.utime(path, (last_used, last_used))
+
+
+def test_least_recently_used_builds_are_evicted():
+    """Past the size bound the least recently used build goes, the one just added stays"""
+    cache = CompileCache(tempfile.mkdtemp(prefix='compile-cache-test-'), max_bytes=2500)
+
+    add_build(cache, 'old', last_used=1000)
+    add_build(cache, 'recent', last_used=2000)
+    add_build(cache, 'new')
+
+    assert cache.get('old') is None
+    assert cache.get('recent') and cache.get('new')
+
+
+def test_builds_in_use_are_not_evicted():
+    """A pinned build and builds used within the grace period survive eviction"""
+    cache = CompileCache(tempfile.mkdtemp(prefix='compile-cache-test-'), max_bytes=2500, grace=0)
+    with cache.pinned('running'):
+        add_build(cache, 'running', last_used=500)
+        add_build(cache, 'idle', last_used=1000)
+        add_build(cache, 'new')
+        assert cache.get('running') and cache.get('new')
+        assert cache.get('idle') is None
+
+    cache = CompileCache(tempfile.mkdtemp(prefix='compile-cache-test-'), max_bytes=2500, grace=60)
+    for key in ('a', 'b', 'c'):
+        add_build(cache, key)
+    assert all(cache.get(key) for key in ('a', 'b', 'c'))
+
+
+def test_adding_a_build_measures_only_that_build():
+    """The size index is kept as builds come and go, not rebuilt by walking every entry"""
+    import modules.compile_cache as compile_cache
+
+    cache = CompileCache(tempfile.mkdtemp(prefix='compile-cache-test-'), max_bytes=2500)
+    measured = []
+    tree_size = compile_cache._tree_size
+    compile_cache._tree_size = lambda path: measured.append(path) or tree_size(path)
+    try:
+        for i in range(6):
+            add_build(cache, f'build{i}', last_used=1000 + i)
+    finally:
+        compile_cache._tree_size = tree_size
+
+    assert len(measured) == 6
+    assert cache.size <= 2500 and cache.size == 2000
+
+
+if __name__ == "__main__":
+    test_unchanged_code_skips_the_compiler()
+    test_least_recently_used_builds_are_evicted()
+    test_builds_in_use_are_not_evicted()
+    test_adding_a_build_measures_only_that_build()
+    print("\n✅ All compile cache tests passed")
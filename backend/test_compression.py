@@ -0,0 +1,101 @@
+"""
+Test response compression and cacheable static assets
+"""
+
+import sys
+import os
+import re
+import gzip
+import json
+import time
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify
+
+from modules import compression
+from modules.static_assets import StaticAssets, LONG_CACHE, REVALIDATE
+
+
+def test_negotiate_encoding():
+    """Accept-Encoding q-values decide between br, gzip and identity"""
+    offered = ['br', 'gzip']
+    assert compression.negotiate_encoding('gzip, deflate, br', offered) == 'br'
+    assert compression.negotiate_encoding('br;q=0.5, gzip', offered) == 'gzip'
+    assert compression.negotiate_encoding('gzip;q=0, identity', offered) is None
+    assert compression.negotiate_encoding('*', ['gzip']) == 'gzip'
+    assert compression.negotiate_encoding('', offered) is None
+
+
+def test_api_json_is_compressed():
+    """Large JSON bodies are gzipped for clients that accept it, small ones are not"""
+    app = Flask(__name__)
+    compression.init_app(app)
+    quiz = {'mcq_questions': [{'question': f'Question {i} ' * 20} for i in range(50)]}
+
+    @app.route('/quiz')
+    def quiz_route():
+        return jsonify(quiz)
+
+    @app.route('/small')
+    def small_route():
+        return jsonify({'ok': True})
+
+    client = app.test_client()
+    plain = client.get('/quiz')
+    compressed = client.get('/quiz', headers={'Accept-Encoding': 'gzip'})
+
+    print(f"Quiz JSON: {len(plain.data)} bytes plain, {len(compressed.data)} gzipped")
+    assert plain.headers.get('Content-Encoding') is None
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert json.loads(gzip.decompress(compressed.data)) == quiz
+    assert len(compressed.data) < len(plain.data) / 4
+
+    assert client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers.get('Content-Encoding') is None
+
+
+def test_static_assets_are_versioned_and_conditional():
+    """index.html links hashed assets; validators turn repeat requests into 304s"""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'js'))
+        script_path = os.path.join(tmp, 'js', 'app.js')
+        with open(script_path, 'w') as f:
+            f.write('console.log("v1");\n' * 100)
+        with open(os.path.join(tmp, 'index.html'), 'w') as f:
+            f.write('<html><script src="js/app.js"></script></html>')
+
+        assets = StaticAssets(tmp)
+        app = Flask(__name__)
+        app.add_url_rule('/<path:path>', 'static_file', assets.serve)
+        client = app.test_client()
+
+        index = client.get('/index.html')
+        version = re.search(r'js/app\.js\?v=(\w+)', index.get_data(as_text=True)).group(1)
+        assert index.headers['Cache-Control'] == REVALIDATE
+
+        versioned = client.get(f'/js/app.js?v={version}', headers={'Accept-Encoding': 'gzip'})
+        assert versioned.headers['Cache-Control'] == LONG_CACHE
+        assert versioned.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(versioned.data).startswith(b'console.log("v1")')
+
+        etag = versioned.headers['ETag']
+        revalidated = client.get('/js/app.js', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert revalidated.status_code == 304
+
+        # Changing the script changes its version in index.html
+        time.sleep(0.01)
+        with open(script_path, 'w') as f:
+            f.write('console.log("v2");\n')
+        os.utime(script_path, (time.time() + 5, time.time() + 5))
+        new_index = client.get('/index.html').get_data(as_text=True)
+        assert f'?v={version}' not in new_index
+
+        assert client.get('/../secret.txt').status_code == 404
+
+
+if __name__ == "__main__":
+    test_negotiate_encoding()
+    test_api_json_is_compressed()
+    test_static_assets_are_versioned_and_conditional()
+    print("\n✅ Compression tests passed")
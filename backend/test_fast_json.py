@@ -0,0 +1,75 @@
+"""
+Test the orjson-backed JSON provider against Flask's default one
+"""
+
+import sys
+import os
+import json
+import uuid
+import decimal
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+from modules import fast_json
+
+PAYLOAD = {
+    'success': True,
+    'report': {
+        'zeta': [1, 2.5, None, 'naïve – ✓'],
+        'alpha': {'when': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), 'id': uuid.UUID(int=7)},
+        'score': decimal.Decimal('87.50'),
+        'timeline': [{'timestamp': '2024-05-01T12:30:00', 'emotion': 'happy', 'confidence': 0.91}] * 3
+    }
+}
+
+
+def test_same_json_as_default_provider():
+    """Responses carry the same document, with keys in the same order"""
+    app = Flask(__name__)
+    expected = DefaultJSONProvider(app).response(PAYLOAD).get_data()
+    actual = fast_json.FastJSONProvider(app).response(PAYLOAD).get_data()
+
+    assert json.loads(actual) == json.loads(expected)
+    assert list(json.loads(actual)['report']) == ['alpha', 'score', 'timeline', 'zeta']
+    assert json.loads(actual)['report']['alpha']['when'] == 'Wed, 01 May 2024 12:30:00 GMT'
+
+
+def test_app_requests_and_responses_use_provider():
+    """jsonify() and request.json go through the fast provider; bad bodies are still 400s"""
+    app = Flask(__name__)
+    fast_json.init_app(app)
+    assert isinstance(app.json, fast_json.FastJSONProvider)
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify({'received': request.json})
+
+    client = app.test_client()
+    body = {'session_id': 'abc', 'answers': {str(i): 'B' for i in range(50)}}
+    assert client.post('/echo', json=body).json == {'received': body}
+    assert client.post('/echo', data='{not json', content_type='application/json').status_code == 400
+
+
+def test_stdlib_fallback():
+    """Without orjson the module helpers still encode and decode"""
+    original = fast_json.orjson
+    fast_json.orjson = None
+    try:
+        data = fast_json.dumps({'b': 1, 'a': [True, None], 'big': 2 ** 70})
+        assert data == b'{"b":1,"a":[true,null],"big":1180591620717411303424}'
+        assert fast_json.loads(data)['big'] == 2 ** 70
+    finally:
+        fast_json.orjson = original
+
+    # orjson rejects integers beyond 64 bits; those fall back too
+    assert fast_json.loads(fast_json.dumps({'big': 2 ** 70})) == {'big': 2 ** 70}
+
+
+if __name__ == "__main__":
+    test_same_json_as_default_provider()
+    test_app_requests_and_responses_use_provider()
+    test_stdlib_fallback()
+    print("\n✅ Fast JSON tests passed")
@@ -0,0 +1,150 @@
+"""
+Test the background job queue and the job-based resume upload flow
+"""
+
+import sys
+import os
+import io
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.job_queue import JobQueue
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+def test_jobs_run_in_worker_processes():
+    """Jobs run outside this process and report back through on_done"""
+    queue = JobQueue(max_workers=2, result_ttl=60)
+    queue.start()
+    finished = {}
+
+    def on_done(job_id, result, error):
+        finished[job_id] = (result, error)
+
+    try:
+        queue.submit('pid', os.getpid, on_done=on_done)
+        queue.submit('boom', _fail, 'bad resume', on_done=on_done)
+
+        assert queue.wait('pid', 10)
+        assert queue.wait('boom', 10)
+        assert queue.wait('unknown', 0) is None
+
+        worker_pid, error = finished['pid']
+        print(f"Job ran in process {worker_pid} (web process {os.getpid()})")
+        assert error is None and worker_pid != os.getpid()
+        assert isinstance(finished['boom'][1], ValueError)
+        assert queue.pending() == 0
+    finally:
+        queue.shutdown()
+
+
+def _make_resume_docx() -> bytes:
+    import docx
+
+    document = docx.Document()
+    document.add_paragraph('Jane Doe')
+    document.add_paragraph('jane.doe@example.com | +1 555 123 4567')
+    document.add_paragraph('Skills: Python, JavaScript, SQL, Docker')
+    document.add_paragraph('Experience: 3 years building Flask APIs in Python')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_upload_returns_job_and_poll_gets_result():
+    """Upload answers immediately; the job endpoint serves the parsed resume"""
+    from app import app
+
+    client = app.test_client()
+    start = time.time()
+    response = client.post(
+        '/api/upload-resume',
+        data={'resume': (io.BytesIO(_make_resume_docx()), 'resume.docx')},
+        content_type='multipart/form-data'
+    )
+    print(f"Upload answered in {time.time() - start:.3f}s with {response.status_code}")
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+
+    result = client.get(f'/api/jobs/{job_id}?wait=20')
+    assert result.status_code == 200
+    assert result.json['status'] == 'done'
+    assert result.json['session_id'] == job_id
+    assert 'Python' in result.json['resume_data']['skills']
+    assert 'with_proficiency' in result.json['skill_analysis']
+
+    assert client.get('/api/jobs/not-a-job').status_code == 404
+
+
+def test_routes_wait_for_the_parse_with_409():
+    """Routes reading parse results answer 409 (not 500) while the job is still running"""
+    from app import app, sessions
+
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {'upload_job': {'status': 'processing'}}
+    client = app.test_client()
+
+    try:
+        for path in ('/api/generate-quiz', '/api/start-interview', '/api/enhanced-interview/start'):
+            response = client.post(path, json={'session_id': session_id})
+            assert response.status_code == 409, path
+            assert response.json['error'] == 'Resume is still being processed'
+        assert client.get(f'/api/generate-quiz/stream?session_id={session_id}').status_code == 409
+
+        sessions[session_id]['upload_job'] = {'status': 'failed', 'error': 'bad file'}
+        assert client.post('/api/generate-quiz', json={'session_id': session_id}).status_code == 409
+    finally:
+        del sessions[session_id]
+
+
+def test_jobs_of_other_workers_are_followed_and_lost_ones_fail():
+    """A job owned by another worker is long-polled via the session store; one with no worker left fails"""
+    import subprocess
+    import threading
+    from app import app, sessions
+
+    other_worker = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'upload_job': {'status': 'processing', 'worker': f'{other_worker.pid}-0000', 'started_at': time.time()}
+    }
+    client = app.test_client()
+
+    try:
+        start = time.time()
+        assert client.get(f'/api/jobs/{session_id}?wait=1').status_code == 202
+        assert time.time() - start >= 0.9  # not answered at once, which would make clients spin
+
+        def other_worker_finishes():
+            time.sleep(0.3)
+            with sessions.lock(session_id):
+                sessions[session_id]['upload_job'] = {'status': 'failed', 'error': 'bad file'}
+        threading.Thread(target=other_worker_finishes).start()
+        start = time.time()
+        assert client.get(f'/api/jobs/{session_id}?wait=5').json['error'] == 'bad file'
+        assert time.time() - start < 2
+
+        # The owning worker died (or the session was restored after a restart)
+        other_worker.kill()
+        other_worker.wait()
+        for job in ({'status': 'processing', 'worker': f'{other_worker.pid}-0000', 'started_at': time.time()},
+                    {'status': 'processing'}):
+            sessions[session_id]['upload_job'] = job
+            start = time.time()
+            response = client.get(f'/api/jobs/{session_id}?wait=5')
+            assert response.status_code == 500 and time.time() - start < 1
+            assert sessions[session_id]['upload_job']['status'] == 'failed'
+    finally:
+        other_worker.kill()
+        del sessions[session_id]
+
+
+if __name__ == "__main__":
+    test_jobs_run_in_worker_processes()
+    test_upload_returns_job_and_poll_gets_result()
+    test_routes_wait_for_the_parse_with_409()
+    test_jobs_of_other_workers_are_followed_and_lost_ones_fail()
+    print("\n✅ Job queue tests passed")
@@ -0,0 +1,59 @@
+"""
+Test stable MCQ ids and indexed grading in the enhanced report
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.skill_analyzer import SkillAnalyzer
+
+
+def test_enhanced_report_credits_each_question_skill():
+    """Correct answers count toward the skill of their own question"""
+    from app import app, sessions
+
+    skills = ['Python', 'JavaScript']
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'skill_analysis': SkillAnalyzer().analyze_skills(skills, 'Python JavaScript developer'),
+        'upload_job': {'status': 'done'}
+    }
+    client = app.test_client()
+
+    try:
+        quiz = client.post('/api/generate-quiz', json={'session_id': session_id}).json['quiz']
+        questions = quiz['mcq_questions']
+        ids = [q['id'] for q in questions]
+        assert len(ids) == len(set(ids))
+        assert 'mcq_index' not in quiz  # answers stay server-side
+
+        # Ids do not depend on quiz order, so regenerating keeps them
+        regenerated = client.post('/api/generate-quiz', json={'session_id': session_id}).json['quiz']
+        by_text = {q['question']: q['id'] for q in questions}
+        assert all(by_text[q['question']] == q['id'] for q in regenerated['mcq_questions'] if q['question'] in by_text)
+        questions = regenerated['mcq_questions']
+
+        # Answer every JavaScript question correctly and every Python one wrongly
+        answers = {}
+        for q in questions:
+            if q['skill'] == 'JavaScript':
+                answers[q['id']] = q['correct_answer']
+            else:
+                answers[q['id']] = next(o for o in q['options'] if o != q['correct_answer'])
+
+        report = client.post('/api/enhanced-report', json={'session_id': session_id, 'mcq_answers': answers})
+        assert report.status_code == 200
+
+        mcq_scores = report.json['report']['skill_wise_performance']['mcq']
+        print(f"MCQ scores: {mcq_scores}")
+        javascript_total = sum(1 for q in questions if q['skill'] == 'JavaScript')
+        assert mcq_scores['JavaScript']['correct'] == javascript_total > 0
+        assert mcq_scores['Python']['correct'] == 0
+    finally:
+        del sessions[session_id]
+
+
+if __name__ == "__main__":
+    test_enhanced_report_credits_each_question_skill()
+    print("\n✅ MCQ grading tests passed")
@@ -0,0 +1,77 @@
+"""
+Test the Prometheus metrics exported at /api/metrics
+"""
+
+import sys
+import os
+import re
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask, jsonify
+
+from modules import metrics
+from modules.evaluator import Evaluator
+
+
+def test_histogram_exposition():
+    """Buckets are cumulative and end with +Inf, followed by _sum and _count"""
+    histogram = metrics.Histogram('test_latency_seconds', 'Test latency', ('route',), buckets=(0.1, 1))
+    histogram.observe(0.05, route='/a')
+    histogram.observe(0.5, route='/a')
+    histogram.observe(5, route='/a')
+
+    text = '\n'.join(histogram.render())
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_sum{route="/a"} 5.55' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_requests_are_labelled_by_route():
+    """Requests count under their URL rule; 5xx responses count as errors"""
+    app = Flask(__name__)
+    metrics.init_app(app)
+
+    @app.route('/test-metrics/jobs/<job_id>')
+    def job(job_id):
+        return jsonify({'job_id': job_id})
+
+    @app.route('/test-metrics/fail')
+    def fail():
+        raise RuntimeError('boom')
+
+    client = app.test_client()
+    client.get('/test-metrics/jobs/1')
+    client.get('/test-metrics/jobs/2')
+    client.get('/test-metrics/fail')
+
+    route = '/test-metrics/jobs/<job_id>'
+    assert metrics.HTTP_REQUESTS.value(method='GET', route=route, status=200) == 2
+    assert metrics.HTTP_LATENCY.count(method='GET', route=route) == 2
+    assert metrics.HTTP_ERRORS.value(method='GET', route='/test-metrics/fail') == 1
+
+    text = metrics.render()
+    assert re.search(r'skillmind_http_requests_total\{method="GET",route="/test-metrics/jobs/<job_id>",status="200"\} 2', text)
+
+
+def test_code_execution_gauge():
+    """Code evaluation is timed and leaves the in-flight gauge where it found it"""
+    evaluator = Evaluator()
+    before = metrics.CODE_EXECUTION_LATENCY.count(language='python')
+
+    result = evaluator.evaluate_code(
+        'print(input())', 'python', [{'input': 'hi', 'expected_output': 'hi'}]
+    )
+
+    assert result['passed_tests'] == 1
+    assert metrics.CODE_EXECUTION_LATENCY.count(language='python') == before + 1
+    assert metrics.CODE_EXECUTIONS_IN_FLIGHT.value() == 0
+
+
+if __name__ == "__main__":
+    test_histogram_exposition()
+    test_requests_are_labelled_by_route()
+    test_code_execution_gauge()
+    print("\n✅ Metrics tests passed")
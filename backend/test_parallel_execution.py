@@ -0,0 +1,52 @@
+"""
+Test that a submission's test cases run concurrently in the local executors
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from modules.evaluator import Evaluator
+
+# Echoes its input after a pause, so serial runs would take 0.5s per test
+SLOW_ECHO = "sleep 0.5\nread line\necho \"$line\"\n"
+
+
+def test_test_cases_run_concurrently_in_order():
+    """Six half-second tests finish in about the time of one, results in test order"""
+    evaluator = Evaluator()
+    evaluator.test_workers = 6
+    test_cases = [{'input': str(i), 'expected_output': str(i if i != 3 else 'x')} for i in range(6)]
+
+    start = time.perf_counter()
+    result = evaluator._evaluate_bash_code(SLOW_ECHO, test_cases)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2.0, elapsed
+    assert [r['test_case'] for r in result['test_results']] == [1, 2, 3, 4, 5, 6]
+    assert [r['actual_output'] for r in result['test_results']] == [str(i) for i in range(6)]
+    assert result['passed_tests'] == 5 and not result['test_results'][3]['passed']
+
+
+def test_local_languages_bypass_judge0():
+    """Languages listed in LOCAL_EXECUTION_LANGUAGES use the local executor"""
+    evaluator = Evaluator()
+    original = Config.LOCAL_EXECUTION_LANGUAGES
+    Config.LOCAL_EXECUTION_LANGUAGES = ['bash']
+    try:
+        result = evaluator.evaluate_code('read a b\necho $((a + b))\n', 'bash', [
+            {'input': '2 3', 'expected_output': '5'},
+            {'input': '10 -4', 'expected_output': '6'}
+        ])
+    finally:
+        Config.LOCAL_EXECUTION_LANGUAGES = original
+
+    assert result['success'] and result['passed_tests'] == 2
+
+
+if __name__ == "__main__":
+    test_test_cases_run_concurrently_in_order()
+    test_local_languages_bypass_judge0()
+    print("\n✅ All parallel execution tests passed")
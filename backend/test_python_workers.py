@@ -0,0 +1,109 @@
+"""
+Test the warm Python worker pool used for Python submissions
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.evaluator import Evaluator
+from modules.python_workers import MEMORY_LIMIT_EXCEEDED, TIME_LIMIT_EXCEEDED, PythonWorkerPool, resource
+
+WORKER_PID = "import os\nprint(os.getppid())"
+
+
+def test_python_code_runs_outside_the_server():
+    """Submissions get their own stdin/stdout; writing to fd 1 cannot break the protocol"""
+    evaluator = Evaluator()
+    stdout = sys.stdout
+    code = "import os\nos.write(1, b'noise\\n')\na, b = map(int, input().split())\nprint(a + b)"
+    result = evaluator._evaluate_python_code(code, [
+        {'input': '2 3', 'expected_output': '5'},
+        {'input': '7 8', 'expected_output': '15'},
+        {'input': 'x', 'expected_output': '0'}
+    ])
+
+    assert sys.stdout is stdout
+    assert result['passed_tests'] == 2
+    assert [r['test_case'] for r in result['test_results']] == [1, 2, 3]
+    assert 'invalid literal' in result['test_results'][2]['error']
+    evaluator.python_workers.close()
+
+
+def test_workers_are_warm_and_recycled():
+    """Common modules are preloaded; a worker is replaced after max_runs"""
+    pool = PythonWorkerPool(size=1, max_runs=2, max_output=1000, timeout=10)
+    pool.start()
+
+    assert pool.run("import sys\nprint('heapq' in sys.modules)", '')['stdout'] == 'True'
+    first = pool.run(WORKER_PID, '')['stdout']
+    second = pool.run(WORKER_PID, '')['stdout']
+    assert first != second
+    pool.close()
+
+
+def test_runs_cannot_see_earlier_monkeypatches():
+    """Patches a submission makes to modules and builtins end with its run"""
+    pool = PythonWorkerPool(size=1, max_runs=100, max_output=1000, timeout=10)
+
+    patch = (
+        "import builtins, json, math, os\n"
+        "print(os.getppid())\n"
+        "json.dumps = lambda *args, **kwargs: '{\"stdout\": \"forged\", \"error\": null}'\n"
+        "math.sqrt = lambda x: -1\n"
+        "builtins.input = lambda *args: 'patched'"
+    )
+    worker = pool.run(patch, '')['stdout']
+    result = pool.run("import math, os\nprint(math.sqrt(16), input(), os.getppid())", 'real')
+    assert (result['stdout'], result['error']) == (f'4.0 real {worker}', None)
+    pool.close()
+
+
+def test_crashed_worker_is_replaced():
+    """A submission that kills its interpreter fails alone; the next one runs normally"""
+    pool = PythonWorkerPool(size=1, max_runs=100, max_output=1000, timeout=10)
+
+    crashed = pool.run("import os\nos._exit(3)", '')
+    assert crashed['error'] and crashed['stdout'] == ''
+    result = pool.run("print(input()[::-1])", 'abc')
+    assert (result['stdout'], result['error']) == ('cba', None)
+    pool.close()
+
+
+def test_wall_clock_limit_kills_the_run():
+    """A sleeping or blocked submission is killed at the timeout and its slot freed"""
+    pool = PythonWorkerPool(size=1, max_runs=100, max_output=1000, timeout=1)
+
+    start = time.perf_counter()
+    result = pool.run("import time\nwhile True:\n    time.sleep(1)", '')
+    assert result['error'] == TIME_LIMIT_EXCEEDED
+    assert time.perf_counter() - start < 3
+    assert pool.run("print('next')", '')['stdout'] == 'next'
+    pool.close()
+
+
+def test_cpu_and_memory_limits():
+    """A busy loop hits the CPU limit before the wall clock; a huge allocation fails alone"""
+    if resource is None:
+        return
+    pool = PythonWorkerPool(size=1, max_runs=100, max_output=1000, timeout=30,
+                            cpu_limit=1, memory_limit_mb=256)
+
+    start = time.perf_counter()
+    assert pool.run("while True:\n    pass", '')['error'] == TIME_LIMIT_EXCEEDED
+    assert time.perf_counter() - start < 10
+
+    assert pool.run("data = bytearray(1024 ** 3)", '')['error'] == MEMORY_LIMIT_EXCEEDED
+    assert pool.run("print(sum(range(10)))", '')['stdout'] == '45'
+    pool.close()
+
+
+if __name__ == "__main__":
+    test_python_code_runs_outside_the_server()
+    test_workers_are_warm_and_recycled()
+    test_runs_cannot_see_earlier_monkeypatches()
+    test_crashed_worker_is_replaced()
+    test_wall_clock_limit_kills_the_run()
+    test_cpu_and_memory_limits()
+    print("\n✅ All Python worker tests passed")
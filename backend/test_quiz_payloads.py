@@ -0,0 +1,117 @@
+"""
+Test compact quiz payloads and on-demand coding challenge details
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.skill_analyzer import SkillAnalyzer
+
+
+def _new_session(sessions):
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'skill_analysis': SkillAnalyzer().analyze_skills(['Python', 'JavaScript'], 'Python JavaScript developer'),
+        'upload_job': {'status': 'done'}
+    }
+    return session_id
+
+
+def test_quiz_lists_challenge_summaries_only():
+    """The quiz carries challenge summaries; descriptions and test cases are not sent"""
+    from app import app, sessions
+
+    session_id = _new_session(sessions)
+    try:
+        response = app.test_client().post('/api/generate-quiz', json={'session_id': session_id})
+        quiz = response.json['quiz']
+        stored = sessions[session_id]['quiz']
+
+        assert quiz['total_coding'] == len(quiz['coding_challenges']) == len(stored['coding_challenges']) > 0
+        for index, summary in enumerate(quiz['coding_challenges']):
+            assert summary['index'] == index
+            assert summary['title'] == stored['coding_challenges'][index]['title']
+            assert 'test_cases' not in summary and 'description' not in summary
+
+        full_size = len(json.dumps(stored['coding_challenges']))
+        summary_size = len(json.dumps(quiz['coding_challenges']))
+        print(f"Coding challenges: {full_size} bytes stored, {summary_size} bytes sent")
+        assert summary_size * 3 < full_size
+    finally:
+        del sessions[session_id]
+
+
+def test_challenge_detail_hides_hidden_tests():
+    """Details expose sample test cases only and honour field selection"""
+    from app import app, sessions
+    from config import Config
+
+    session_id = _new_session(sessions)
+    client = app.test_client()
+    try:
+        client.post('/api/generate-quiz', json={'session_id': session_id})
+        stored = sessions[session_id]['quiz']['coding_challenges'][0]
+        stored['test_cases'] = [{'input': str(i), 'expected_output': str(i * 2)} for i in range(5)]
+        stored['sample_solution'] = 'print(2 * int(input()))'
+
+        response = client.get(f'/api/coding-challenges/0?session_id={session_id}')
+        assert response.status_code == 200
+        challenge = response.json['challenge']
+        assert challenge['description'] == stored['description']
+        assert challenge['sample_test_cases'] == stored['test_cases'][:Config.CODING_SAMPLE_TEST_CASES]
+        assert 'test_cases' not in challenge and 'sample_solution' not in challenge
+
+        selected = client.get(f'/api/coding-challenges/0?session_id={session_id}&fields=title,hints').json['challenge']
+        assert set(selected) == {'index', 'title', 'hints'}
+
+        assert client.get(f'/api/coding-challenges/0?session_id={session_id}&fields=test_cases').status_code == 400
+        assert client.get(f'/api/coding-challenges/999?session_id={session_id}').status_code == 404
+        assert client.get('/api/coding-challenges/0?session_id=missing').status_code == 400
+    finally:
+        del sessions[session_id]
+
+
+def test_submit_code_hides_hidden_test_details():
+    """Submitting code reports hidden tests as pass/fail only, from both servers"""
+    import asyncio
+    import asgi
+    from app import app, sessions
+
+    hidden_input = '987654 123456'
+    challenge = {
+        'title': 'Sum',
+        'sample_test_cases': [{'input': '2 3', 'expected_output': '5'}],
+        'test_cases': [{'input': '2 3', 'expected_output': '5'}, {'input': hidden_input, 'expected_output': '1111110'}]
+    }
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {'quiz': {'coding_challenges': [challenge]}}
+    body = {'session_id': session_id, 'code': "a, b = map(int, input().split())\nprint(a - b)",
+            'language': 'python', 'challenge_index': 0}
+
+    try:
+        client = app.test_client()
+        responses = [
+            client.post('/api/submit-code', json=dict(body, is_preview=True)).json,
+            client.post('/api/submit-code', json=body).json,
+            asyncio.run(asgi.submit_code(body))[1]
+        ]
+        for response in responses:
+            sample, hidden = response['result']['test_results']
+            assert sample['input'] == '2 3' and 'actual_output' in sample
+            assert hidden['hidden'] and hidden['test_case'] == 2 and not hidden['passed']
+            assert set(hidden) <= {'test_case', 'passed', 'execution_time', 'error', 'hidden'}
+            assert hidden_input not in json.dumps(response) and '1111110' not in json.dumps(response)
+
+        # Grading still sees the full results
+        assert sessions[session_id]['coding_results'][0]['test_results'][1]['input'] == hidden_input
+    finally:
+        del sessions[session_id]
+
+
+if __name__ == "__main__":
+    test_quiz_lists_challenge_summaries_only()
+    test_challenge_detail_hides_hidden_tests()
+    test_submit_code_hides_hidden_test_details()
+    print("\n✅ Quiz payload tests passed")
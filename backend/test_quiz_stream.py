@@ -0,0 +1,98 @@
+"""
+Test the Server-Sent Events quiz stream
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.skill_analyzer import SkillAnalyzer
+
+
+def _parse_events(body: str):
+    events = []
+    for block in body.strip().split('\n\n'):
+        event_line, data_line = block.split('\n', 1)
+        events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+    return events
+
+
+def test_quiz_streams_skill_by_skill():
+    """Each skill arrives as its own event and the session quiz matches what was sent"""
+    from app import app, sessions
+
+    skills = ['Python', 'JavaScript', 'SQL']
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'skill_analysis': SkillAnalyzer().analyze_skills(skills, 'Python JavaScript SQL developer, 3 years'),
+        'upload_job': {'status': 'done'}
+    }
+
+    try:
+        response = app.test_client().get(f'/api/generate-quiz/stream?session_id={session_id}')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+
+        events = _parse_events(response.get_data(as_text=True))
+        names = [name for name, _ in events]
+        print(f"Events: {names}")
+        assert names[0] == 'start' and names[-1] == 'done'
+        assert names.count('skill') == len(events[0][1]['skills'])
+
+        # Offsets index into the quiz stored in the session
+        quiz = sessions[session_id]['quiz']
+        for name, data in events:
+            if name == 'skill' and data['mcq_questions']:
+                offset = data['mcq_offset']
+                assert quiz['mcq_questions'][offset:offset + len(data['mcq_questions'])] == data['mcq_questions']
+
+        done = events[-1][1]
+        assert done['total_mcqs'] == len(quiz['mcq_questions']) > 0
+        assert 'mcq_questions' not in done
+    finally:
+        del sessions[session_id]
+
+
+def test_stream_stops_when_a_newer_quiz_replaces_it():
+    """A quiz generated while the stream runs is left alone by the stream"""
+    from app import app, sessions
+
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {
+        'skill_analysis': SkillAnalyzer().analyze_skills(['Python', 'SQL'], 'Python SQL developer'),
+        'upload_job': {'status': 'done'}
+    }
+    client = app.test_client()
+
+    try:
+        stream = client.get(f'/api/generate-quiz/stream?session_id={session_id}')
+        chunks = iter(stream.response)
+        assert next(chunks).startswith(b'event: start')
+
+        # The client fell back to the non-streaming route mid-stream
+        replacement = client.post('/api/generate-quiz', json={'session_id': session_id}).json['quiz']
+        rest = b''.join(chunks).decode()
+        stream.close()
+
+        session = sessions[session_id]
+        assert 'event: done' not in rest
+        assert session['quiz']['total_mcqs'] == replacement['total_mcqs']
+        assert session['mcq_answer_sheet'].total_questions == replacement['total_mcqs']
+        assert [q['id'] for q in session['quiz']['mcq_questions']] == [q['id'] for q in replacement['mcq_questions']]
+    finally:
+        del sessions[session_id]
+
+
+def test_stream_rejects_unknown_session():
+    from app import app
+
+    response = app.test_client().get('/api/generate-quiz/stream?session_id=missing')
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    test_quiz_streams_skill_by_skill()
+    test_stream_stops_when_a_newer_quiz_replaces_it()
+    test_stream_rejects_unknown_session()
+    print("\n✅ Quiz stream tests passed")
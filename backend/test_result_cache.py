@@ -0,0 +1,107 @@
+"""
+Test that unchanged code submissions reuse their evaluation result
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.result_cache import ResultCache, submission_digest
+
+SOLUTION = "a, b = map(int, input().split())\nprint(a + b)"
+TEST_CASES = [{'input': '2 3', 'expected_output': '5'}, {'input': '1 1', 'expected_output': '2'}]
+
+
+def test_preview_then_submit_runs_once():
+    """The final submit of previewed code returns the stored result, flagged from_cache"""
+    from app import app, sessions, evaluator
+
+    runs = []
+    evaluate_code = evaluator.get().evaluate_code
+    evaluator.get().evaluate_code = lambda *args: runs.append(args) or evaluate_code(*args)
+
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {'quiz': {'coding_challenges': [{'title': 'Sum', 'test_cases': TEST_CASES}]}}
+    client = app.test_client()
+    body = {'session_id': session_id, 'code': SOLUTION, 'language': 'python', 'challenge_index': 0}
+
+    try:
+        preview = client.post('/api/submit-code', json=dict(body, is_preview=True)).json['result']
+        final = client.post('/api/submit-code', json=body).json['result']
+        changed = client.post('/api/submit-code', json=dict(body, code=SOLUTION + '\n')).json['result']
+
+        assert len(runs) == 2
+        assert (preview['from_cache'], final['from_cache'], changed['from_cache']) == (False, True, False)
+        assert final['passed_tests'] == preview['passed_tests'] == 2
+        assert len(sessions[session_id]['coding_results']) == 2
+    finally:
+        del evaluator.get().evaluate_code
+        del sessions[session_id]
+
+
+def test_per_session_and_global_bounds():
+    """A session keeps its newest results only; the byte bound applies across sessions"""
+    result = {'success': True, 'score': 100.0, 'test_results': []}
+    cache = ResultCache(max_bytes=10 * 1024, per_session=2)
+
+    digests = [submission_digest(f'print({i})', 'python', TEST_CASES) for i in range(3)]
+    for digest in digests:
+        cache.put('a', digest, result)
+    assert cache.get('a', digests[0]) is None
+    assert cache.get('a', digests[2])['from_cache'] is True
+    assert cache.get('b', digests[2]) is None  # results are not shared between sessions
+
+    small = ResultCache(max_bytes=len(b'{"success": true}') * 2, per_session=10)
+    for session_id in ('a', 'b', 'c'):
+        small.put(session_id, digests[0], {'success': True})
+    assert len(small) == 2 and small.get('a', digests[0]) is None
+
+
+def test_failures_and_timeouts_are_not_stored():
+    """Service errors and timed-out tests are evaluated again next time"""
+    cache = ResultCache(max_bytes=10 * 1024, per_session=5)
+    cache.put('a', 'error', {'success': False, 'error': 'Code execution service error'})
+    cache.put('a', 'slow', {'success': True, 'test_results': [{'error': 'Time limit exceeded'}]})
+    cache.put('a', 'crashed', {'success': True, 'test_results': [{'error': 'Worker process exited (code -9)'}]})
+    cache.put('a', 'judge0', {'success': True, 'test_results': [{'error': 'Time Limit Exceeded'}]})
+    assert len(cache) == 0
+
+    # Errors caused by the code itself are as good as any other outcome
+    cache.put('a', 'raises', {'success': True, 'test_results': [{'error': 'Runtime Error: NZEC (NZEC)'}]})
+    assert len(cache) == 1
+
+
+def test_execution_service_errors_are_not_stored():
+    """A Judge0 outage reported per test is retried on the next submit, not replayed from the cache"""
+    from app import app, sessions
+    from modules.judge0_client import Judge0Client
+
+    calls = []
+    outage = {'success': False, 'error': 'Code execution service returned error: 503', 'passed': False}
+    execute_code = Judge0Client.execute_code
+    Judge0Client.execute_code = lambda self, **kwargs: calls.append(kwargs) or outage
+
+    session_id = sessions.new_session_id()
+    sessions[session_id] = {'quiz': {'coding_challenges': [{'title': 'Sum', 'test_cases': TEST_CASES}]}}
+    body = {'session_id': session_id, 'code': 'puts gets.split.map(&:to_i).sum', 'language': 'ruby',
+            'challenge_index': 0, 'is_preview': True}
+
+    try:
+        client = app.test_client()
+        first = client.post('/api/submit-code', json=body).json['result']
+        second = client.post('/api/submit-code', json=body).json['result']
+
+        assert first['test_results'][0]['error'] == outage['error']
+        assert second['from_cache'] is False
+        assert len(calls) == 2 * len(TEST_CASES)
+    finally:
+        Judge0Client.execute_code = execute_code
+        del sessions[session_id]
+
+
+if __name__ == "__main__":
+    test_preview_then_submit_runs_once()
+    test_per_session_and_global_bounds()
+    test_failures_and_timeouts_are_not_stored()
+    test_execution_service_errors_are_not_stored()
+    print("\n✅ All result cache tests passed")
@@ -0,0 +1,73 @@
+"""
+Test the recruiter batch upload endpoint
+"""
+
+import sys
+import os
+import io
+import json
+import zipfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _resume_docx(name: str, skills: str) -> bytes:
+    import docx
+
+    document = docx.Document()
+    document.add_paragraph(name)
+    document.add_paragraph(f'{name.lower().replace(" ", ".")}@example.com')
+    document.add_paragraph(f'Skills: {skills}')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_batch_streams_one_line_per_resume():
+    """Zip members and loose files are parsed; bad files are reported, not fatal"""
+    from app import app, sessions
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for i in range(6):
+            zf.writestr(f'drive/candidate_{i}.docx', _resume_docx(f'Candidate {i}', 'Python, SQL'))
+        zf.writestr('drive/notes.txt', 'not a resume')
+        zf.writestr('__MACOSX/drive/._candidate_0.docx', 'metadata')
+    archive.seek(0)
+
+    response = app.test_client().post(
+        '/api/upload-resumes/batch',
+        data={'resumes': [
+            (archive, 'drive.zip'),
+            (io.BytesIO(_resume_docx('Loose File', 'Java')), 'loose.docx'),
+        ]},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    summary = lines[-1]
+    results = lines[:-1]
+    print(f"Batch summary: {summary}")
+
+    assert summary == {'done': True, 'total': 8, 'succeeded': 7, 'failed': 1}
+    rejected = [r for r in results if r['status'] == 'failed']
+    assert [r['filename'] for r in rejected] == ['drive/notes.txt']
+
+    parsed = [r for r in results if r['status'] == 'done']
+    assert len(parsed) == 7
+    for result in parsed:
+        assert 'skills' in result['resume_data']
+        assert sessions[result['session_id']]['upload_job']['status'] == 'done'
+
+
+def test_batch_requires_files():
+    from app import app
+
+    assert app.test_client().post('/api/upload-resumes/batch').status_code == 400
+
+
+if __name__ == "__main__":
+    test_batch_streams_one_line_per_resume()
+    test_batch_requires_files()
+    print("\n✅ Batch upload tests passed")
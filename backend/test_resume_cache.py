@@ -0,0 +1,85 @@
+"""
+Test content-hash deduplication of uploaded resumes
+"""
+
+import sys
+import os
+import io
+import time
+import hashlib
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.resume_cache import ResumeCache
+
+
+def test_cache_is_bounded_by_bytes():
+    """Least recently used results are evicted once the byte budget is exceeded"""
+    entry = {'resume_data': {'raw_text': 'x' * 1000}, 'skill_analysis': {}}
+    cache = ResumeCache(max_bytes=2500)
+    cache.put('a', entry)
+    cache.put('b', entry)
+    assert cache.get('a') == entry  # 'a' is now most recently used
+    cache.put('c', entry)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size <= 2500
+
+    # Hits are copies; changing one does not change the cache
+    cache.get('a')['resume_data']['raw_text'] = 'changed'
+    assert cache.get('a') == entry
+
+
+def _make_resume_docx() -> bytes:
+    import docx
+
+    document = docx.Document()
+    document.add_paragraph('Ravi Kumar')
+    document.add_paragraph('ravi.kumar@example.com')
+    document.add_paragraph('Skills: Java, React, PostgreSQL')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_duplicate_upload_skips_parsing():
+    """The second upload of a file is answered from the cache with its own session"""
+    from app import app, upload_jobs
+    from config import Config
+
+    client = app.test_client()
+    resume = _make_resume_docx()
+
+    def upload():
+        return client.post(
+            '/api/upload-resume?wait=1',
+            data={'resume': (io.BytesIO(resume), 'resume.docx')},
+            content_type='multipart/form-data'
+        )
+
+    first = upload()
+    assert first.status_code == 200
+
+    start = time.time()
+    second = upload()
+    elapsed = time.time() - start
+    print(f"Duplicate upload answered in {elapsed * 1000:.1f}ms")
+
+    assert second.status_code == 200
+    assert second.json['session_id'] != first.json['session_id']
+    assert second.json['resume_data'] == first.json['resume_data']
+    assert second.json['skill_analysis'] == first.json['skill_analysis']
+    # No job was queued for the duplicate
+    assert upload_jobs.wait(second.json['session_id'], 0) is None
+
+    # Both sessions share one copy, named by content
+    stored = os.listdir(Config.UPLOAD_FOLDER)
+    assert f'{hashlib.sha256(resume).hexdigest()}.docx' in stored
+    assert not any(session_id in name for name in stored
+                   for session_id in (first.json['session_id'], second.json['session_id']))
+
+
+if __name__ == "__main__":
+    test_cache_is_bounded_by_bytes()
+    test_duplicate_upload_skips_parsing()
+    print("\n✅ Resume cache tests passed")
@@ -0,0 +1,250 @@
+"""
+Test the session store: LRU hot tier, idle expiry and SQLite persistence
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.session_store import SessionStore
+from modules.hr_interviewer import HRInterviewer
+from modules.emotion_analyzer import EmotionAnalyzer
+from modules.enhanced_hr_interviewer import InterviewSession
+
+
+def _make_store(db_path, **kwargs):
+    kwargs.setdefault('capacity', 2)
+    kwargs.setdefault('idle_ttl', 60)
+    kwargs.setdefault('retention', 3600)
+    kwargs.setdefault('shards', 1)
+    kwargs.setdefault('snapshot_interval', 0)
+    return SessionStore(db_path=db_path, **kwargs)
+
+
+def test_lru_capacity_and_cold_reload():
+    """Sessions beyond capacity leave memory but are still readable"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(os.path.join(tmp, 'sessions.db'))
+
+        store['a'] = {'resume_data': {'skills': ['Python']}}
+        store['b'] = {'resume_data': {'skills': ['Java']}}
+        store['c'] = {'resume_data': {'skills': ['Go']}}
+
+        print(f"Hot sessions after 3 inserts: {len(store)}")
+        assert len(store) == 2
+        assert 'a' not in store._shards[0].entries
+
+        # Reading 'a' promotes it back and pushes out the least recently used
+        assert store['a']['resume_data']['skills'] == ['Python']
+        assert 'a' in store._shards[0].entries
+        assert 'b' not in store._shards[0].entries
+        assert 'missing' not in store
+
+
+def test_idle_sessions_are_demoted():
+    """Sessions idle past the TTL are moved to SQLite on the next access"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(os.path.join(tmp, 'sessions.db'), capacity=10, idle_ttl=0.05)
+
+        store['idle'] = {'quiz': {'total_mcqs': 5}}
+        time.sleep(0.1)
+        store['fresh'] = {'quiz': {'total_mcqs': 1}}
+
+        assert 'idle' not in store._shards[0].entries
+        assert store['idle']['quiz']['total_mcqs'] == 5
+
+
+def test_idle_sessions_leave_shards_without_writes():
+    """The timer sweeps every shard, not just the ones new sessions land in"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(os.path.join(tmp, 'sessions.db'), capacity=10, idle_ttl=0.05, shards=2)
+        idle = next(f'idle-{i}' for i in range(100) if store._shard(f'idle-{i}') is store._shards[0])
+        busy = next(f'busy-{i}' for i in range(100) if store._shard(f'busy-{i}') is store._shards[1])
+
+        store[idle] = {'quiz': {'total_mcqs': 5}}
+        deadline = time.time() + 5
+        while idle in store._shards[0].entries and time.time() < deadline:
+            store[busy] = {'quiz': {'total_mcqs': 1}}  # writes only ever reach the other shard
+            time.sleep(0.02)
+
+        assert idle not in store._shards[0].entries
+        assert store[idle]['quiz']['total_mcqs'] == 5
+
+
+def test_sessions_survive_restart():
+    """Saved mutations are visible to a new store on the same database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'sessions.db')
+        store = _make_store(db_path)
+
+        store['s1'] = {'coding_results': []}
+        store['s1']['coding_results'].append({'score': 80})
+        store.save('s1')
+
+        restarted = _make_store(db_path)
+        assert restarted['s1']['coding_results'] == [{'score': 80}]
+
+
+def test_snapshots_batch_changed_sessions():
+    """Saves are written together by the next snapshot, compressed; a restart restores them warm"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'sessions.db')
+        store = _make_store(db_path, capacity=10, snapshot_interval=3600)
+
+        store['s1'] = {'quiz': {'mcq_questions': [{'question': 'What is a list?'}] * 50}}
+        store['s2'] = {'interview_summary': {}}
+        store['s1']['quiz_start_time'] = '2024-01-01T10:00:00'
+        store.save('s1')
+        # Nothing is written until the snapshot runs
+        assert _make_store(db_path).get('s1') is None
+
+        with store.lock('s2'):
+            # A session in use by a request waits for the next snapshot
+            assert store.snapshot() == 1
+        assert store.snapshot() == 1
+        assert store.snapshot() == 0
+
+        payload = store._connection().execute("SELECT data FROM sessions WHERE session_id = 's1'").fetchone()[0]
+        assert isinstance(payload, bytes) and len(payload) < 500
+
+        restarted = _make_store(db_path, capacity=10)
+        assert restarted.restore() == 2
+        assert len(restarted) == 2
+        assert restarted['s1']['quiz_start_time'] == '2024-01-01T10:00:00'
+
+
+def test_snapshots_run_in_background():
+    """With a short interval, changes reach SQLite without an explicit flush"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'sessions.db')
+        store = _make_store(db_path, snapshot_interval=0.05)
+        store['s1'] = {'coding_results': [{'score': 80}]}
+
+        deadline = time.time() + 5
+        while _make_store(db_path).get('s1') is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert _make_store(db_path)['s1']['coding_results'] == [{'score': 80}]
+
+
+def test_retention_purges_old_sessions():
+    """Sessions older than the retention window are deleted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'sessions.db')
+        store = _make_store(db_path, retention=0.05)
+        store['old'] = {'mcq_results': {}}
+        time.sleep(0.1)
+
+        restarted = _make_store(db_path, retention=0.05)
+        assert 'old' not in restarted
+
+
+def test_session_ids_are_unique():
+    """Ids generated in the same instant never collide"""
+    ids = {SessionStore.new_session_id() for _ in range(10000)}
+    assert len(ids) == 10000
+
+
+def test_session_lock_serializes_same_session():
+    """Requests for one session run one at a time, others proceed in parallel"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(os.path.join(tmp, 'sessions.db'), capacity=64, shards=4)
+        store['shared'] = {'coding_results': []}
+        active = []
+        overlaps = []
+
+        def submit():
+            with store.lock('shared'):
+                active.append(1)
+                overlaps.append(len(active))
+                time.sleep(0.01)
+                store['shared']['coding_results'].append({'score': 100})
+                active.pop()
+
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"Max concurrent holders of one session lock: {max(overlaps)}")
+        assert max(overlaps) == 1
+        assert len(store['shared']['coding_results']) == 8
+
+        # A held lock does not block a different session
+        done = threading.Event()
+
+        def touch_other():
+            with store.lock('other'):
+                done.set()
+
+        with store.lock('shared'):
+            threading.Thread(target=touch_other).start()
+            assert done.wait(1)
+
+
+def test_locked_sessions_are_not_evicted():
+    """A session in use by a request stays in memory even past capacity"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _make_store(os.path.join(tmp, 'sessions.db'), capacity=1)
+        store['busy'] = {'quiz': {}}
+        with store.lock('busy'):
+            store['other'] = {'quiz': {}}
+            assert 'busy' in store._shards[0].entries
+
+
+def test_interview_state_moves_between_workers():
+    """Interview and emotion objects written by one worker are restored by another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'sessions.db')
+        types = (HRInterviewer, EmotionAnalyzer, InterviewSession)
+        worker_a = _make_store(db_path, types=types, shared=True)
+        worker_b = _make_store(db_path, types=types, shared=True)
+
+        interviewer = HRInterviewer(api_key='test-key')
+        interviewer.conversation_history = [
+            {'role': 'system', 'content': 'You are an HR interviewer'},
+            {'role': 'assistant', 'content': 'Tell me about yourself'}
+        ]
+        analyzer = EmotionAnalyzer()
+        analyzer.start_session()
+        analyzer.add_emotion_data('happy', 0.9)
+        interview = InterviewSession(['Python'])
+        interview.submit_answer('I led a project with a specific, measurable result.')
+
+        worker_a['s1'] = {
+            'hr_interviewer': interviewer,
+            'emotion_analyzer': analyzer,
+            'interview_session': interview
+        }
+
+        restored = worker_b['s1']
+        assert isinstance(restored['hr_interviewer'], HRInterviewer)
+        assert restored['hr_interviewer'].conversation_history == interviewer.conversation_history
+        assert restored['emotion_analyzer'].emotion_data == analyzer.emotion_data
+        assert restored['emotion_analyzer'].session_start == analyzer.session_start
+        assert restored['interview_session'].questions == interview.questions
+        assert restored['interview_session'].current_question_idx == 1
+
+        # Progress made on worker B is picked up by worker A's in-memory copy
+        restored['interview_session'].submit_answer('Another detailed answer.')
+        worker_b.save('s1')
+        assert worker_a['s1']['interview_session'].current_question_idx == 2
+        assert len(worker_a['s1']['interview_session'].answers) == 2
+
+
+if __name__ == "__main__":
+    test_lru_capacity_and_cold_reload()
+    test_idle_sessions_are_demoted()
+    test_idle_sessions_leave_shards_without_writes()
+    test_sessions_survive_restart()
+    test_snapshots_batch_changed_sessions()
+    test_snapshots_run_in_background()
+    test_retention_purges_old_sessions()
+    test_session_ids_are_unique()
+    test_session_lock_serializes_same_session()
+    test_locked_sessions_are_not_evicted()
+    test_interview_state_moves_between_workers()
+    print("\n✅ Session store tests passed")
@@ -0,0 +1,131 @@
+"""
+Test lazy module construction and the startup-time report
+"""
+
+import sys
+import os
+import json
+import subprocess
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules import startup
+
+
+def test_lazy_instance_builds_once_on_first_use():
+    """Nothing is imported or constructed until an attribute is used"""
+    sys.modules.pop('modules.report_generator', None)
+    generator = startup.lazy('modules.report_generator:ReportGenerator')
+
+    assert not generator.loaded
+    assert 'modules.report_generator' not in sys.modules
+
+    threads = [threading.Thread(target=generator.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert generator.loaded
+    assert generator.get() is generator.get()
+    assert callable(generator.generate_final_report)
+
+    report = startup.report()
+    names = [(t['name'], t['phase']) for t in report['timings']]
+    print(f"Startup timings: {names}")
+    assert names.count(('modules.report_generator:ReportGenerator', 'init')) == 1
+    assert ('modules.report_generator', 'import') in names
+
+    pending = startup.lazy('modules.skill_analyzer:SkillAnalyzer')
+    assert 'modules.skill_analyzer:SkillAnalyzer' in startup.report()['not_loaded']
+    pending.get()
+
+
+def test_app_import_skips_heavy_dependencies():
+    """Importing the app does not pull in openai, PyPDF2, docx or the question bank"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    heavy = ['openai', 'PyPDF2', 'docx', 'modules.fallback_questions']
+    script = (
+        'import sys, json, app\n'
+        f'print(json.dumps([m for m in {heavy!r} if m in sys.modules]))'
+    )
+
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=backend_dir, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+
+    print(f"Heavy modules loaded by 'import app': {output}")
+    assert json.loads(output) == []
+
+
+def test_prefork_master_preloads_and_freezes():
+    """A pre-fork master builds the banks, freezes them and leaves background work to the workers"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        'import sys, json, app\n'
+        'print(json.dumps({"bank": "modules.fallback_questions" in sys.modules,\n'
+        '                  "report": app.startup.report(),\n'
+        '                  "pool_started": app.upload_jobs._executor is not None}))'
+    )
+
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=backend_dir, capture_output=True, text=True, check=True,
+        env=dict(os.environ, LAZY_MODULES='False', PREFORK='True')
+    ).stdout.strip().splitlines()[-1]
+    result = json.loads(output)
+
+    print(f"Frozen objects: {result['report']['gc_frozen_objects']}")
+    assert result['bank']
+    assert result['report']['not_loaded'] == []
+    assert result['report']['gc_frozen_objects'] > 0
+    assert not result['pool_started']
+
+
+def test_question_bank_is_not_reordered():
+    """Picking questions samples from the shared bank without shuffling it in place"""
+    from modules import fallback_questions
+
+    bank = fallback_questions.FALLBACK_MCQ_QUESTIONS['Python']['beginner']
+    original = list(bank)
+    for _ in range(5):
+        picked = fallback_questions.get_mcq_questions('Python', 'beginner', count=3)
+        assert len(picked) == 3 and all(question in original for question in picked)
+    assert bank == original
+
+
+def test_concurrent_first_imports_see_the_whole_module():
+    """A thread importing a module another thread is still loading waits for it"""
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'slow_bank.py'), 'w') as f:
+            f.write('import time\ntime.sleep(0.3)\nquestions = ["Q1"]\n')
+        sys.path.insert(0, tmp)
+        try:
+            found = []
+
+            def use_bank():
+                found.append(getattr(startup.import_module('slow_bank'), 'questions', None))
+
+            threads = [threading.Thread(target=use_bank) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+            assert found == [['Q1']] * 4
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop('slow_bank', None)
+
+
+if __name__ == "__main__":
+    test_lazy_instance_builds_once_on_first_use()
+    test_app_import_skips_heavy_dependencies()
+    test_prefork_master_preloads_and_freezes()
+    test_question_bank_is_not_reordered()
+    test_concurrent_first_imports_see_the_whole_module()
+    print("\n✅ Startup tests passed")
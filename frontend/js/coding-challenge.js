@@ -152,10 +152,45 @@ SELECT "Hello World";`
         return "java";
     },
 
-    // Display coding challenge
-    displayChallenge(index) {
+    // Fetch a challenge's details the first time it is needed; the quiz only lists summaries
+    loadChallenge(index) {
         const challenge = app.quiz.coding_challenges[index];
+        if (!challenge.loading) {
+            challenge.loading = fetch(
+                `${app.apiUrl}/coding-challenges/${index}?session_id=${encodeURIComponent(app.sessionId)}`
+            )
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) {
+                        throw new Error(data.error || 'Failed to load challenge');
+                    }
+                    Object.assign(challenge, data.challenge);
+                    return challenge;
+                })
+                .catch(error => {
+                    delete challenge.loading;
+                    throw error;
+                });
+        }
+        return challenge.loading;
+    },
+
+    // Display coding challenge
+    async displayChallenge(index) {
         const container = document.getElementById('codingChallengeContent');
+        let challenge;
+        try {
+            challenge = await this.loadChallenge(index);
+        } catch (error) {
+            console.error('Challenge load error:', error);
+            app.showError(error.message);
+            return;
+        }
+
+        // Prefetch the next one while this one is being solved
+        if (index + 1 < app.quiz.coding_challenges.length) {
+            this.loadChallenge(index + 1).catch(() => {});
+        }
 
         // Smart Default Selection
         const defaultLangKey = this.getLanguageFromSkill(challenge.skill);
@@ -194,14 +229,14 @@ SELECT "Hello World";`
                         <div style="margin: 15px 0;">
                             <strong>Constraints:</strong>
                             <ul style="margin-left: 20px; color: #4b5563;">
-                                ${challenge.constraints.map(c => `<li style="margin-bottom: 5px;">${c}</li>`).join('')}
+                                ${(challenge.constraints || []).map(c => `<li style="margin-bottom: 5px;">${c}</li>`).join('')}
                             </ul>
                         </div>
                     </div>
                 
                     <div class="test-cases" style="background: white; padding: 20px; border-radius: 12px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.05);">
                         <h4 style="color: #1a1a1a; margin-top: 0;">Example Test Cases</h4>
-                        ${challenge.test_cases.slice(0, 2).map((tc, i) => `
+                        ${(challenge.sample_test_cases || []).map((tc, i) => `
                             <div class="test-case" style="margin: 15px 0; background: #f8fafc; padding: 15px; border-radius: 8px; border-left: 3px solid #0284c7;">
                                 <div style="margin-bottom: 8px;"><strong>Input:</strong> <code style="background: #e2e8f0; padding: 2px 5px; border-radius: 4px;">${tc.input}</code></div>
                                 <div><strong>Output:</strong> <code style="background: #e2e8f0; padding: 2px 5px; border-radius: 4px;">${tc.expected_output}</code></div>
@@ -360,11 +395,11 @@ SELECT "Hello World";`
                 html += `
                     <div style="margin-bottom: 15px; border-bottom: 1px solid #333; padding-bottom: 10px;">
                         <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <span style="color: #9ca3af; font-size: 0.9em;">Test Case ${test.test_case}</span>
+                            <span style="color: #9ca3af; font-size: 0.9em;">Test Case ${test.test_case}${test.hidden ? ' (hidden)' : ''}</span>
                             <span style="color: ${color}; font-weight: bold; font-size: 0.8rem;">${test.passed ? 'PASSED' : 'FAILED'}</span>
                         </div>
                         
-                        <div style="margin-top: 8px; font-size: 0.85rem;">
+                        ${test.hidden ? '' : `<div style="margin-top: 8px; font-size: 0.85rem;">
                             <div style="display: grid; grid-template-columns: 80px 1fr; gap: 5px; margin-bottom: 4px;">
                                 <span style="color: #6b7280;">Input:</span>
                                 <code style="color: #d4d4d4;">${test.input}</code>
@@ -377,7 +412,7 @@ SELECT "Hello World";`
                                 <span style="color: #6b7280;">Actual:</span>
                                 <code style="color: ${test.passed ? '#d4d4d4' : '#fca5a5'};">${test.actual_output || '<span style="color: #525252; font-style: italic;">(No Output)</span>'}</code>
                             </div>
-                        </div>
+                        </div>`}
                         
                         ${test.error ?
                         `<div style="color: #ef4444; margin-top: 8px; font-size: 0.85rem; background: rgba(239, 68, 68, 0.1); padding: 5px; border-radius: 4px;">Error: ${test.error}</div>` : ''
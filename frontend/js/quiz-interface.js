@@ -2,6 +2,8 @@
 const quizInterface = {
     timerInterval: null,
     timeRemaining: 0,
+    pendingAnswers: {},  // chosen but not yet saved on the server
+    saving: Promise.resolve(),
 
     // Helper to escape HTML to prevent tags from rendering invisibly
     escapeHtml(text) {
@@ -14,8 +16,76 @@ const quizInterface = {
             .replace(/'/g, "&#039;");
     },
 
-    // Generate quiz
-    async generateQuiz() {
+    // Generate quiz, rendering the first skill's questions as soon as they are ready
+    generateQuiz() {
+        if (!window.EventSource) {
+            return this.generateQuizAtOnce();
+        }
+
+        app.quiz = null;
+        app.currentQuestionIndex = 0;
+        app.userAnswers = {};
+        this.pendingAnswers = {};
+
+        const source = new EventSource(
+            `${app.apiUrl}/generate-quiz/stream?session_id=${encodeURIComponent(app.sessionId)}`
+        );
+
+        return new Promise((resolve) => {
+            source.addEventListener('start', (event) => {
+                const data = JSON.parse(event.data);
+                app.quiz = {
+                    mcq_questions: [],
+                    coding_challenges: [],
+                    time_limit_mcq: data.time_limit_mcq,
+                    time_limit_coding: data.time_limit_coding,
+                    streaming: true
+                };
+            });
+
+            source.addEventListener('skill', (event) => {
+                const data = JSON.parse(event.data);
+                const firstQuestions = app.quiz.mcq_questions.length === 0 && data.mcq_questions.length > 0;
+
+                app.quiz.mcq_questions.push(...data.mcq_questions);
+                app.quiz.coding_challenges.push(...data.coding_challenges);
+
+                if (firstQuestions) {
+                    this.timeRemaining = app.quiz.time_limit_mcq * 60; // Convert to seconds
+                    this.startTimer();
+                    this.displayQuestion(0);
+                } else if (app.quiz.mcq_questions.length > 0) {
+                    this.updateProgress(app.currentQuestionIndex);
+                }
+            });
+
+            source.addEventListener('done', (event) => {
+                source.close();
+                Object.assign(app.quiz, JSON.parse(event.data), { streaming: false });
+
+                if (app.quiz.mcq_questions.length === 0) {
+                    app.showError('No questions were generated. This may be due to an API error. Please try again.');
+                } else {
+                    this.updateProgress(app.currentQuestionIndex);
+                }
+                resolve();
+            });
+
+            source.onerror = () => {
+                source.close();
+                if (app.quiz && app.quiz.streaming === false) {
+                    return;
+                }
+                // Stream unavailable (e.g. a proxy buffering it): fall back to one request
+                console.error('Quiz stream failed, falling back to a single request');
+                clearInterval(this.timerInterval);
+                this.generateQuizAtOnce().then(resolve);
+            };
+        });
+    },
+
+    // Generate the whole quiz in one request
+    async generateQuizAtOnce() {
         try {
             const response = await fetch(`${app.apiUrl}/generate-quiz`, {
                 method: 'POST',
@@ -33,6 +103,7 @@ const quizInterface = {
                 app.quiz = data.quiz;
                 app.currentQuestionIndex = 0;
                 app.userAnswers = {};
+                this.pendingAnswers = {};
 
                 // Validate that we have questions
                 if (!app.quiz.mcq_questions || app.quiz.mcq_questions.length === 0) {
@@ -59,10 +130,6 @@ const quizInterface = {
         const question = app.quiz.mcq_questions[index];
         const container = document.getElementById('quizContent');
 
-        // Update counter
-        document.getElementById('questionCounter').textContent =
-            `Question ${index + 1} of ${app.quiz.mcq_questions.length}`;
-
         // Build question HTML
         let html = `
             <div class="question-card">
@@ -149,21 +216,63 @@ const quizInterface = {
 
         container.innerHTML = html;
 
-        // Update navigation buttons
+        this.updateProgress(index);
+    },
+
+    // Update the counter and navigation buttons (the quiz may still be growing)
+    updateProgress(index) {
+        const total = app.quiz.mcq_questions.length;
+        const isLast = index === total - 1;
+
+        document.getElementById('questionCounter').textContent = app.quiz.streaming
+            ? `Question ${index + 1} of ${total} (more loading...)`
+            : `Question ${index + 1} of ${total}`;
+
         document.getElementById('prevBtn').style.display = index === 0 ? 'none' : 'inline-block';
-        document.getElementById('nextBtn').style.display =
-            index === app.quiz.mcq_questions.length - 1 ? 'none' : 'inline-block';
+        document.getElementById('nextBtn').style.display = isLast ? 'none' : 'inline-block';
         document.getElementById('submitQuizBtn').style.display =
-            index === app.quiz.mcq_questions.length - 1 ? 'inline-block' : 'none';
+            isLast && !app.quiz.streaming ? 'inline-block' : 'none';
     },
 
     // Select answer
     selectAnswer(questionIndex, originalKey) {
         // We store the original key (e.g., 'C') so backend validation works
         app.userAnswers[questionIndex] = originalKey;
+        this.pendingAnswers[questionIndex] = originalKey;
+        this.saveAnswers();
         this.displayQuestion(questionIndex);
     },
 
+    // Autosave answers as they are chosen, one request at a time; failed ones are retried with the next
+    saveAnswers() {
+        this.saving = this.saving.then(async () => {
+            const answers = this.pendingAnswers;
+            if (Object.keys(answers).length === 0) return;
+            this.pendingAnswers = {};
+
+            try {
+                const response = await fetch(`${app.apiUrl}/quiz-answers`, {
+                    method: 'PATCH',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({
+                        session_id: app.sessionId,
+                        answers
+                    })
+                });
+                if (response.status >= 500) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+            } catch (error) {
+                // Keep them for the next save or the final submit, unless re-answered meanwhile
+                this.pendingAnswers = Object.assign(answers, this.pendingAnswers);
+                console.warn('Answer autosave failed, will retry:', error);
+            }
+        });
+        return this.saving;
+    },
+
     // Start timer
     startTimer() {
         this.timerInterval = setInterval(() => {
@@ -187,6 +296,8 @@ const quizInterface = {
         clearInterval(this.timerInterval);
 
         try {
+            // Answers are graded as they are saved; only unsaved ones go with the submission
+            await this.saving;
             const response = await fetch(`${app.apiUrl}/submit-quiz`, {
                 method: 'POST',
                 headers: {
@@ -194,13 +305,14 @@ const quizInterface = {
                 },
                 body: JSON.stringify({
                     session_id: app.sessionId,
-                    answers: app.userAnswers
+                    answers: this.pendingAnswers
                 })
             });
 
             const data = await response.json();
 
             if (data.success) {
+                this.pendingAnswers = {};
                 app.showSuccess('Quiz submitted successfully!');
                 return true;
             } else {
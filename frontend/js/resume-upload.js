@@ -1,5 +1,8 @@
 // Resume Upload Handler
 const resumeUpload = {
+    // Give up waiting for a resume parse after this long
+    jobTimeoutMs: 5 * 60 * 1000,
+
     // Handle file selection
     async handleFileSelect(file) {
         // Validate file
@@ -34,7 +37,12 @@ const resumeUpload = {
                 body: formData
             });
 
-            const data = await response.json();
+            let data = await response.json();
+
+            // Parsing runs as a background job; wait for it to finish
+            if (data.success && data.status === 'processing') {
+                data = await this.waitForJob(data.job_id);
+            }
 
             if (data.success) {
                 app.sessionId = data.session_id;
@@ -59,5 +67,32 @@ const resumeUpload = {
             document.getElementById('uploadArea').style.display = 'block';
             document.getElementById('uploadStatus').style.display = 'none';
         }
+    },
+
+    // Long-poll a resume parsing job until it is done or has failed
+    async waitForJob(jobId) {
+        const deadline = Date.now() + this.jobTimeoutMs;
+        let delay = 500;
+
+        while (Date.now() < deadline) {
+            const started = Date.now();
+            const data = await this.pollJob(jobId);
+            if (!data.success || data.status !== 'processing') {
+                return data;
+            }
+
+            // A poll answered early (e.g. by a server that cannot hold it) backs off before the next one
+            const elapsed = Date.now() - started;
+            if (elapsed < delay) {
+                await new Promise(resolve => setTimeout(resolve, delay - elapsed));
+            }
+            delay = Math.min(delay * 2, 10000);
+        }
+        return { success: false, error: 'Resume processing is taking too long; please try again' };
+    },
+
+    async pollJob(jobId) {
+        const response = await fetch(`${app.apiUrl}/jobs/${jobId}?wait=25`);
+        return await response.json();
     }
 };
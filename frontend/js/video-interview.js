@@ -4,6 +4,7 @@ const videoInterview = {
     videoStream: null,
     faceApiLoaded: false,
     detectionInterval: null,
+    emotionRetryAt: 0,  // set from Retry-After when the server sheds telemetry
     recognition: null,
     synthesis: window.speechSynthesis,
     attentionTracker: null,
@@ -156,11 +157,17 @@ const videoInterview = {
 
     // Send emotion data to backend
     async sendEmotionData(emotion, confidence) {
+        // The server sheds excess telemetry with 429; skip ticks until it asks us back
+        if (Date.now() < this.emotionRetryAt) {
+            return;
+        }
+
         try {
-            await fetch(`${app.apiUrl}/analyze-emotion`, {
+            const response = await fetch(`${app.apiUrl}/analyze-emotion`, {
                 method: 'POST',
                 headers: {
-                    'Content-Type': 'application/json'
+                    'Content-Type': 'application/json',
+                    'X-Session-Id': app.sessionId
                 },
                 body: JSON.stringify({
                     session_id: app.sessionId,
@@ -169,6 +176,11 @@ const videoInterview = {
                     timestamp: new Date().toISOString()
                 })
             });
+
+            if (response.status === 429) {
+                const retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 5;
+                this.emotionRetryAt = Date.now() + retryAfter * 1000;
+            }
         } catch (error) {
             console.error('Failed to send emotion data:', error);
         }